@@ -1,49 +1,98 @@
 """Agent-related endpoints."""
 
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.encoders import jsonable_encoder
 
-from app.models.agent import Agent, AgentCreate, AgentUpdate
+from app.core.dependencies import get_agent_service, get_current_user
+from app.core.http_cache import etag_matches, make_etag, not_modified
+from app.core.responses import model_response
+from app.models.agent import Agent, AgentBatchUpdate, AgentCreate, AgentUpdate
+from app.models.common import BatchDeleteRequest, BatchResponse, CursorPage
 from app.services.agent_service import AgentService
+from app.services.batch import batch_error_detail
+from app.services.pagination import MAX_PAGE_SIZE, InvalidCursorError
 
 router = APIRouter()
 
-# Mock data for development
-mock_agents = []
-agent_counter = 1
 
-
-@router.post("/agents", response_model=dict, status_code=status.HTTP_201_CREATED)
-async def create_agent(agent_data: AgentCreate):
+@router.post("/agents", response_model=Agent, status_code=status.HTTP_201_CREATED)
+async def create_agent(
+    agent_data: AgentCreate,
+    current_user: dict = Depends(get_current_user),
+    agent_service: AgentService = Depends(get_agent_service)
+):
     """Create a new agent."""
-    global agent_counter
     try:
-        # Create mock agent
-        agent_dict = {
-            "id": agent_counter,
-            "name": agent_data.name,
-            "model": agent_data.model,
-            "description": agent_data.description,
-            "tools": agent_data.tools or [],
-            "created_at": "2024-01-01T00:00:00Z",
-            "updated_at": "2024-01-01T00:00:00Z"
-        }
-        mock_agents.append(agent_dict)
-        agent_counter += 1
-        return agent_dict
-    except Exception as e:
+        return await agent_service.create_agent(agent_data, current_user["user_id"])
+    except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Failed to create agent: {str(e)}"
         )
 
 
-@router.get("/agents/{agent_id}", response_model=dict)
-async def get_agent(agent_id: int):
+@router.post("/agents:batch", response_model=BatchResponse, status_code=status.HTTP_201_CREATED)
+async def batch_create_agents(
+    agents_data: List[AgentCreate],
+    current_user: dict = Depends(get_current_user),
+    agent_service: AgentService = Depends(get_agent_service)
+):
+    """Create several agents atomically."""
+    try:
+        results = await agent_service.create_agents(agents_data, current_user["user_id"])
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=jsonable_encoder(batch_error_detail(e))
+        )
+    return BatchResponse(results=results)
+
+
+@router.put("/agents:batch", response_model=BatchResponse)
+async def batch_update_agents(
+    agent_updates: List[AgentBatchUpdate],
+    current_user: dict = Depends(get_current_user),
+    agent_service: AgentService = Depends(get_agent_service)
+):
+    """Update several agents atomically."""
+    try:
+        results = await agent_service.update_agents(agent_updates, current_user["user_id"])
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=jsonable_encoder(batch_error_detail(e))
+        )
+    return BatchResponse(results=results)
+
+
+@router.post("/agents:batchDelete", response_model=BatchResponse)
+async def batch_delete_agents(
+    delete_request: BatchDeleteRequest,
+    current_user: dict = Depends(get_current_user),
+    agent_service: AgentService = Depends(get_agent_service)
+):
+    """Delete several agents atomically."""
+    try:
+        results = await agent_service.delete_agents(delete_request.ids, current_user["user_id"])
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=jsonable_encoder(batch_error_detail(e))
+        )
+    return BatchResponse(results=results)
+
+
+@router.get("/agents/{agent_id}", response_model=Agent)
+async def get_agent(
+    agent_id: UUID,
+    current_user: dict = Depends(get_current_user),
+    agent_service: AgentService = Depends(get_agent_service)
+):
     """Get agent by ID."""
-    agent = next((a for a in mock_agents if a["id"] == agent_id), None)
+    agent = await agent_service.get_agent(agent_id, current_user["user_id"])
     if not agent:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -52,46 +101,69 @@ async def get_agent(agent_id: int):
     return agent
 
 
-@router.get("/agents", response_model=List[dict])
-async def list_agents(skip: int = 0, limit: int = 100):
-    """List all agents."""
-    return mock_agents[skip:skip + limit]
+@router.get("/agents", response_model=CursorPage[Agent])
+async def list_agents(
+    request: Request,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(get_current_user),
+    agent_service: AgentService = Depends(get_agent_service)
+):
+    """List agents one page at a time; pass ``next_cursor`` back as ``cursor``.
+    
+    Responses carry an ETag; send it back as ``If-None-Match`` to get an
+    empty 304 while the agent list is unchanged.
+    """
+    user_id = current_user["user_id"]
+    etag = make_etag(await agent_service.get_agents_version(user_id), user_id, limit, cursor)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    try:
+        page = await agent_service.list_agents(user_id, limit=limit, cursor=cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    return model_response(page, headers={"ETag": etag})
 
 
-@router.put("/agents/{agent_id}", response_model=dict)
-async def update_agent(agent_id: int, agent_update: AgentUpdate):
+@router.put("/agents/{agent_id}", response_model=Agent)
+async def update_agent(
+    agent_id: UUID,
+    agent_update: AgentUpdate,
+    current_user: dict = Depends(get_current_user),
+    agent_service: AgentService = Depends(get_agent_service)
+):
     """Update an agent."""
-    agent = next((a for a in mock_agents if a["id"] == agent_id), None)
+    try:
+        agent = await agent_service.update_agent(agent_id, agent_update, current_user["user_id"])
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to update agent: {str(e)}"
+        )
+    
     if not agent:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Agent not found"
         )
-    
-    # Update agent fields
-    if agent_update.name is not None:
-        agent["name"] = agent_update.name
-    if agent_update.model is not None:
-        agent["model"] = agent_update.model
-    if agent_update.description is not None:
-        agent["description"] = agent_update.description
-    if agent_update.tools is not None:
-        agent["tools"] = agent_update.tools
-    
-    agent["updated_at"] = "2024-01-01T00:00:00Z"
     return agent
 
 
 @router.delete("/agents/{agent_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_agent(agent_id: int):
+async def delete_agent(
+    agent_id: UUID,
+    current_user: dict = Depends(get_current_user),
+    agent_service: AgentService = Depends(get_agent_service)
+):
     """Delete an agent."""
-    global mock_agents
-    agent = next((a for a in mock_agents if a["id"] == agent_id), None)
-    if not agent:
+    deleted = await agent_service.delete_agent(agent_id, current_user["user_id"])
+    if not deleted:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Agent not found"
         )
-    
-    mock_agents = [a for a in mock_agents if a["id"] != agent_id]
     return None
\ No newline at end of file
@@ -1,44 +1,70 @@
 """Chat-related endpoints."""
 
-from typing import List
+import math
+from typing import AsyncIterator, Optional, Union
+from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    WebSocket,
+    WebSocketDisconnect,
+    status
+)
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+
+from app.core.dependencies import get_chat_service, get_current_user, get_current_websocket_user
+from app.core.http_cache import etag_matches, make_etag, not_modified
+from app.core.responses import model_response
+from app.models.chat import (
+    ChatMessage,
+    ChatMessageCreate,
+    ChatSession,
+    ChatSessionCreate,
+    ChatStreamEvent,
+    MessageRole,
+    StreamEventType
+)
+from app.models.common import CursorPage
+from app.services.chat_service import ChatService, ChatStream
+from app.services.pagination import MAX_PAGE_SIZE, InvalidCursorError
+from app.services.rate_limiter import RateLimitExceeded
+from app.services.resilience import CircuitOpenError
 
 router = APIRouter()
 
-# Mock data for development
-mock_sessions = []
-mock_messages = []
-session_counter = 1
-message_counter = 1
+
+def retry_later(status_code: int, error: Union[RateLimitExceeded, CircuitOpenError]) -> HTTPException:
+    """Error response telling the client when to retry."""
+    return HTTPException(
+        status_code=status_code,
+        detail=str(error),
+        headers={"Retry-After": str(math.ceil(error.retry_after))}
+    )
 
 
-@router.post("/chat/message", response_model=dict, status_code=status.HTTP_201_CREATED)
-async def send_message(message_data: dict):
-    """Send a message to the agent."""
-    global message_counter
+@router.post("/chat/message", response_model=ChatMessage, status_code=status.HTTP_201_CREATED)
+async def send_message(
+    message_data: ChatMessageCreate,
+    current_user: dict = Depends(get_current_user),
+    chat_service: ChatService = Depends(get_chat_service)
+):
+    """Send a message to the agent and return its reply."""
     try:
-        # Create mock response
-        user_message = {
-            "id": message_counter,
-            "role": "user",
-            "message": message_data.get("message", ""),
-            "timestamp": "2024-01-01T00:00:00Z"
-        }
-        message_counter += 1
-        
-        # Create mock agent response
-        agent_response = {
-            "id": message_counter,
-            "role": "assistant",
-            "message": f"I received your message: '{message_data.get('message', '')}'. This is a mock response from the agent.",
-            "timestamp": "2024-01-01T00:00:00Z"
-        }
-        message_counter += 1
-        
-        mock_messages.extend([user_message, agent_response])
-        
-        return agent_response
+        return await chat_service.send_message(message_data, current_user["user_id"])
+    except RateLimitExceeded as e:
+        raise retry_later(status.HTTP_429_TOO_MANY_REQUESTS, e)
+    except CircuitOpenError as e:
+        raise retry_later(status.HTTP_503_SERVICE_UNAVAILABLE, e)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -46,15 +72,171 @@ async def send_message(message_data: dict):
         )
 
 
-@router.get("/chat/history", response_model=List[dict])
-async def get_chat_history(skip: int = 0, limit: int = 100):
-    """Get chat history."""
-    return mock_messages[skip:skip + limit]
+@router.post("/chat/sessions", response_model=ChatSession, status_code=status.HTTP_201_CREATED)
+async def create_session(
+    session_data: ChatSessionCreate,
+    current_user: dict = Depends(get_current_user),
+    chat_service: ChatService = Depends(get_chat_service)
+):
+    """Create a new chat session."""
+    try:
+        return await chat_service.create_session(session_data, current_user["user_id"])
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+
+
+@router.get("/chat/sessions", response_model=CursorPage[ChatSession])
+async def list_sessions(
+    request: Request,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(get_current_user),
+    chat_service: ChatService = Depends(get_chat_service)
+):
+    """List chat sessions one page at a time, most recently updated first."""
+    user_id = current_user["user_id"]
+    etag = make_etag(await chat_service.get_sessions_version(user_id), user_id, limit, cursor)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    try:
+        page = await chat_service.list_sessions(user_id, limit=limit, cursor=cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    return model_response(page, headers={"ETag": etag})
+
+
+@router.get("/chat/sessions/{session_id}/messages", response_model=CursorPage[ChatMessage])
+async def list_session_messages(
+    request: Request,
+    session_id: UUID,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(get_current_user),
+    chat_service: ChatService = Depends(get_chat_service)
+):
+    """Get a session's history one page at a time, oldest first."""
+    user_id = current_user["user_id"]
+    try:
+        version = await chat_service.get_history_version(session_id, user_id)
+        etag = make_etag(version, user_id, session_id, limit, cursor)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        
+        page = await chat_service.get_chat_history(session_id, user_id, limit=limit, cursor=cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    return model_response(page, headers={"ETag": etag})
+
+
+@router.delete("/chat/sessions/{session_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_session(
+    session_id: UUID,
+    current_user: dict = Depends(get_current_user),
+    chat_service: ChatService = Depends(get_chat_service)
+):
+    """Delete a chat session."""
+    success = await chat_service.delete_session(session_id, current_user["user_id"])
+    if not success:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Session not found"
+        )
+    return None
+
+
+async def format_sse(events: AsyncIterator[ChatStreamEvent]) -> AsyncIterator[str]:
+    """Format chat stream events as Server-Sent Events."""
+    async for event in events:
+        yield f"event: {event.event.value}\ndata: {event.json(exclude_none=True)}\n\n"
+
+
+class ChatStreamResponse(StreamingResponse):
+    """Server-Sent Events response that closes its chat stream however it ends.
+    
+    Starlette never closes a body iterator that has not started, e.g. when
+    the client disconnects before the first chunk or sending fails, so the
+    stream (and its rate-limit lease) is closed here.
+    """
+    
+    def __init__(self, events: ChatStream):
+        """Initialize chat stream response."""
+        super().__init__(
+            format_sse(events),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+        self.events = events
+    
+    async def __call__(self, scope, receive, send) -> None:
+        """Send the response, then close the chat stream."""
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self.events.aclose()
+
+
+@router.post("/chat/stream")
+async def stream_message(
+    message_data: ChatMessageCreate,
+    current_user: dict = Depends(get_current_user),
+    chat_service: ChatService = Depends(get_chat_service)
+):
+    """Send a message and stream the agent response as Server-Sent Events."""
+    try:
+        events = await chat_service.stream_message(message_data, current_user["user_id"])
+    except RateLimitExceeded as e:
+        raise retry_later(status.HTTP_429_TOO_MANY_REQUESTS, e)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    
+    return ChatStreamResponse(events)
 
 
-@router.delete("/chat/history", status_code=status.HTTP_204_NO_CONTENT)
-async def clear_chat_history():
-    """Clear chat history."""
-    global mock_messages
-    mock_messages = []
-    return None
\ No newline at end of file
+@router.websocket("/chat/ws")
+async def chat_websocket(
+    websocket: WebSocket,
+    current_user: dict = Depends(get_current_websocket_user),
+    chat_service: ChatService = Depends(get_chat_service)
+):
+    """Stream agent responses over a WebSocket.
+    
+    Each incoming JSON frame (``session_id``, ``content``) starts a turn; the
+    response is sent back as a sequence of chat stream event frames.
+    """
+    await websocket.accept()
+    try:
+        while True:
+            payload = await websocket.receive_json()
+            try:
+                message_data = ChatMessageCreate(role=MessageRole.USER, **payload)
+                events = await chat_service.stream_message(message_data, current_user["user_id"])
+            except (ValidationError, TypeError, ValueError, RateLimitExceeded) as e:
+                error = ChatStreamEvent(event=StreamEventType.ERROR, content=str(e))
+                await websocket.send_text(error.json(exclude_none=True))
+                continue
+            
+            try:
+                async for event in events:
+                    await websocket.send_text(event.json(exclude_none=True))
+            finally:
+                await events.aclose()
+    except WebSocketDisconnect:
+        pass
\ No newline at end of file
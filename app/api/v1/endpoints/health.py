@@ -1,6 +1,9 @@
 """Health check endpoints."""
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, Response, status
+
+from app.core.container import ServiceContainer
+from app.core.dependencies import get_container
 
 router = APIRouter()
 
@@ -16,15 +19,20 @@ async def health_check():
 
 
 @router.get("/health/detailed")
-async def detailed_health_check():
-    """Detailed health check endpoint."""
+async def detailed_health_check(
+    response: Response,
+    container: ServiceContainer = Depends(get_container)
+):
+    """Detailed health check endpoint serving the last background probe report.
+    
+    Responds 503 while a component is unhealthy so load balancers can take
+    the instance out of rotation; degraded components still return 200.
+    """
+    report = container.health.report
+    if report["status"] == "unhealthy":
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
     return {
-        "status": "healthy",
         "service": "FastAPI Agent Backend",
         "version": "1.0.0",
-        "components": {
-            "database": "healthy",  # Add actual database check
-            "llm_service": "healthy",  # Add actual LLM service check
-            "cache": "healthy"  # Add actual cache check
-        }
+        **report
     }
\ No newline at end of file
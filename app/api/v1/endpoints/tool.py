@@ -1,71 +1,98 @@
 """Tool-related endpoints."""
 
-from typing import List
+from typing import List, Optional
+from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.encoders import jsonable_encoder
 
-from app.models.tool import ToolCreate, ToolUpdate
+from app.core.http_cache import etag_matches, make_etag, not_modified
+from app.core.responses import model_response
+from app.core.dependencies import get_current_user, get_tool_service
+from app.models.common import BatchDeleteRequest, BatchResponse, CursorPage
+from app.models.tool import Tool, ToolBatchUpdate, ToolCreate, ToolUpdate
+from app.services.batch import batch_error_detail
+from app.services.pagination import MAX_PAGE_SIZE, InvalidCursorError
+from app.services.tool_service import ToolService
 
 router = APIRouter()
 
-# Mock data for development
-mock_tools = [
-    {
-        "id": 1,
-        "name": "Web Search",
-        "type": "search",
-        "description": "Search the web for information",
-        "created_at": "2024-01-01T00:00:00Z",
-        "updated_at": "2024-01-01T00:00:00Z"
-    },
-    {
-        "id": 2,
-        "name": "Calculator",
-        "type": "math",
-        "description": "Perform mathematical calculations",
-        "created_at": "2024-01-01T00:00:00Z",
-        "updated_at": "2024-01-01T00:00:00Z"
-    },
-    {
-        "id": 3,
-        "name": "File Reader",
-        "type": "file",
-        "description": "Read and analyze files",
-        "created_at": "2024-01-01T00:00:00Z",
-        "updated_at": "2024-01-01T00:00:00Z"
-    }
-]
-tool_counter = 4
-
-
-@router.post("/tools", response_model=dict, status_code=status.HTTP_201_CREATED)
-async def create_tool(tool_data: ToolCreate):
+
+@router.post("/tools", response_model=Tool, status_code=status.HTTP_201_CREATED)
+async def create_tool(
+    tool_data: ToolCreate,
+    current_user: dict = Depends(get_current_user),
+    tool_service: ToolService = Depends(get_tool_service)
+):
     """Create a new tool."""
-    global tool_counter
     try:
-        # Create mock tool
-        tool_dict = {
-            "id": tool_counter,
-            "name": tool_data.name,
-            "type": tool_data.type,
-            "description": tool_data.description,
-            "created_at": "2024-01-01T00:00:00Z",
-            "updated_at": "2024-01-01T00:00:00Z"
-        }
-        mock_tools.append(tool_dict)
-        tool_counter += 1
-        return tool_dict
-    except Exception as e:
+        return await tool_service.create_tool(tool_data, current_user["user_id"])
+    except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Failed to create tool: {str(e)}"
         )
 
 
-@router.get("/tools/{tool_id}", response_model=dict)
-async def get_tool(tool_id: int):
+@router.post("/tools:batch", response_model=BatchResponse, status_code=status.HTTP_201_CREATED)
+async def batch_create_tools(
+    tools_data: List[ToolCreate],
+    current_user: dict = Depends(get_current_user),
+    tool_service: ToolService = Depends(get_tool_service)
+):
+    """Create several tools atomically."""
+    try:
+        results = await tool_service.create_tools(tools_data, current_user["user_id"])
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=jsonable_encoder(batch_error_detail(e))
+        )
+    return BatchResponse(results=results)
+
+
+@router.put("/tools:batch", response_model=BatchResponse)
+async def batch_update_tools(
+    tool_updates: List[ToolBatchUpdate],
+    current_user: dict = Depends(get_current_user),
+    tool_service: ToolService = Depends(get_tool_service)
+):
+    """Update several tools atomically."""
+    try:
+        results = await tool_service.update_tools(tool_updates, current_user["user_id"])
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=jsonable_encoder(batch_error_detail(e))
+        )
+    return BatchResponse(results=results)
+
+
+@router.post("/tools:batchDelete", response_model=BatchResponse)
+async def batch_delete_tools(
+    delete_request: BatchDeleteRequest,
+    current_user: dict = Depends(get_current_user),
+    tool_service: ToolService = Depends(get_tool_service)
+):
+    """Delete several tools atomically."""
+    try:
+        results = await tool_service.delete_tools(delete_request.ids, current_user["user_id"])
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=jsonable_encoder(batch_error_detail(e))
+        )
+    return BatchResponse(results=results)
+
+
+@router.get("/tools/{tool_id}", response_model=Tool)
+async def get_tool(
+    tool_id: UUID,
+    current_user: dict = Depends(get_current_user),
+    tool_service: ToolService = Depends(get_tool_service)
+):
     """Get tool by ID."""
-    tool = next((t for t in mock_tools if t["id"] == tool_id), None)
+    tool = await tool_service.get_tool(tool_id, current_user["user_id"])
     if not tool:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -74,44 +101,69 @@ async def get_tool(tool_id: int):
     return tool
 
 
-@router.get("/tools", response_model=List[dict])
-async def list_tools(skip: int = 0, limit: int = 100):
-    """List all tools."""
-    return mock_tools[skip:skip + limit]
+@router.get("/tools", response_model=CursorPage[Tool])
+async def list_tools(
+    request: Request,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(get_current_user),
+    tool_service: ToolService = Depends(get_tool_service)
+):
+    """List tools one page at a time; pass ``next_cursor`` back as ``cursor``.
+    
+    Responses carry an ETag; send it back as ``If-None-Match`` to get an
+    empty 304 while the tool list is unchanged.
+    """
+    user_id = current_user["user_id"]
+    etag = make_etag(await tool_service.get_tools_version(user_id), user_id, limit, cursor)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    try:
+        page = await tool_service.list_tools(user_id, limit=limit, cursor=cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    return model_response(page, headers={"ETag": etag})
 
 
-@router.put("/tools/{tool_id}", response_model=dict)
-async def update_tool(tool_id: int, tool_update: ToolUpdate):
+@router.put("/tools/{tool_id}", response_model=Tool)
+async def update_tool(
+    tool_id: UUID,
+    tool_update: ToolUpdate,
+    current_user: dict = Depends(get_current_user),
+    tool_service: ToolService = Depends(get_tool_service)
+):
     """Update a tool."""
-    tool = next((t for t in mock_tools if t["id"] == tool_id), None)
+    try:
+        tool = await tool_service.update_tool(tool_id, tool_update, current_user["user_id"])
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to update tool: {str(e)}"
+        )
+    
     if not tool:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Tool not found"
         )
-    
-    # Update tool fields
-    if tool_update.name is not None:
-        tool["name"] = tool_update.name
-    if tool_update.type is not None:
-        tool["type"] = tool_update.type
-    if tool_update.description is not None:
-        tool["description"] = tool_update.description
-    
-    tool["updated_at"] = "2024-01-01T00:00:00Z"
     return tool
 
 
 @router.delete("/tools/{tool_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_tool(tool_id: int):
+async def delete_tool(
+    tool_id: UUID,
+    current_user: dict = Depends(get_current_user),
+    tool_service: ToolService = Depends(get_tool_service)
+):
     """Delete a tool."""
-    global mock_tools
-    tool = next((t for t in mock_tools if t["id"] == tool_id), None)
-    if not tool:
+    deleted = await tool_service.delete_tool(tool_id, current_user["user_id"])
+    if not deleted:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Tool not found"
         )
-    
-    mock_tools = [t for t in mock_tools if t["id"] != tool_id]
     return None
\ No newline at end of file
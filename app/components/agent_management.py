@@ -7,23 +7,29 @@ from app.utils.error_handler import safe_async_call, LoadingState, show_success_
 
 
 async def load_agents(api_client) -> Optional[List[Dict]]:
-    """Load agents from API."""
-    return await api_client.list_agents()
+    """Load agents, served from the client cache when possible."""
+    return await api_client.cache.get("agents", api_client.fetch_agents)
 
 
 async def create_agent_api(api_client, agent_data: Dict) -> Optional[Dict]:
     """Create agent via API."""
-    return await api_client.create_agent(agent_data)
+    result = await api_client.create_agent(agent_data)
+    api_client.cache.invalidate("agents")
+    return result
 
 
 async def update_agent_api(api_client, agent_id: str, agent_data: Dict) -> Optional[Dict]:
     """Update agent via API."""
-    return await api_client.update_agent(agent_id, agent_data)
+    result = await api_client.update_agent(agent_id, agent_data)
+    api_client.cache.invalidate("agents")
+    return result
 
 
 async def delete_agent_api(api_client, agent_id: str) -> Optional[Dict]:
     """Delete agent via API."""
-    return await api_client.delete_agent(agent_id)
+    result = await api_client.delete_agent(agent_id)
+    api_client.cache.invalidate("agents")
+    return result
 
 
 def create_agent_form(tools_data: List[Dict]):
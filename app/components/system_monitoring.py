@@ -1,17 +1,20 @@
 """System monitoring UI component."""
 
 import streamlit as st
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from app.utils.error_handler import safe_async_call, LoadingState
 
 
-def display_system_metrics(agents_count: int, tools_count: int):
+def display_system_metrics(agents_count: int, tools_count: int, api_health: Optional[Dict] = None):
     """Display system metrics."""
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.metric("API Status", "🟢 Online", "Healthy")
+        if api_health:
+            st.metric("API Status", "🟢 Online", api_health.get("status", "healthy").title())
+        else:
+            st.metric("API Status", "🔴 Offline", "Unreachable", delta_color="inverse")
     
     with col2:
         st.metric("Total Agents", agents_count)
@@ -41,7 +44,7 @@ def system_monitoring(api_client, agents_data: List[Dict], tools_data: List[Dict
     # Display metrics
     agents_count = len(agents_data)
     tools_count = len(tools_data)
-    display_system_metrics(agents_count, tools_count)
+    display_system_metrics(agents_count, tools_count, st.session_state.get("api_health"))
 
     # API Health Check
     api_health_check_section(api_client)
@@ -7,18 +7,22 @@ from app.utils.error_handler import safe_async_call, LoadingState, show_success_
 
 
 async def load_tools(api_client) -> Optional[List[Dict]]:
-    """Load tools from API."""
-    return await api_client.list_tools()
+    """Load tools, served from the client cache when possible."""
+    return await api_client.cache.get("tools", api_client.fetch_tools)
 
 
 async def create_tool_api(api_client, tool_data: Dict) -> Optional[Dict]:
     """Create tool via API."""
-    return await api_client.create_tool(tool_data)
+    result = await api_client.create_tool(tool_data)
+    api_client.cache.invalidate("tools")
+    return result
 
 
 async def delete_tool_api(api_client, tool_id: str) -> Optional[Dict]:
     """Delete tool via API."""
-    return await api_client.delete_tool(tool_id)
+    result = await api_client.delete_tool(tool_id)
+    api_client.cache.invalidate("tools")
+    return result
 
 
 def create_tool_form():
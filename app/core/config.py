@@ -1,7 +1,7 @@
 """Application configuration."""
 
 import os
-from typing import Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseSettings
 
@@ -16,10 +16,104 @@ class Settings(BaseSettings):
     
     # Google Gemini API
     GOOGLE_API_KEY: Optional[str] = None
+    LLM_CLIENT_POOL_SIZE: int = 32
+    SUPPORTED_MODELS: List[str] = ["gemini-pro", "gemini-pro-vision", "gemini-1.5-pro"]
+    
+    # Prompt context: model context sizes in tokens, and the most history
+    # messages considered before trimming to the agent's token budget
+    MODEL_CONTEXT_TOKENS: Dict[str, int] = {
+        "gemini-pro": 30720,
+        "gemini-pro-vision": 12288,
+        "gemini-1.5-pro": 1048576,
+    }
+    DEFAULT_CONTEXT_TOKENS: int = 30720
+    CONTEXT_MAX_HISTORY_MESSAGES: int = 200
+    
+    # Token counting: optional local vocabulary file (one token per line;
+    # a built-in heuristic is used without one) and counts cached by content
+    TOKENIZER_VOCAB_PATH: Optional[str] = None
+    TOKEN_COUNT_CACHE_SIZE: int = 100000
+    
+    # Rolling chat summaries: once more than CHAT_SUMMARY_TRIGGER_MESSAGES
+    # messages sit before the CHAT_SUMMARY_KEEP_RECENT most recent ones, a
+    # background task folds them into the session summary
+    CHAT_SUMMARY_ENABLED: bool = False
+    CHAT_SUMMARY_KEEP_RECENT: int = 20
+    CHAT_SUMMARY_TRIGGER_MESSAGES: int = 20
+    CHAT_SUMMARY_MAX_TOKENS: int = 512
+    
+    # Provider call resilience: per-attempt timeout, overall deadline
+    # including retries, jittered exponential backoff, and a per-model
+    # circuit breaker opening after consecutive transient failures
+    LLM_TIMEOUT_SECONDS: float = 30
+    LLM_DEADLINE_SECONDS: float = 60
+    LLM_MAX_RETRIES: int = 2
+    LLM_RETRY_BASE_DELAY_SECONDS: float = 0.5
+    LLM_RETRY_MAX_DELAY_SECONDS: float = 8
+    LLM_BREAKER_FAILURE_THRESHOLD: int = 5
+    LLM_BREAKER_RESET_SECONDS: float = 30
+    
+    # Fallback models tried in order when a model is unavailable, e.g.
+    # {"gemini-pro": ["gemini-1.5-pro"]}; agents can set their own list
+    LLM_FALLBACK_MODELS: Dict[str, List[str]] = {}
+    
+    # Share one provider call among concurrent identical requests
+    LLM_COALESCE_ENABLED: bool = True
+    
+    # Agent validation: "local" (schema and model name only), "background"
+    # (local, plus a cached live probe per model run after the response) or
+    # "live" (blocking provider round-trip on every create/update)
+    AGENT_VALIDATION_MODE: str = "local"
+    LLM_PROBE_TTL_SECONDS: int = 600
+    
+    # LLM response cache (temperature 0 agents only)
+    LLM_CACHE_ENABLED: bool = False
+    LLM_CACHE_TTL_SECONDS: int = 3600
+    LLM_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    LLM_CACHE_DISK_PATH: Optional[str] = None
+    LLM_CACHE_DISK_MAX_BYTES: int = 512 * 1024 * 1024
+    
+    # LLM call limits per user, agent and model: calls per minute with a
+    # burst allowance, and calls in flight per worker (0 disables a limit)
+    RATE_LIMIT_ENABLED: bool = False
+    RATE_LIMIT_USER_PER_MINUTE: float = 60
+    RATE_LIMIT_USER_BURST: int = 10
+    RATE_LIMIT_USER_MAX_CONCURRENT: int = 4
+    RATE_LIMIT_AGENT_PER_MINUTE: float = 120
+    RATE_LIMIT_AGENT_BURST: int = 20
+    RATE_LIMIT_AGENT_MAX_CONCURRENT: int = 8
+    RATE_LIMIT_MODEL_PER_MINUTE: float = 0
+    RATE_LIMIT_MODEL_BURST: int = 0
+    RATE_LIMIT_MODEL_MAX_CONCURRENT: int = 32
+    
+    # Health probes run in the background; the health endpoint serves the
+    # last report. The provider is probed less often, with a minimal request
+    HEALTH_CHECK_INTERVAL_SECONDS: float = 10
+    HEALTH_LLM_PROBE_INTERVAL_SECONDS: float = 300
+    HEALTH_LLM_PROBE_MODEL: str = "gemini-pro"
+    HEALTH_PROBE_TIMEOUT_SECONDS: float = 5
+    HEALTH_LOOP_LAG_THRESHOLD_SECONDS: float = 0.25
     
     # Server Configuration
     HOST: str = "0.0.0.0"
     PORT: int = 8000
+    FRONTEND_PORT: int = 8501
+    
+    # launch.py mode: "development" runs one auto-reloading process,
+    # "production" runs SERVER_WORKERS processes (0 = one per CPU core)
+    # on uvloop/httptools and drains open requests on shutdown
+    SERVER_MODE: str = "development"
+    SERVER_WORKERS: int = 0
+    SERVER_GRACEFUL_SHUTDOWN_SECONDS: int = 30
+    SERVER_READY_TIMEOUT_SECONDS: float = 30
+    
+    # Maximum number of items accepted by batch endpoints
+    BATCH_MAX_ITEMS: int = 500
+    
+    # Storage ("memory" or "sqlite")
+    STORAGE_BACKEND: str = "memory"
+    SQLITE_PATH: str = "data/app.db"
+    SQLITE_POOL_SIZE: int = 5
     
     # Logging
     LOG_LEVEL: str = "INFO"
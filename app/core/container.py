@@ -0,0 +1,85 @@
+"""Application container holding the shared service instances."""
+
+from typing import List, Optional
+
+from app.core.metrics import Counter, Gauge, Metric
+from app.services.agent_service import AgentService
+from app.services.chat_service import ChatService
+from app.services.health_monitor import HealthMonitor
+from app.services.llm_service import LLMService
+from app.services.tool_service import ToolService
+from app.storage.base import StorageBackend
+from app.storage.factory import get_storage_backend
+from app.storage.instrumented import InstrumentedStorageBackend
+
+
+class ServiceContainer:
+    """One storage backend, one LLM service (and client pool) and the services built on them.
+    
+    Created once per application in the FastAPI lifespan and reached from
+    endpoints through ``app.core.dependencies``, so every request shares the
+    same services instead of building its own LLM clients.
+    """
+    
+    def __init__(
+        self,
+        storage: Optional[StorageBackend] = None,
+        llm_service: Optional[LLMService] = None
+    ):
+        """Build the services."""
+        self.storage = InstrumentedStorageBackend(storage or get_storage_backend())
+        self.llm_service = llm_service or LLMService()
+        self.agent_service = AgentService(storage=self.storage, llm_service=self.llm_service)
+        self.tool_service = ToolService(storage=self.storage)
+        self.chat_service = ChatService(
+            storage=self.storage,
+            agent_service=self.agent_service,
+            llm_service=self.llm_service
+        )
+        self.health = HealthMonitor.from_settings(self.storage, self.llm_service)
+    
+    async def start(self) -> None:
+        """Open storage connections and start the health probes."""
+        await self.storage.connect()
+        await self.health.start()
+    
+    async def close(self) -> None:
+        """Stop the health probes and background summaries, then release storage connections."""
+        await self.health.stop()
+        await self.chat_service.aclose()
+        await self.storage.close()
+    
+    def collect_metrics(self) -> List[Metric]:
+        """Cache, coalescing and resilience metrics read from the services when scraped."""
+        llm_service = self.llm_service
+        cache_stats = {
+            "llm_response": llm_service.response_cache.stats() if llm_service.response_cache else None,
+            "llm_client_pool": llm_service.client_pool.stats() if llm_service.client_pool else None,
+            "token_count": llm_service.token_counter.stats(),
+        }
+        
+        hits = Counter("cache_hits_total", "Cache lookups that hit.", ["cache"])
+        misses = Counter("cache_misses_total", "Cache lookups that missed.", ["cache"])
+        hit_ratio = Gauge("cache_hit_ratio", "Share of cache lookups that hit.", ["cache"])
+        for name, stats in cache_stats.items():
+            if stats is None:
+                continue
+            hits.inc(name, amount=stats["hits"])
+            misses.inc(name, amount=stats["misses"])
+            lookups = stats["hits"] + stats["misses"]
+            hit_ratio.set(stats["hits"] / lookups if lookups else 0.0, name)
+        
+        events = Counter("llm_call_events_total", "Provider call resilience, routing and coalescing events.", ["event"])
+        resilience_stats = llm_service.resilience.stats()
+        for event in ("retries", "timeouts", "short_circuits"):
+            events.inc(event, amount=resilience_stats[event])
+        for event, count in llm_service.router.stats().items():
+            events.inc(event, amount=count)
+        if llm_service.single_flight is not None:
+            events.inc("coalesced", amount=llm_service.single_flight.stats()["coalesced"])
+        
+        circuits = Gauge("llm_circuit_open", "1 while a model's circuit breaker is open or half-open.", ["model"])
+        for model_name, state in resilience_stats["circuits"].items():
+            circuits.set(0 if state == "closed" else 1, model_name)
+        
+        return [hits, misses, hit_ratio, events, circuits]
\ No newline at end of file
@@ -2,10 +2,15 @@
 
 from typing import Generator
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, WebSocket, status
+from fastapi.requests import HTTPConnection
 from fastapi.security import HTTPBearer
 
 from app.core.config import settings, Settings
+from app.core.container import ServiceContainer
+from app.services.agent_service import AgentService
+from app.services.chat_service import ChatService
+from app.services.tool_service import ToolService
 
 security = HTTPBearer(auto_error=False)
 
@@ -30,4 +35,30 @@ def get_current_user(authenticated: bool = Depends(verify_api_key)):
             detail="Invalid authentication credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    return {"user_id": "default_user"}  # Replace with actual user data
\ No newline at end of file
+    return {"user_id": "default_user"}  # Replace with actual user data
+
+
+def get_current_websocket_user(websocket: WebSocket):
+    """Get current authenticated user for a WebSocket connection."""
+    # Implement token verification (e.g. from query params) here
+    return {"user_id": "default_user"}
+
+
+def get_container(connection: HTTPConnection) -> ServiceContainer:
+    """Get the application container created in the lifespan."""
+    return connection.app.state.container
+
+
+def get_agent_service(container: ServiceContainer = Depends(get_container)) -> AgentService:
+    """Get the shared agent service."""
+    return container.agent_service
+
+
+def get_tool_service(container: ServiceContainer = Depends(get_container)) -> ToolService:
+    """Get the shared tool service."""
+    return container.tool_service
+
+
+def get_chat_service(container: ServiceContainer = Depends(get_container)) -> ChatService:
+    """Get the shared chat service."""
+    return container.chat_service
\ No newline at end of file
@@ -0,0 +1,34 @@
+"""Conditional GET helpers (ETag / If-None-Match)."""
+
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Request, Response, status
+
+
+def make_etag(version: str, *variant: Any) -> str:
+    """Build a strong ETag from a collection version and the request variant.
+    
+    ``version`` changes on every write to the collection; ``variant`` holds
+    whatever else selects the representation (user, page size, cursor), so
+    each page of a list gets its own validator without hashing the body.
+    """
+    digest = hashlib.sha1("|".join(str(part) for part in variant).encode()).hexdigest()[:12]
+    return f'"{version}-{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check whether the request's If-None-Match header matches ``etag``."""
+    header: Optional[str] = request.headers.get("if-none-match")
+    if not header:
+        return False
+    
+    # If-None-Match uses weak comparison, so W/"x" matches "x"
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    candidates = [candidate[2:] if candidate.startswith("W/") else candidate for candidate in candidates]
+    return "*" in candidates or etag in candidates
+
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response carrying the current ETag."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
\ No newline at end of file
@@ -0,0 +1,239 @@
+"""In-process Prometheus-style metrics.
+
+Recording a value is a dictionary update and, for histograms, a bisect, so
+instrumented hot paths pay next to nothing; the text exposition format is
+only built when ``/metrics`` is scraped. Each worker process keeps its own
+values, like the default (non multiprocess) Prometheus client.
+"""
+
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+STORAGE_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+TOKEN_BUCKETS = (16, 64, 256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+LabelValues = Tuple[str, ...]
+
+
+def format_value(value: float) -> str:
+    """Format a sample value."""
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+def format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """Format a label set, escaping values."""
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+        pairs.append(f"{name}=\"{value}\"")
+    return "{" + ",".join(pairs) + "}"
+
+
+class Metric:
+    """Named metric with one value per label set."""
+    
+    type = "untyped"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """Initialize metric."""
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+    
+    def samples(self) -> Iterable[Tuple[str, Sequence[str], Sequence[str], float]]:
+        """(name, label names, label values, value) of every sample."""
+        for labels, value in self._values.items():
+            yield self.name, self.labelnames, labels, value
+    
+    def render(self) -> List[str]:
+        """Exposition lines for this metric."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        for name, labelnames, labels, value in self.samples():
+            lines.append(f"{name}{format_labels(labelnames, labels)} {format_value(value)}")
+        return lines
+
+
+class Counter(Metric):
+    """Monotonically increasing count."""
+    
+    type = "counter"
+    
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        """Add to the count of a label set."""
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+
+class Gauge(Metric):
+    """Value that can go up and down."""
+    
+    type = "gauge"
+    
+    def set(self, value: float, *labels: str) -> None:
+        """Set the value of a label set."""
+        self._values[labels] = value
+    
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        """Increase the value of a label set."""
+        self._values[labels] = self._values.get(labels, 0) + amount
+    
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        """Decrease the value of a label set."""
+        self._values[labels] = self._values.get(labels, 0) - amount
+
+
+class Histogram(Metric):
+    """Distribution of observed values over fixed buckets."""
+    
+    type = "histogram"
+    
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        """Initialize histogram."""
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        # label set -> [per-bucket counts (last is +Inf), sum]
+        self._series: Dict[LabelValues, list] = {}
+    
+    def observe(self, value: float, *labels: str) -> None:
+        """Record one observation."""
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+    
+    def samples(self) -> Iterable[Tuple[str, Sequence[str], Sequence[str], float]]:
+        """Cumulative bucket, sum and count samples of every label set."""
+        bucket_labelnames = self.labelnames + ("le",)
+        for labels, (counts, total) in self._series.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                yield f"{self.name}_bucket", bucket_labelnames, labels + (format_value(bound),), cumulative
+            yield f"{self.name}_sum", self.labelnames, labels, total
+            yield f"{self.name}_count", self.labelnames, labels, cumulative
+
+
+class MetricsRegistry:
+    """Metrics exposed on ``/metrics``."""
+    
+    def __init__(self):
+        """Initialize registry."""
+        self._metrics: List[Metric] = []
+    
+    def register(self, metric: Metric) -> Metric:
+        """Add a metric."""
+        self._metrics.append(metric)
+        return metric
+    
+    def render(self, extra: Iterable[Metric] = ()) -> str:
+        """Text exposition of all metrics, plus metrics collected at scrape time."""
+        lines = []
+        for metric in [*self._metrics, *extra]:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+HTTP_REQUEST_SECONDS = registry.register(Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route, until the response body is sent.",
+    ["method", "route", "status"]
+))
+HTTP_REQUESTS_IN_FLIGHT = registry.register(Gauge(
+    "http_requests_in_flight",
+    "HTTP requests being served."
+))
+LLM_CALL_SECONDS = registry.register(Histogram(
+    "llm_call_duration_seconds",
+    "Provider call latency by answering model, including retries.",
+    ["model", "operation"]
+))
+LLM_CALL_ERRORS = registry.register(Counter(
+    "llm_call_errors_total",
+    "Failed provider calls.",
+    ["model", "operation"]
+))
+LLM_TIME_TO_FIRST_TOKEN_SECONDS = registry.register(Histogram(
+    "llm_time_to_first_token_seconds",
+    "Time until a streamed response's first chunk.",
+    ["model"]
+))
+LLM_TOKENS = registry.register(Histogram(
+    "llm_tokens",
+    "Prompt and completion tokens per provider call.",
+    ["model", "kind"],
+    buckets=TOKEN_BUCKETS
+))
+STORAGE_OPERATION_SECONDS = registry.register(Histogram(
+    "storage_operation_duration_seconds",
+    "Storage repository call latency.",
+    ["repository", "operation"],
+    buckets=STORAGE_BUCKETS
+))
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency and requests in flight.
+    
+    Requests are labelled with their route template (e.g.
+    ``/api/v1/agents/{agent_id}``) rather than the raw path, so ids do not
+    create new series; requests matching no route share one label.
+    """
+    
+    def __init__(self, app):
+        """Initialize middleware."""
+        self.app = app
+        self._route_paths: Dict = {}
+    
+    def _route_path(self, scope) -> str:
+        """Route template of the endpoint that handled a request."""
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        if endpoint not in self._route_paths:
+            for route in scope["app"].routes:
+                if getattr(route, "endpoint", None) is not None:
+                    self._route_paths[route.endpoint] = route.path
+        return self._route_paths.get(endpoint, "unmatched")
+    
+    async def __call__(self, scope, receive, send):
+        """Time an HTTP request."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        status = ["500"]
+        
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = str(message["status"])
+            await send(message)
+        
+        start = time.perf_counter()
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - start,
+                scope["method"],
+                self._route_path(scope),
+                status[0]
+            )
\ No newline at end of file
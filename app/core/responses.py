@@ -0,0 +1,71 @@
+"""Fast JSON responses (orjson when installed, stdlib json otherwise)."""
+
+import json
+from datetime import date, datetime, time
+from enum import Enum
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """Encode values the JSON library does not handle itself.
+    
+    Models are encoded from their field values (``__dict__``) rather than
+    through ``.dict()``, so nested models are neither copied nor validated;
+    the library calls back here for each of them.
+    """
+    if isinstance(obj, BaseModel):
+        return obj.__dict__
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, UUID):
+        return str(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize ``content`` (models, dicts, lists) to compact UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content,
+        default=_default,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with ``dumps``; accepts models as content."""
+    
+    def render(self, content: Any) -> bytes:
+        """Render content to JSON bytes."""
+        return dumps(content)
+
+
+def model_response(
+    content: Any,
+    status_code: int = 200,
+    headers: Optional[Dict[str, str]] = None
+) -> FastJSONResponse:
+    """Serialize a service result directly, skipping FastAPI's response model pass.
+    
+    Returning a response makes FastAPI skip re-validating the result against
+    ``response_model`` and converting it with ``jsonable_encoder``, which is
+    most of the cost of large lists. Only use it where the endpoint returns
+    exactly its declared response model, so the output is unchanged.
+    """
+    return FastJSONResponse(content, status_code=status_code, headers=headers)
\ No newline at end of file
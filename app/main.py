@@ -1,16 +1,36 @@
 """FastAPI application main module."""
 
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
 from app.api.v1.api import api_router
 from app.core.config import settings
+from app.core.container import ServiceContainer
+from app.core.dependencies import get_container
+from app.core.metrics import CONTENT_TYPE, MetricsMiddleware, registry
+from app.core.responses import FastJSONResponse
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create the shared services on startup and release them on shutdown."""
+    container = ServiceContainer()
+    await container.start()
+    app.state.container = container
+    yield
+    await container.close()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version="1.0.0",
     description="FastAPI Agent Backend with LangChain and Gemini integration",
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 # Set up CORS middleware
@@ -22,6 +42,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Record request latency for /metrics
+app.add_middleware(MetricsMiddleware)
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
@@ -40,4 +63,10 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy", "service": "FastAPI Agent Backend"}
\ No newline at end of file
+    return {"status": "healthy", "service": "FastAPI Agent Backend"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics(container: ServiceContainer = Depends(get_container)):
+    """Prometheus metrics endpoint."""
+    return PlainTextResponse(registry.render(container.collect_metrics()), media_type=CONTENT_TYPE)
\ No newline at end of file
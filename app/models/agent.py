@@ -17,6 +17,10 @@ class AgentBase(BaseModel):
     model_name: str = Field(default="gemini-pro")
     temperature: float = Field(default=0.7, ge=0.0, le=2.0)
     max_tokens: Optional[int] = Field(default=1000, gt=0)
+    # Models tried in order when model_name is unavailable (defaults from settings)
+    fallback_models: List[str] = Field(default_factory=list)
+    # Also ask the first fallback model if no answer arrives within this time
+    hedge_after_ms: Optional[int] = Field(None, gt=0)
     tools: List[str] = Field(default_factory=list)
     metadata: Dict = Field(default_factory=dict)
 
@@ -35,10 +39,18 @@ class AgentUpdate(BaseModel):
     model_name: Optional[str] = None
     temperature: Optional[float] = Field(None, ge=0.0, le=2.0)
     max_tokens: Optional[int] = Field(None, gt=0)
+    fallback_models: Optional[List[str]] = None
+    hedge_after_ms: Optional[int] = Field(None, gt=0)
     tools: Optional[List[str]] = None
     metadata: Optional[Dict] = None
 
 
+class AgentBatchUpdate(AgentUpdate):
+    """Agent update model for batch operations."""
+    
+    id: UUID
+
+
 class Agent(AgentBase, BaseEntity):
     """Complete agent model."""
     
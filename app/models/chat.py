@@ -37,6 +37,9 @@ class ChatSession(ChatSessionBase, BaseEntity):
     user_id: str
     is_active: bool = True
     message_count: int = 0
+    # Rolling summary of the first ``summarized_message_count`` messages
+    summary: Optional[str] = None
+    summarized_message_count: int = 0
     
     class Config:
         """Pydantic config."""
@@ -63,6 +66,7 @@ class ChatMessage(ChatMessageBase, BaseEntity):
     session_id: UUID
     user_id: str
     response_time_ms: Optional[int] = None
+    time_to_first_token_ms: Optional[int] = None
     token_count: Optional[int] = None
     
     class Config:
@@ -70,6 +74,22 @@ class ChatMessage(ChatMessageBase, BaseEntity):
         orm_mode = True
 
 
+class StreamEventType(str, Enum):
+    """Chat stream event type enumeration."""
+    
+    TOKEN = "token"
+    DONE = "done"
+    ERROR = "error"
+
+
+class ChatStreamEvent(BaseModel):
+    """Event emitted while streaming an agent response."""
+    
+    event: StreamEventType
+    content: Optional[str] = None
+    message: Optional[ChatMessage] = None
+
+
 class ChatResponse(BaseModel):
     """Chat response model."""
     
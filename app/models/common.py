@@ -1,10 +1,13 @@
 """Common data models."""
 
 from datetime import datetime
-from typing import Optional
+from typing import Generic, List, Optional, TypeVar
 from uuid import UUID, uuid4
 
 from pydantic import BaseModel, Field
+from pydantic.generics import GenericModel
+
+ItemT = TypeVar("ItemT")
 
 
 class BaseEntity(BaseModel):
@@ -24,4 +27,33 @@ class ResponseModel(BaseModel):
     
     success: bool = True
     message: str = "Operation completed successfully"
-    data: Optional[dict] = None
\ No newline at end of file
+    data: Optional[dict] = None
+
+
+class CursorPage(GenericModel, Generic[ItemT]):
+    """One page of a list; pass ``next_cursor`` back to get the next page."""
+    
+    items: List[ItemT] = Field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+
+class BatchItemResult(BaseModel):
+    """Outcome of one item in a batch operation."""
+    
+    index: int
+    id: Optional[UUID] = None
+    success: bool = True
+    error: Optional[str] = None
+
+
+class BatchResponse(BaseModel):
+    """Batch operation response model."""
+    
+    success: bool = True
+    results: List[BatchItemResult] = Field(default_factory=list)
+
+
+class BatchDeleteRequest(BaseModel):
+    """Batch delete request model."""
+    
+    ids: List[UUID] = Field(..., min_items=1)
\ No newline at end of file
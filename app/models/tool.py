@@ -37,6 +37,12 @@ class ToolUpdate(BaseModel):
     metadata: Optional[Dict] = None
 
 
+class ToolBatchUpdate(ToolUpdate):
+    """Tool update model for batch operations."""
+    
+    id: UUID
+
+
 class Tool(ToolBase, BaseEntity):
     """Complete tool model."""
     
@@ -1,21 +1,47 @@
 """Agent service for managing AI agents."""
 
+import asyncio
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from uuid import UUID
 
-from app.models.agent import Agent, AgentCreate, AgentUpdate
+from app.core.config import settings
+from app.models.agent import Agent, AgentBatchUpdate, AgentCreate, AgentUpdate
+from app.models.common import BatchItemResult, CursorPage
+from app.services.batch import check_batch_size, raise_for_failures
 from app.services.llm_service import LLMService
+from app.services.pagination import paginate_for_user
+from app.storage.base import StorageBackend
+from app.storage.factory import get_storage_backend
 
 
 class AgentService:
     """Service for managing agents."""
     
-    def __init__(self):
+    def __init__(
+        self,
+        storage: Optional[StorageBackend] = None,
+        llm_service: Optional[LLMService] = None
+    ):
         """Initialize agent service."""
-        self.llm_service = LLMService()
-        # In a real application, you would inject a database service here
-        self._agents_storage = {}  # Temporary in-memory storage
+        self.llm_service = llm_service or LLMService()
+        self.storage = storage or get_storage_backend()
+        self._agents_storage = self.storage.agents
+    
+    async def _validate_agent(self, agent: Agent, error_message: str) -> None:
+        """Validate an agent according to AGENT_VALIDATION_MODE."""
+        errors = self.llm_service.validate_agent_config_locally(agent)
+        if errors:
+            raise ValueError(f"{error_message}: {'; '.join(errors)}")
+        
+        mode = settings.AGENT_VALIDATION_MODE
+        if mode == "live":
+            is_valid = await self.llm_service.validate_agent_config(agent)
+            if not is_valid:
+                raise ValueError(error_message)
+        elif mode == "background":
+            # Probe the model off the request path; results are cached per model
+            self.llm_service.schedule_model_probe(agent.model_name)
     
     async def create_agent(self, agent_data: AgentCreate, user_id: str) -> Agent:
         """Create a new agent."""
@@ -25,18 +51,16 @@ class AgentService:
         )
         
         # Validate agent configuration
-        is_valid = await self.llm_service.validate_agent_config(agent)
-        if not is_valid:
-            raise ValueError("Invalid agent configuration")
+        await self._validate_agent(agent, "Invalid agent configuration")
         
-        # Store agent (in real app, this would be in a database)
-        self._agents_storage[str(agent.id)] = agent
+        # Store agent
+        await self._agents_storage.add(agent)
         
         return agent
     
     async def get_agent(self, agent_id: UUID, user_id: str) -> Optional[Agent]:
         """Get agent by ID."""
-        agent = self._agents_storage.get(str(agent_id))
+        agent = await self._agents_storage.get(agent_id)
         if agent and agent.user_id == user_id:
             return agent
         return None
@@ -44,15 +68,16 @@ class AgentService:
     async def list_agents(
         self, 
         user_id: str, 
-        skip: int = 0, 
-        limit: int = 100
-    ) -> List[Agent]:
-        """List all agents for a user."""
-        user_agents = [
-            agent for agent in self._agents_storage.values()
-            if agent.user_id == user_id and agent.is_active
-        ]
-        return user_agents[skip:skip + limit]
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> CursorPage[Agent]:
+        """List one page of a user's agents, oldest first."""
+        return await paginate_for_user(self._agents_storage, user_id, limit=limit, cursor=cursor)
+    
+    async def get_agents_version(self, user_id: str) -> str:
+        """Version of a user's agent list; changes on every agent write."""
+        version = await self._agents_storage.version_for_user(user_id)
+        return f"{self.storage.epoch}.{version}"
     
     async def update_agent(
         self, 
@@ -73,12 +98,10 @@ class AgentService:
         agent.updated_at = datetime.utcnow()
         
         # Validate updated configuration
-        is_valid = await self.llm_service.validate_agent_config(agent)
-        if not is_valid:
-            raise ValueError("Invalid agent configuration after update")
+        await self._validate_agent(agent, "Invalid agent configuration after update")
         
         # Store updated agent
-        self._agents_storage[str(agent.id)] = agent
+        await self._agents_storage.save(agent)
         
         return agent
     
@@ -91,5 +114,129 @@ class AgentService:
         # Soft delete
         agent.is_active = False
         agent.updated_at = datetime.utcnow()
+        await self._agents_storage.save(agent)
+        
+        return True
+    
+    async def _validate_agents_batch(
+        self,
+        agents: List[Agent],
+        results: List[BatchItemResult]
+    ) -> None:
+        """Validate a batch in one pass, recording failures in ``results``.
+        
+        Live and background probes run once per distinct model rather than
+        once per agent.
+        """
+        for agent, result in zip(agents, results):
+            if not result.success:
+                continue
+            errors = self.llm_service.validate_agent_config_locally(agent)
+            if errors:
+                result.success = False
+                result.error = "; ".join(errors)
+        
+        model_names = {
+            agent.model_name for agent, result in zip(agents, results) if result.success
+        }
+        mode = settings.AGENT_VALIDATION_MODE
+        if mode == "live":
+            reachable = await asyncio.gather(*(
+                self.llm_service.probe_model(model_name) for model_name in model_names
+            ))
+            unreachable = {
+                model_name for model_name, ok in zip(model_names, reachable) if not ok
+            }
+            for agent, result in zip(agents, results):
+                if result.success and agent.model_name in unreachable:
+                    result.success = False
+                    result.error = f"Model '{agent.model_name}' is not reachable"
+        elif mode == "background":
+            for model_name in model_names:
+                self.llm_service.schedule_model_probe(model_name)
+    
+    async def _load_batch_targets(
+        self,
+        agent_ids: List[UUID],
+        user_id: str
+    ) -> Tuple[List[Optional[Agent]], List[BatchItemResult]]:
+        """Fetch the agents a batch refers to, flagging missing and repeated IDs."""
+        agents = []
+        results = []
+        seen = set()
+        for index, agent_id in enumerate(agent_ids):
+            agent = await self.get_agent(agent_id, user_id)
+            result = BatchItemResult(index=index, id=agent_id)
+            if agent_id in seen:
+                result.success = False
+                result.error = "Duplicate agent ID in batch"
+            elif not agent or not agent.is_active:
+                result.success = False
+                result.error = "Agent not found"
+            seen.add(agent_id)
+            agents.append(agent)
+            results.append(result)
+        return agents, results
+    
+    async def create_agents(
+        self,
+        agents_data: List[AgentCreate],
+        user_id: str
+    ) -> List[BatchItemResult]:
+        """Create several agents; either all are created or none are."""
+        check_batch_size(len(agents_data))
+        
+        agents = [Agent(**agent_data.dict(), user_id=user_id) for agent_data in agents_data]
+        results = [
+            BatchItemResult(index=index, id=agent.id) for index, agent in enumerate(agents)
+        ]
+        
+        await self._validate_agents_batch(agents, results)
+        raise_for_failures(results)
+        
+        await self._agents_storage.save_many(agents)
+        
+        return results
+    
+    async def update_agents(
+        self,
+        agent_updates: List[AgentBatchUpdate],
+        user_id: str
+    ) -> List[BatchItemResult]:
+        """Update several agents; either all are updated or none are."""
+        check_batch_size(len(agent_updates))
+        
+        current, results = await self._load_batch_targets(
+            [agent_update.id for agent_update in agent_updates],
+            user_id
+        )
+        
+        # Apply updates to copies so stored agents stay untouched until commit
+        now = datetime.utcnow()
+        agents = []
+        for agent, agent_update, result in zip(current, agent_updates, results):
+            if result.success:
+                update_data = agent_update.dict(exclude_unset=True, exclude={"id"})
+                agent = agent.copy(update={**update_data, "updated_at": now})
+            agents.append(agent)
+        
+        await self._validate_agents_batch(agents, results)
+        raise_for_failures(results)
+        
+        await self._agents_storage.save_many(agents)
+        
+        return results
+    
+    async def delete_agents(self, agent_ids: List[UUID], user_id: str) -> List[BatchItemResult]:
+        """Soft delete several agents; either all are deleted or none are."""
+        check_batch_size(len(agent_ids))
+        
+        current, results = await self._load_batch_targets(agent_ids, user_id)
+        raise_for_failures(results)
+        
+        now = datetime.utcnow()
+        await self._agents_storage.save_many([
+            agent.copy(update={"is_active": False, "updated_at": now}) for agent in current
+        ])
         
-        return True
\ No newline at end of file
+        return results
\ No newline at end of file
@@ -0,0 +1,40 @@
+"""Helpers for all-or-nothing batch operations."""
+
+from typing import Any, List
+
+from app.core.config import settings
+from app.models.common import BatchItemResult
+
+
+class BatchOperationError(ValueError):
+    """Raised when any item of a batch fails; no item has been applied."""
+    
+    def __init__(self, results: List[BatchItemResult]):
+        """Initialize with the per-item results."""
+        self.results = results
+        failed = sum(1 for result in results if not result.success)
+        super().__init__(f"{failed} of {len(results)} batch items failed; no changes were applied")
+
+
+def check_batch_size(count: int) -> None:
+    """Reject empty or oversized batches."""
+    if count == 0:
+        raise ValueError("Batch must contain at least one item")
+    if count > settings.BATCH_MAX_ITEMS:
+        raise ValueError(f"Batch exceeds the maximum of {settings.BATCH_MAX_ITEMS} items")
+
+
+def raise_for_failures(results: List[BatchItemResult]) -> None:
+    """Raise BatchOperationError if any item failed."""
+    if any(not result.success for result in results):
+        raise BatchOperationError(results)
+
+
+def batch_error_detail(error: ValueError) -> Any:
+    """Error detail for a failed batch, including per-item results when available."""
+    if isinstance(error, BatchOperationError):
+        return {
+            "message": str(error),
+            "results": [result.dict() for result in error.results]
+        }
+    return str(error)
\ No newline at end of file
@@ -1,30 +1,84 @@
 """Chat service for managing chat sessions and messages."""
 
+import asyncio
+import time
 from datetime import datetime
-from typing import List, Optional
+from typing import AsyncGenerator, AsyncIterator, Dict, List, Optional, Tuple
 from uuid import UUID
 
+from app.core.config import settings
+from app.models.agent import Agent
 from app.models.chat import (
     ChatMessage, 
     ChatMessageCreate, 
     ChatSession, 
     ChatSessionCreate,
-    MessageRole
+    ChatStreamEvent,
+    MessageRole,
+    StreamEventType
 )
+from app.models.common import CursorPage
 from app.services.agent_service import AgentService
 from app.services.llm_service import LLMService
+from app.services.pagination import decode_cursor, make_page, paginate_for_user
+from app.services.rate_limiter import RateLimiter, RateLimitLease, get_rate_limiter
+from app.services.resilience import CircuitOpenError
+from app.storage.base import StorageBackend
+from app.storage.factory import get_storage_backend
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class ChatStream:
+    """Events of one streamed turn; closing it releases the turn's rate-limit lease.
+    
+    A bare async generator only runs its ``finally`` once iteration has
+    started, so a response closed before its first chunk would keep the
+    lease forever. ``aclose`` releases it either way.
+    """
+    
+    def __init__(self, events: AsyncGenerator[ChatStreamEvent, None], lease: Optional[RateLimitLease] = None):
+        """Initialize chat stream."""
+        self._events = events
+        self._lease = lease
+    
+    def __aiter__(self) -> "ChatStream":
+        """Iterate over the events."""
+        return self
+    
+    async def __anext__(self) -> ChatStreamEvent:
+        """Next event."""
+        return await self._events.__anext__()
+    
+    async def aclose(self) -> None:
+        """Stop the stream and release its lease (safe to call more than once)."""
+        try:
+            await self._events.aclose()
+        finally:
+            if self._lease is not None:
+                self._lease.release()
 
 
 class ChatService:
     """Service for managing chat sessions and messages."""
     
-    def __init__(self):
+    def __init__(
+        self,
+        storage: Optional[StorageBackend] = None,
+        agent_service: Optional[AgentService] = None,
+        llm_service: Optional[LLMService] = None,
+        rate_limiter: Optional[RateLimiter] = None
+    ):
         """Initialize chat service."""
-        self.agent_service = AgentService()
-        self.llm_service = LLMService()
-        # In a real application, you would inject database services here
-        self._sessions_storage = {}  # Temporary in-memory storage
-        self._messages_storage = {}  # Temporary in-memory storage
+        self.storage = storage or get_storage_backend()
+        self.llm_service = llm_service or LLMService()
+        self.agent_service = agent_service or AgentService(storage=self.storage, llm_service=self.llm_service)
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self._sessions_storage = self.storage.sessions
+        self._messages_storage = self.storage.messages
+        # session_id -> running background summary task
+        self._summary_tasks: Dict[str, asyncio.Task] = {}
     
     async def create_session(
         self, 
@@ -43,18 +97,23 @@ class ChatService:
         )
         
         # Store session
-        self._sessions_storage[str(session.id)] = session
+        await self._sessions_storage.add(session)
         
         return session
     
-    async def send_message(
-        self, 
-        message_data: ChatMessageCreate, 
+    async def _prepare_turn(
+        self,
+        message_data: ChatMessageCreate,
         user_id: str
-    ) -> ChatMessage:
-        """Send a message and get agent response."""
+    ) -> Tuple[ChatSession, Agent, List[ChatMessage], Optional[RateLimitLease]]:
+        """Validate and admit a turn, store the user message and return its context.
+        
+        The returned lease (if rate limiting is enabled) holds the turn's
+        concurrency slots and must be released once the LLM call ends; it is
+        released here if storing the turn fails.
+        """
         # Verify session exists and belongs to user
-        session = self._sessions_storage.get(str(message_data.session_id))
+        session = await self._sessions_storage.get(message_data.session_id)
         if not session or session.user_id != user_id:
             raise ValueError("Session not found or access denied")
         
@@ -63,28 +122,124 @@ class ChatService:
         if not agent:
             raise ValueError("Agent not found")
         
-        # Create user message
-        user_message = ChatMessage(
-            **message_data.dict(),
-            user_id=user_id
-        )
+        # Admit the LLM call before storing anything, so rejected turns leave no trace
+        lease = None
+        if self.rate_limiter is not None:
+            lease = await self.rate_limiter.acquire(user_id, agent.id, agent.model_name)
+        
+        try:
+            # Create user message
+            user_message = ChatMessage(
+                **message_data.dict(),
+                user_id=user_id,
+                token_count=self.llm_service.token_counter.count(message_data.content)
+            )
+            
+            # Get recent chat history not yet folded into the session summary
+            # (before the new message, which is sent separately); the LLM
+            # service trims it to the agent's token budget
+            history_size = settings.CONTEXT_MAX_HISTORY_MESSAGES
+            if session.summarized_message_count:
+                total = await self._messages_storage.count(message_data.session_id)
+                history_size = min(history_size, total - session.summarized_message_count)
+            chat_history = await self._messages_storage.tail(message_data.session_id, history_size)
+            
+            # Store user message
+            await self._messages_storage.append(user_message)
+        except BaseException:
+            if lease is not None:
+                lease.release()
+            raise
+        
+        return session, agent, chat_history, lease
+    
+    async def _complete_turn(self, session: ChatSession, agent_message: ChatMessage) -> None:
+        """Store the agent message and update the session."""
+        # Store agent message
+        await self._messages_storage.append(agent_message)
         
-        # Store user message
-        self._messages_storage[str(user_message.id)] = user_message
+        # Update only the turn's fields, so a summary stored in the
+        # background meanwhile is kept
+        session = await self._sessions_storage.update(
+            session.id,
+            {"updated_at": datetime.utcnow()},
+            increments={"message_count": 2}
+        ) or session
         
-        # Get chat history
-        chat_history = await self.get_chat_history(
-            message_data.session_id, 
-            user_id, 
-            limit=10
-        )
+        self._schedule_summary(session)
+    
+    def _schedule_summary(self, session: ChatSession) -> None:
+        """Summarize a session in the background once enough messages are unsummarized."""
+        if not settings.CHAT_SUMMARY_ENABLED or str(session.id) in self._summary_tasks:
+            return
+        
+        unsummarized = session.message_count - session.summarized_message_count
+        if unsummarized < settings.CHAT_SUMMARY_KEEP_RECENT + settings.CHAT_SUMMARY_TRIGGER_MESSAGES:
+            return
+        
+        key = str(session.id)
+        task = asyncio.create_task(self._summarize_in_background(session))
+        self._summary_tasks[key] = task
+        task.add_done_callback(lambda _: self._summary_tasks.pop(key, None))
+    
+    async def _summarize_in_background(self, session: ChatSession) -> None:
+        """Run a summary task, logging instead of raising failures."""
+        try:
+            await self.summarize_session(session.id, session.user_id)
+        except Exception as e:
+            logger.warning("Failed to summarize session %s: %s", session.id, e)
+    
+    async def aclose(self) -> None:
+        """Cancel background summaries and wait for them to finish."""
+        tasks = list(self._summary_tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    
+    async def summarize_session(self, session_id: UUID, user_id: str) -> ChatSession:
+        """Fold messages older than the recent window into the session summary.
+        
+        Only messages added since the previous summary are sent to the LLM,
+        together with that summary, so each run costs the same however long
+        the session has grown.
+        """
+        session = await self._sessions_storage.get(session_id)
+        if not session or session.user_id != user_id:
+            raise ValueError("Session not found or access denied")
+        
+        agent = await self.agent_service.get_agent(session.agent_id, user_id)
+        if not agent:
+            raise ValueError("Agent not found")
+        
+        start = session.summarized_message_count
+        end = await self._messages_storage.count(session_id) - settings.CHAT_SUMMARY_KEEP_RECENT
+        if end <= start:
+            return session
+        
+        messages = await self._messages_storage.page(session_id, skip=start, limit=end - start)
+        summary = await self.llm_service.summarize(agent, messages, session.summary)
+        
+        # Update only the summary fields, so turns completed while summarizing are kept
+        return await self._sessions_storage.update(
+            session_id,
+            {"summary": summary, "summarized_message_count": end}
+        ) or session
+    
+    async def send_message(
+        self, 
+        message_data: ChatMessageCreate, 
+        user_id: str
+    ) -> ChatMessage:
+        """Send a message and get agent response."""
+        session, agent, chat_history, lease = await self._prepare_turn(message_data, user_id)
         
         # Generate agent response
         try:
             llm_response = await self.llm_service.generate_response(
                 agent=agent,
                 message=message_data.content,
-                chat_history=chat_history
+                chat_history=chat_history,
+                summary=session.summary
             )
             
             # Create agent response message
@@ -97,67 +252,140 @@ class ChatService:
                 token_count=llm_response.get("token_count")
             )
             
-            # Store agent message
-            self._messages_storage[str(agent_message.id)] = agent_message
-            
-            # Update session message count
-            session.message_count += 2
-            session.updated_at = datetime.utcnow()
+            await self._complete_turn(session, agent_message)
             
             return agent_message
             
+        except CircuitOpenError:
+            raise
         except Exception as e:
             raise Exception(f"Failed to generate agent response: {str(e)}")
+        finally:
+            if lease is not None:
+                lease.release()
+    
+    async def stream_message(
+        self,
+        message_data: ChatMessageCreate,
+        user_id: str
+    ) -> ChatStream:
+        """Send a message and return a stream of agent response events.
+        
+        Session and agent checks run before this returns, so callers can
+        report them as regular errors; the assembled agent message is stored
+        once the stream completes and sent in the final ``done`` event.
+        Callers must ``aclose()`` the stream when done with it, even if they
+        never iterate it.
+        """
+        session, agent, chat_history, lease = await self._prepare_turn(message_data, user_id)
+        return ChatStream(self._stream_turn(session, agent, message_data, chat_history, user_id, lease), lease)
+    
+    async def _stream_turn(
+        self,
+        session: ChatSession,
+        agent: Agent,
+        message_data: ChatMessageCreate,
+        chat_history: List[ChatMessage],
+        user_id: str,
+        lease: Optional[RateLimitLease] = None
+    ) -> AsyncIterator[ChatStreamEvent]:
+        """Relay LLM chunks as events and persist the assembled response."""
+        start_time = time.time()
+        time_to_first_token_ms = None
+        chunks = []
+        
+        try:
+            async for chunk in self.llm_service.stream_response(
+                agent=agent,
+                message=message_data.content,
+                chat_history=chat_history,
+                summary=session.summary
+            ):
+                if time_to_first_token_ms is None:
+                    time_to_first_token_ms = int((time.time() - start_time) * 1000)
+                chunks.append(chunk)
+                yield ChatStreamEvent(event=StreamEventType.TOKEN, content=chunk)
+        except Exception as e:
+            yield ChatStreamEvent(
+                event=StreamEventType.ERROR,
+                content=f"Failed to generate agent response: {str(e)}"
+            )
+            return
+        finally:
+            # Also runs when the client disconnects mid-stream
+            if lease is not None:
+                lease.release()
+        
+        content = "".join(chunks)
+        if not content:
+            yield ChatStreamEvent(
+                event=StreamEventType.ERROR,
+                content="Failed to generate agent response: empty response"
+            )
+            return
+        
+        agent_message = ChatMessage(
+            content=content,
+            role=MessageRole.ASSISTANT,
+            session_id=message_data.session_id,
+            user_id=user_id,
+            response_time_ms=int((time.time() - start_time) * 1000),
+            time_to_first_token_ms=time_to_first_token_ms,
+            token_count=self.llm_service.token_counter.count(content)
+        )
+        
+        await self._complete_turn(session, agent_message)
+        
+        yield ChatStreamEvent(event=StreamEventType.DONE, message=agent_message)
     
     async def get_chat_history(
         self, 
         session_id: UUID, 
         user_id: str,
-        skip: int = 0,
-        limit: int = 100
-    ) -> List[ChatMessage]:
-        """Get chat history for a session."""
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> CursorPage[ChatMessage]:
+        """Get one page of a session's chat history, oldest first."""
         # Verify session access
-        session = self._sessions_storage.get(str(session_id))
+        session = await self._sessions_storage.get(session_id)
         if not session or session.user_id != user_id:
             raise ValueError("Session not found or access denied")
         
-        # Get messages for session
-        session_messages = [
-            msg for msg in self._messages_storage.values()
-            if msg.session_id == session_id
-        ]
-        
-        # Sort by creation time
-        session_messages.sort(key=lambda x: x.created_at)
+        # Session log is already in creation order; resume after the cursor's message
+        after_id = decode_cursor(cursor)[1] if cursor else None
+        messages = await self._messages_storage.page(session_id, limit=limit + 1, after_id=after_id)
+        return make_page(messages, limit, lambda message: (message.created_at, str(message.id)))
+    
+    async def get_history_version(self, session_id: UUID, user_id: str) -> str:
+        """Version of a session's history; the log is append-only, so its length is its version."""
+        session = await self._sessions_storage.get(session_id)
+        if not session or session.user_id != user_id:
+            raise ValueError("Session not found or access denied")
         
-        return session_messages[skip:skip + limit]
+        count = await self._messages_storage.count(session_id)
+        return f"{self.storage.epoch}.{count}"
+    
+    async def get_sessions_version(self, user_id: str) -> str:
+        """Version of a user's session list; changes on every session write."""
+        version = await self._sessions_storage.version_for_user(user_id)
+        return f"{self.storage.epoch}.{version}"
     
     async def list_sessions(
         self, 
         user_id: str,
-        skip: int = 0,
-        limit: int = 100
-    ) -> List[ChatSession]:
-        """List all chat sessions for a user."""
-        user_sessions = [
-            session for session in self._sessions_storage.values()
-            if session.user_id == user_id and session.is_active
-        ]
-        
-        # Sort by updated time (most recent first)
-        user_sessions.sort(key=lambda x: x.updated_at or x.created_at, reverse=True)
-        
-        return user_sessions[skip:skip + limit]
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> CursorPage[ChatSession]:
+        """List one page of a user's chat sessions, most recently updated first."""
+        return await paginate_for_user(self._sessions_storage, user_id, limit=limit, cursor=cursor)
     
     async def delete_session(self, session_id: UUID, user_id: str) -> bool:
         """Delete a chat session."""
-        session = self._sessions_storage.get(str(session_id))
+        session = await self._sessions_storage.get(session_id)
         if not session or session.user_id != user_id:
             return False
         
         # Soft delete
-        session.is_active = False
-        session.updated_at = datetime.utcnow()
+        await self._sessions_storage.update(session_id, {"is_active": False, "updated_at": datetime.utcnow()})
         
         return True
\ No newline at end of file
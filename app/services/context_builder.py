@@ -0,0 +1,69 @@
+"""Token-budgeted selection of chat history for LLM prompts."""
+
+from typing import List, Optional
+
+from app.core.config import settings
+from app.models.agent import Agent
+from app.models.chat import ChatMessage
+from app.services.token_counter import TokenCounter, get_token_counter
+
+# Tokens added per prompt message for role and formatting markup
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+class ContextBuilder:
+    """Select the most recent chat history that fits an agent's prompt budget.
+    
+    The budget is the model's context size minus the tokens reserved for the
+    agent's response (``max_tokens``), the system prompt, the session summary
+    and the current message. History is walked newest first and stops at the
+    first message that does not fit, so the window stays contiguous. Stored
+    messages carry their ``token_count``; any without one are counted in a
+    single batch through the token counter's content cache.
+    """
+    
+    def __init__(self, token_counter: Optional[TokenCounter] = None):
+        """Initialize context builder."""
+        self.token_counter = token_counter or get_token_counter()
+    
+    def context_size(self, model_name: str) -> int:
+        """Context window of a model in tokens."""
+        return settings.MODEL_CONTEXT_TOKENS.get(model_name, settings.DEFAULT_CONTEXT_TOKENS)
+    
+    def message_tokens(self, messages: List[ChatMessage]) -> List[int]:
+        """Prompt tokens used by each stored message."""
+        uncounted = [message.content for message in messages if message.token_count is None]
+        counts = iter(self.token_counter.count_many(uncounted) if uncounted else [])
+        return [
+            (next(counts) if message.token_count is None else message.token_count) + MESSAGE_OVERHEAD_TOKENS
+            for message in messages
+        ]
+    
+    def history_budget(self, agent: Agent, message: str, summary: Optional[str] = None) -> int:
+        """Tokens left for chat history in an agent's prompt."""
+        budget = self.context_size(agent.model_name) - (agent.max_tokens or 0)
+        budget -= self.token_counter.count(agent.system_prompt) + MESSAGE_OVERHEAD_TOKENS
+        budget -= self.token_counter.count(message) + MESSAGE_OVERHEAD_TOKENS
+        if summary:
+            budget -= self.token_counter.count(summary) + MESSAGE_OVERHEAD_TOKENS
+        return budget
+    
+    def select(
+        self,
+        agent: Agent,
+        message: str,
+        chat_history: Optional[List[ChatMessage]] = None,
+        summary: Optional[str] = None
+    ) -> List[ChatMessage]:
+        """Get the most recent messages that fit the budget, oldest first."""
+        if not chat_history:
+            return []
+        
+        budget = self.history_budget(agent, message, summary)
+        tokens = self.message_tokens(chat_history)
+        start = len(chat_history)
+        while start > 0 and tokens[start - 1] <= budget:
+            budget -= tokens[start - 1]
+            start -= 1
+        
+        return chat_history[start:]
\ No newline at end of file
@@ -0,0 +1,171 @@
+"""Background component health probes with cached results."""
+
+import asyncio
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+from app.services.llm_service import LLMService
+from app.storage.base import StorageBackend
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Overall status is the worst component status in this order
+STATUS_ORDER = ("healthy", "degraded", "unhealthy")
+
+
+class HealthMonitor:
+    """Probe storage, the LLM provider, the response cache and the event loop.
+    
+    Probes run in a background task every ``HEALTH_CHECK_INTERVAL_SECONDS``
+    and the health endpoint only reads the last report, so it answers
+    without I/O and never calls the provider itself. The provider is probed
+    less often (``HEALTH_LLM_PROBE_INTERVAL_SECONDS``) since each probe is a
+    billable request; open circuit breakers are reported on every check.
+    Event-loop lag is how late the monitor's own sleep wakes up.
+    """
+    
+    def __init__(
+        self,
+        storage: StorageBackend,
+        llm_service: LLMService,
+        interval_seconds: float = 10,
+        llm_probe_interval_seconds: float = 300,
+        probe_timeout_seconds: float = 5,
+        lag_threshold_seconds: float = 0.25
+    ):
+        """Initialize health monitor."""
+        self.storage = storage
+        self.llm_service = llm_service
+        self.interval_seconds = interval_seconds
+        self.llm_probe_interval_seconds = llm_probe_interval_seconds
+        self.probe_timeout_seconds = probe_timeout_seconds
+        self.lag_threshold_seconds = lag_threshold_seconds
+        self.report: Dict[str, Any] = {"status": "starting", "components": {}, "checked_at": None}
+        self._loop_lag_seconds = 0.0
+        self._llm_reachable: Optional[bool] = None
+        self._llm_checked_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    @classmethod
+    def from_settings(cls, storage: StorageBackend, llm_service: LLMService) -> "HealthMonitor":
+        """Build a monitor from application settings."""
+        return cls(
+            storage,
+            llm_service,
+            interval_seconds=settings.HEALTH_CHECK_INTERVAL_SECONDS,
+            llm_probe_interval_seconds=settings.HEALTH_LLM_PROBE_INTERVAL_SECONDS,
+            probe_timeout_seconds=settings.HEALTH_PROBE_TIMEOUT_SECONDS,
+            lag_threshold_seconds=settings.HEALTH_LOOP_LAG_THRESHOLD_SECONDS
+        )
+    
+    async def _check_storage(self) -> Dict[str, Any]:
+        """Ping the storage backend."""
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self.storage.ping(), self.probe_timeout_seconds)
+        except Exception as e:
+            return {"status": "unhealthy", "error": str(e) or type(e).__name__}
+        return {"status": "healthy", "latency_ms": round((time.perf_counter() - start) * 1000, 3)}
+    
+    async def _probe_llm(self) -> None:
+        """Send the provider a minimal request if the last probe is due for renewal."""
+        if self.llm_service.client_pool is None:
+            return
+        if (
+            self._llm_checked_at is not None
+            and time.monotonic() - self._llm_checked_at < self.llm_probe_interval_seconds
+        ):
+            return
+        
+        try:
+            self._llm_reachable = await asyncio.wait_for(
+                self.llm_service.probe_model(settings.HEALTH_LLM_PROBE_MODEL),
+                self.probe_timeout_seconds
+            )
+        except asyncio.TimeoutError:
+            self._llm_reachable = False
+        self._llm_checked_at = time.monotonic()
+    
+    def _check_llm(self) -> Dict[str, Any]:
+        """Report the last provider probe and any open circuits."""
+        if self.llm_service.client_pool is None:
+            return {"status": "degraded", "reachable": None, "error": "GOOGLE_API_KEY is not set"}
+        
+        circuits = self.llm_service.resilience.stats()["circuits"]
+        open_circuits = sorted(model for model, state in circuits.items() if state != "closed")
+        healthy = self._llm_reachable is not False and not open_circuits
+        return {
+            "status": "healthy" if healthy else "degraded",
+            "reachable": self._llm_reachable,
+            "model": settings.HEALTH_LLM_PROBE_MODEL,
+            "open_circuits": open_circuits,
+        }
+    
+    def _check_cache(self) -> Dict[str, Any]:
+        """Report response cache counters and tier sizes."""
+        response_cache = self.llm_service.response_cache
+        if response_cache is None:
+            return {"status": "healthy", "enabled": False}
+        return {"status": "healthy", **response_cache.stats()}
+    
+    def _check_event_loop(self) -> Dict[str, Any]:
+        """Report how late the monitor last woke up."""
+        lagging = self._loop_lag_seconds > self.lag_threshold_seconds
+        return {
+            "status": "degraded" if lagging else "healthy",
+            "lag_ms": round(self._loop_lag_seconds * 1000, 3),
+        }
+    
+    async def check(self, probe_llm: bool = True) -> Dict[str, Any]:
+        """Run the probes now and store the report."""
+        if probe_llm:
+            await self._probe_llm()
+        
+        components = {
+            "storage": await self._check_storage(),
+            "llm_provider": self._check_llm(),
+            "cache": self._check_cache(),
+            "event_loop": self._check_event_loop(),
+        }
+        status = max(
+            (component["status"] for component in components.values()),
+            key=STATUS_ORDER.index
+        )
+        self.report = {
+            "status": status,
+            "components": components,
+            "checked_at": datetime.utcnow().isoformat(),
+        }
+        return self.report
+    
+    async def _run(self) -> None:
+        """Probe on an interval until cancelled."""
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                await self.check()
+            except Exception as e:
+                logger.warning("Health check failed: %s", e)
+            
+            started = loop.time()
+            await asyncio.sleep(self.interval_seconds)
+            self._loop_lag_seconds = max(loop.time() - started - self.interval_seconds, 0.0)
+    
+    async def start(self) -> None:
+        """Take a first report without calling the provider, then probe in the background."""
+        await self.check(probe_llm=False)
+        self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """Stop the background probes."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
\ No newline at end of file
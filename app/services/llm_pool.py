@@ -0,0 +1,102 @@
+"""Pool of configured LLM clients shared across requests."""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+
+from langchain_google_genai import ChatGoogleGenerativeAI, chat_models
+from tenacity import retry, stop_after_attempt
+
+ClientKey = Tuple[str, float, Optional[int]]
+
+
+def _single_attempt() -> Callable[[Any], Any]:
+    """Retry decorator that makes exactly one attempt."""
+    return retry(reraise=True, stop=stop_after_attempt(1))
+
+
+def disable_client_retries() -> None:
+    """Turn off the retries langchain-google-genai wraps around every call.
+    
+    The library retries any ``GoogleAPIError`` up to 10 times with waits of
+    up to 60 s (ignoring the client's ``max_retries``), all hidden inside one
+    attempt of ``ResiliencePolicy``. That would multiply its retry budget and
+    keep failures from the circuit breaker until the attempt timed out, so
+    retries are left to the policy alone.
+    """
+    chat_models._create_retry_decorator = _single_attempt
+
+
+class LLMClientPool:
+    """LRU pool of LLM clients keyed by (model_name, temperature, max_tokens).
+    
+    Clients are never mutated after creation, so concurrent requests for
+    agents with different settings each get their own correctly configured
+    client without locking around the provider call. Evicted clients stay
+    usable by requests that already hold them.
+    """
+    
+    def __init__(
+        self,
+        api_key: str,
+        max_size: int = 32,
+        client_factory: Optional[Callable[..., Any]] = None
+    ):
+        """Initialize client pool."""
+        self.api_key = api_key
+        self.max_size = max_size
+        if client_factory is None:
+            disable_client_retries()
+        self._client_factory = client_factory or ChatGoogleGenerativeAI
+        self._clients: "OrderedDict[ClientKey, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def __len__(self) -> int:
+        """Number of pooled clients."""
+        return len(self._clients)
+    
+    def get_client(
+        self,
+        model_name: str,
+        temperature: float,
+        max_tokens: Optional[int] = None
+    ) -> Any:
+        """Get (or create) the client for a model configuration."""
+        key = (model_name, float(temperature), max_tokens)
+        
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self._clients.move_to_end(key)
+                self.hits += 1
+                return client
+            
+            self.misses += 1
+            client = self._create_client(*key)
+            self._clients[key] = client
+            while len(self._clients) > self.max_size:
+                self._clients.popitem(last=False)
+        
+        return client
+    
+    def _create_client(self, model_name: str, temperature: float, max_tokens: Optional[int]) -> Any:
+        """Build a client configured for one model configuration."""
+        options = {
+            "model": model_name,
+            "google_api_key": self.api_key,
+            "temperature": temperature,
+        }
+        if max_tokens:
+            options["max_output_tokens"] = max_tokens
+        return self._client_factory(**options)
+    
+    def stats(self) -> dict:
+        """Pool size and hit/miss counters."""
+        return {
+            "size": len(self._clients),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
\ No newline at end of file
@@ -1,80 +1,261 @@
 """LLM service for handling language model interactions."""
 
+import asyncio
 import time
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
 
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain.schema import HumanMessage, SystemMessage
+from langchain.schema import BaseMessage, HumanMessage, SystemMessage
 
 from app.core.config import settings
+from app.core.metrics import LLM_CALL_ERRORS, LLM_CALL_SECONDS, LLM_TIME_TO_FIRST_TOKEN_SECONDS, LLM_TOKENS
 from app.models.agent import Agent
 from app.models.chat import ChatMessage, MessageRole
+from app.services.context_builder import ContextBuilder
+from app.services.llm_pool import LLMClientPool
+from app.services.model_router import ModelRouter
+from app.services.resilience import CircuitOpenError, ResiliencePolicy
+from app.services.response_cache import ResponseCache, get_response_cache, make_cache_key
+from app.services.single_flight import SingleFlight
+from app.services.token_counter import TokenCounter, get_token_counter
+
+SUMMARY_PROMPT = (
+    "Summarize the conversation below so it can stand in for it in later turns. "
+    "Keep facts, names, decisions and open questions; be concise."
+)
 
 
 class LLMService:
     """Service for handling LLM interactions."""
     
-    def __init__(self):
+    def __init__(
+        self,
+        client_pool: Optional[LLMClientPool] = None,
+        response_cache: Optional[ResponseCache] = None,
+        context_builder: Optional[ContextBuilder] = None,
+        token_counter: Optional[TokenCounter] = None,
+        resilience: Optional[ResiliencePolicy] = None,
+        router: Optional[ModelRouter] = None,
+        single_flight: Optional[SingleFlight] = None
+    ):
         """Initialize LLM service."""
-        self.llm = None
-        if settings.GOOGLE_API_KEY:
-            self.llm = ChatGoogleGenerativeAI(
-                model="gemini-pro",
-                google_api_key=settings.GOOGLE_API_KEY,
-                temperature=0.7
+        self.client_pool = client_pool
+        if self.client_pool is None and settings.GOOGLE_API_KEY:
+            self.client_pool = LLMClientPool(
+                api_key=settings.GOOGLE_API_KEY,
+                max_size=settings.LLM_CLIENT_POOL_SIZE
             )
+        self.response_cache = response_cache or get_response_cache()
+        self.token_counter = token_counter or get_token_counter()
+        self.context_builder = context_builder or ContextBuilder(self.token_counter)
+        self.resilience = resilience or ResiliencePolicy.from_settings()
+        self.router = router or ModelRouter(self.resilience)
+        self.single_flight = single_flight
+        if self.single_flight is None and settings.LLM_COALESCE_ENABLED:
+            self.single_flight = SingleFlight()
+        # model_name -> (is_reachable, checked_at) from live probes
+        self._probe_results: Dict[str, Tuple[bool, float]] = {}
+        self._probe_tasks: Set[asyncio.Task] = set()
+    
+    def _build_messages(
+        self,
+        agent: Agent,
+        message: str,
+        chat_history: Optional[List[ChatMessage]] = None,
+        summary: Optional[str] = None
+    ) -> List[BaseMessage]:
+        """Build the prompt messages for an agent turn."""
+        messages = []
+        
+        # Add system message
+        if agent.system_prompt:
+            messages.append(SystemMessage(content=agent.system_prompt))
+        
+        # Add the summary of messages older than the history window
+        if summary:
+            messages.append(SystemMessage(content=f"Summary of the earlier conversation: {summary}"))
+        
+        # Add the most recent chat history that fits the agent's token budget
+        for msg in self.context_builder.select(agent, message, chat_history, summary):
+            if msg.role == MessageRole.USER:
+                messages.append(HumanMessage(content=msg.content))
+            elif msg.role == MessageRole.ASSISTANT:
+                messages.append(SystemMessage(content=f"Assistant: {msg.content}"))
+        
+        # Add current message
+        messages.append(HumanMessage(content=message))
+        
+        return messages
+    
+    def _get_client(self, agent: Agent, model_name: Optional[str] = None):
+        """Get a client configured with the agent settings, for its model or a fallback."""
+        if self.client_pool is None:
+            raise ValueError("LLM not configured. Please set GOOGLE_API_KEY.")
+        
+        return self.client_pool.get_client(
+            model_name or agent.model_name,
+            agent.temperature,
+            agent.max_tokens
+        )
+    
+    def _is_cacheable(self, agent: Agent) -> bool:
+        """Only deterministic (temperature 0) calls are cached."""
+        return self.response_cache is not None and agent.temperature == 0
+    
+    def _observe_tokens(self, model_name: str, messages: List[BaseMessage], completion: str) -> None:
+        """Record a call's prompt and completion token counts."""
+        prompt_tokens = sum(self.token_counter.count_many([message.content for message in messages]))
+        LLM_TOKENS.observe(prompt_tokens, model_name, "prompt")
+        LLM_TOKENS.observe(self.token_counter.count(completion), model_name, "completion")
+    
+    async def _invoke(self, agent: Agent, messages: List[BaseMessage], call_key: str) -> Tuple[str, str]:
+        """Call the provider and cache the answer; returns the answering model and content."""
+        start = time.perf_counter()
+        try:
+            # Generate response on the agent's model, or a fallback if it is unavailable
+            model_name, response = await self.router.call(
+                agent,
+                lambda model: self._get_client(agent, model).ainvoke(messages)
+            )
+        except Exception:
+            LLM_CALL_ERRORS.inc(agent.model_name, "generate")
+            raise
+        
+        LLM_CALL_SECONDS.observe(time.perf_counter() - start, model_name, "generate")
+        self._observe_tokens(model_name, messages, response.content)
+        
+        # Only the agent's own model's answers are cached under its key, so a
+        # fallback's answer is not served as the primary's once it recovers
+        if self._is_cacheable(agent) and model_name == agent.model_name:
+            await self.response_cache.set(call_key, response.content)
+        
+        return model_name, response.content
     
     async def generate_response(
         self,
         agent: Agent,
         message: str,
-        chat_history: List[ChatMessage] = None
+        chat_history: List[ChatMessage] = None,
+        summary: Optional[str] = None
     ) -> Dict:
         """Generate response using the LLM."""
-        if not self.llm:
-            raise ValueError("LLM not configured. Please set GOOGLE_API_KEY.")
+        self._get_client(agent)  # Fail fast when the LLM is not configured
         
         start_time = time.time()
         
         try:
-            # Prepare messages
-            messages = []
-            
-            # Add system message
-            if agent.system_prompt:
-                messages.append(SystemMessage(content=agent.system_prompt))
-            
-            # Add chat history
-            if chat_history:
-                for msg in chat_history[-10:]:  # Last 10 messages for context
-                    if msg.role == MessageRole.USER:
-                        messages.append(HumanMessage(content=msg.content))
-                    elif msg.role == MessageRole.ASSISTANT:
-                        messages.append(SystemMessage(content=f"Assistant: {msg.content}"))
+            messages = self._build_messages(agent, message, chat_history, summary)
             
-            # Add current message
-            messages.append(HumanMessage(content=message))
+            # Identical agent settings and prompt give the same key
+            call_key = make_cache_key(
+                agent.model_name,
+                agent.temperature,
+                agent.max_tokens,
+                messages
+            )
             
-            # Configure LLM with agent settings
-            self.llm.temperature = agent.temperature
-            if agent.max_tokens:
-                self.llm.max_output_tokens = agent.max_tokens
+            # Serve deterministic calls from the cache when possible
+            if self._is_cacheable(agent):
+                cached_content = await self.response_cache.get(call_key)
+                if cached_content is not None:
+                    return {
+                        "content": cached_content,
+                        "response_time_ms": int((time.time() - start_time) * 1000),
+                        "token_count": self.token_counter.count(cached_content),
+                        "model": agent.model_name,
+                        "cached": True
+                    }
             
-            # Generate response
-            response = await self.llm.ainvoke(messages)
+            # Concurrent identical calls share one provider call
+            if self.single_flight is not None:
+                model_name, content = await self.single_flight.do(
+                    call_key,
+                    lambda: self._invoke(agent, messages, call_key)
+                )
+            else:
+                model_name, content = await self._invoke(agent, messages, call_key)
             
             response_time = int((time.time() - start_time) * 1000)
             
             return {
-                "content": response.content,
+                "content": content,
                 "response_time_ms": response_time,
-                "token_count": len(response.content.split()),  # Rough estimate
-                "model": agent.model_name
+                "token_count": self.token_counter.count(content),
+                "model": model_name
             }
             
+        except CircuitOpenError:
+            raise
         except Exception as e:
             raise Exception(f"Failed to generate LLM response: {str(e)}")
     
+    async def stream_response(
+        self,
+        agent: Agent,
+        message: str,
+        chat_history: List[ChatMessage] = None,
+        summary: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """Stream response text chunks from the LLM as they are generated."""
+        self._get_client(agent)  # Fail fast when the LLM is not configured
+        messages = self._build_messages(agent, message, chat_history, summary)
+        
+        start = time.perf_counter()
+        # Metrics are labelled by the model that streamed, which may be a fallback
+        model_name = agent.model_name
+        chunks = []
+        try:
+            async for model_name, chunk in self.router.stream(
+                agent,
+                lambda model: self._get_client(agent, model).astream(messages)
+            ):
+                if chunk.content:
+                    if not chunks:
+                        LLM_TIME_TO_FIRST_TOKEN_SECONDS.observe(time.perf_counter() - start, model_name)
+                    chunks.append(chunk.content)
+                    yield chunk.content
+        except Exception as e:
+            LLM_CALL_ERRORS.inc(model_name, "stream")
+            if isinstance(e, CircuitOpenError):
+                raise
+            raise Exception(f"Failed to stream LLM response: {str(e)}")
+        
+        LLM_CALL_SECONDS.observe(time.perf_counter() - start, model_name, "stream")
+        self._observe_tokens(model_name, messages, "".join(chunks))
+    
+    async def summarize(
+        self,
+        agent: Agent,
+        messages: List[ChatMessage],
+        previous_summary: Optional[str] = None
+    ) -> str:
+        """Fold messages into a conversation summary, extending a previous one."""
+        if self.client_pool is None:
+            raise ValueError("LLM not configured. Please set GOOGLE_API_KEY.")
+        
+        lines = [f"Summary so far: {previous_summary}"] if previous_summary else []
+        lines.extend(f"{msg.role.value}: {msg.content}" for msg in messages)
+        prompt = [SystemMessage(content=SUMMARY_PROMPT), HumanMessage(content="\n".join(lines))]
+        
+        start = time.perf_counter()
+        try:
+            model_name, response = await self.router.call(
+                agent,
+                lambda model: self.client_pool.get_client(
+                    model,
+                    0.0,
+                    settings.CHAT_SUMMARY_MAX_TOKENS
+                ).ainvoke(prompt),
+                hedge=False
+            )
+        except Exception as e:
+            LLM_CALL_ERRORS.inc(agent.model_name, "summarize")
+            if isinstance(e, CircuitOpenError):
+                raise
+            raise Exception(f"Failed to summarize conversation: {str(e)}")
+        
+        LLM_CALL_SECONDS.observe(time.perf_counter() - start, model_name, "summarize")
+        return response.content
+    
     async def validate_agent_config(self, agent: Agent) -> bool:
         """Validate agent configuration with LLM."""
         try:
@@ -82,4 +263,58 @@ class LLMService:
             response = await self.generate_response(agent, test_message)
             return bool(response.get("content"))
         except Exception:
-            return False
\ No newline at end of file
+            return False
+    
+    def validate_agent_config_locally(self, agent: Agent) -> List[str]:
+        """Validate agent configuration without calling the provider.
+        
+        Returns a list of problems; an empty list means the configuration is
+        valid.
+        """
+        errors = []
+        
+        for model_name in [agent.model_name, *agent.fallback_models]:
+            if model_name not in settings.SUPPORTED_MODELS:
+                errors.append(
+                    f"Unsupported model '{model_name}'. "
+                    f"Choose one of: {', '.join(settings.SUPPORTED_MODELS)}"
+                )
+        
+        if not agent.system_prompt.strip():
+            errors.append("System prompt must not be blank")
+        
+        return errors
+    
+    def get_model_probe_result(self, model_name: str) -> Optional[bool]:
+        """Get the cached live probe result for a model, if still fresh."""
+        result = self._probe_results.get(model_name)
+        if result is None:
+            return None
+        
+        is_reachable, checked_at = result
+        if time.time() - checked_at > settings.LLM_PROBE_TTL_SECONDS:
+            return None
+        return is_reachable
+    
+    async def probe_model(self, model_name: str) -> bool:
+        """Check that a model answers a minimal request and cache the result."""
+        try:
+            llm = self.client_pool.get_client(model_name, 0.0, 16)
+            response = await llm.ainvoke([HumanMessage(content="ping")])
+            is_reachable = bool(response.content)
+        except Exception:
+            is_reachable = False
+        
+        self._probe_results[model_name] = (is_reachable, time.time())
+        return is_reachable
+    
+    def schedule_model_probe(self, model_name: str) -> None:
+        """Probe a model in the background unless a fresh result is cached."""
+        if self.client_pool is None or self.get_model_probe_result(model_name) is not None:
+            return
+        if any(task.get_name() == f"probe:{model_name}" for task in self._probe_tasks):
+            return
+        
+        task = asyncio.create_task(self.probe_model(model_name), name=f"probe:{model_name}")
+        self._probe_tasks.add(task)
+        task.add_done_callback(self._probe_tasks.discard)
\ No newline at end of file
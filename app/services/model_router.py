@@ -0,0 +1,140 @@
+"""Routing of agent LLM calls across models with fallback and hedging."""
+
+import asyncio
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from app.core.config import settings
+from app.models.agent import Agent
+from app.services.resilience import CircuitOpenError, ResiliencePolicy, is_retryable
+
+T = TypeVar("T")
+
+
+def can_fall_back(error: Exception) -> bool:
+    """Whether another model may succeed where this one failed."""
+    return isinstance(error, CircuitOpenError) or is_retryable(error)
+
+
+class ModelRouter:
+    """Send an agent's calls to its model, then to its fallback models in order.
+    
+    A call moves to the next model when the current one is unavailable
+    (open circuit) or still failing transiently after the resilience
+    policy's retries; other errors are raised as they are. Agents with
+    ``hedge_after_ms`` also send the call to their first fallback model when
+    the primary has not answered within that time, and take whichever
+    answers first.
+    """
+    
+    def __init__(
+        self,
+        resilience: ResiliencePolicy,
+        fallbacks: Optional[Dict[str, List[str]]] = None
+    ):
+        """Initialize model router."""
+        self.resilience = resilience
+        self.fallbacks = settings.LLM_FALLBACK_MODELS if fallbacks is None else fallbacks
+        self.metrics = {"fallbacks": 0, "hedges": 0, "hedge_wins": 0}
+    
+    def candidates(self, agent: Agent) -> List[str]:
+        """Models to try for an agent, in order."""
+        fallbacks = agent.fallback_models or self.fallbacks.get(agent.model_name, [])
+        return list(dict.fromkeys([agent.model_name, *fallbacks]))
+    
+    async def call(
+        self,
+        agent: Agent,
+        attempt: Callable[[str], Awaitable[T]],
+        hedge: bool = True
+    ) -> Tuple[str, T]:
+        """Run ``attempt(model_name)`` on the first model that answers.
+        
+        Returns the model that answered and its result.
+        """
+        models = self.candidates(agent)
+        position = 0
+        while True:
+            hedged = hedge and position == 0 and bool(agent.hedge_after_ms) and len(models) > 1
+            try:
+                if hedged:
+                    return await self._hedged(models[0], models[1], attempt, agent.hedge_after_ms / 1000)
+                model = models[position]
+                return model, await self.resilience.call(model, lambda: attempt(model))
+            except Exception as e:
+                position += 2 if hedged else 1
+                if position >= len(models) or not can_fall_back(e):
+                    raise
+                self.metrics["fallbacks"] += 1
+    
+    async def _hedged(
+        self,
+        primary: str,
+        secondary: str,
+        attempt: Callable[[str], Awaitable[T]],
+        delay: float
+    ) -> Tuple[str, T]:
+        """Call the primary, adding the secondary if it is slow or fails."""
+        tasks = {
+            asyncio.create_task(self.resilience.call(primary, lambda: attempt(primary))): primary
+        }
+        try:
+            done, pending = await asyncio.wait(set(tasks), timeout=delay)
+            for task in done:
+                if task.exception() is None:
+                    return primary, task.result()
+                if not can_fall_back(task.exception()):
+                    raise task.exception()
+            
+            if pending:
+                self.metrics["hedges"] += 1
+            else:
+                self.metrics["fallbacks"] += 1
+            tasks[asyncio.create_task(self.resilience.call(secondary, lambda: attempt(secondary)))] = secondary
+            pending.update(task for task in tasks if not task.done())
+            
+            error = next((task.exception() for task in done), None)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                errors = [task.exception() for task in done]
+                for task, task_error in zip(done, errors):
+                    if task_error is None:
+                        if tasks[task] == secondary:
+                            self.metrics["hedge_wins"] += 1
+                        return tasks[task], task.result()
+                    error = task_error
+            raise error
+        finally:
+            # The slower model's answer is no longer needed, and nothing is
+            # left running if the caller is cancelled during the hedge delay
+            unfinished = [task for task in tasks if not task.done()]
+            for task in unfinished:
+                task.cancel()
+            await asyncio.gather(*unfinished, return_exceptions=True)
+    
+    async def stream(
+        self,
+        agent: Agent,
+        start: Callable[[str], AsyncIterator[T]]
+    ) -> AsyncIterator[Tuple[str, T]]:
+        """Relay ``start(model_name)`` from the first model that starts streaming.
+        
+        Yields ``(model_name, chunk)`` so callers know which model answered.
+        Falling back is only possible before the first chunk is relayed;
+        streams are not hedged, since two partial answers cannot be merged.
+        """
+        models = self.candidates(agent)
+        for position, model in enumerate(models):
+            relayed = False
+            try:
+                async for chunk in self.resilience.stream(model, lambda: start(model)):
+                    relayed = True
+                    yield model, chunk
+                return
+            except Exception as e:
+                if relayed or position == len(models) - 1 or not can_fall_back(e):
+                    raise
+                self.metrics["fallbacks"] += 1
+    
+    def stats(self) -> Dict:
+        """Fallback and hedging counters."""
+        return dict(self.metrics)
\ No newline at end of file
@@ -0,0 +1,57 @@
+"""Opaque keyset cursors for list endpoints."""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable, List, Optional
+
+from app.models.common import CursorPage
+from app.storage.base import CursorKey, EntityRepository
+
+# Largest page a client may request from a list endpoint
+MAX_PAGE_SIZE = 500
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a cursor was not produced by ``encode_cursor``."""
+
+
+def encode_cursor(key: CursorKey) -> str:
+    """Encode a ``(timestamp, id)`` position as an opaque cursor."""
+    sort_value, entity_id = key
+    payload = json.dumps([sort_value.isoformat(), str(entity_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> CursorKey:
+    """Decode a cursor produced by ``encode_cursor``."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, entity_id = json.loads(base64.urlsafe_b64decode(padded))
+        return (datetime.fromisoformat(sort_value), str(entity_id))
+    except (TypeError, ValueError) as e:
+        raise InvalidCursorError("Invalid cursor") from e
+
+
+def make_page(items: List[Any], limit: int, key_for: Callable[[Any], CursorKey]) -> CursorPage:
+    """Build a page from up to ``limit + 1`` fetched items.
+    
+    The extra item only tells us whether another page exists; it is not
+    returned, and the cursor points at the last returned item.
+    """
+    if len(items) <= limit:
+        return CursorPage(items=items)
+    items = items[:limit]
+    return CursorPage(items=items, next_cursor=encode_cursor(key_for(items[-1])))
+
+
+async def paginate_for_user(
+    repository: EntityRepository,
+    user_id: str,
+    limit: int = 100,
+    cursor: Optional[str] = None
+) -> CursorPage:
+    """Get one cursor page of a user's active entities."""
+    after = decode_cursor(cursor) if cursor else None
+    items = await repository.list_for_user(user_id, limit=limit + 1, after=after)
+    return make_page(items, limit, repository.cursor_key)
\ No newline at end of file
@@ -0,0 +1,191 @@
+"""Rate limits and concurrency caps for LLM calls per user, agent and model."""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+_rate_limiter: Optional["RateLimiter"] = None
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a call would exceed a rate or concurrency limit."""
+    
+    def __init__(self, scope: str, retry_after: float):
+        """Initialize with the limited scope and seconds until a retry can succeed."""
+        super().__init__(f"Rate limit exceeded for {scope}; retry in {retry_after:.1f}s")
+        self.scope = scope
+        self.retry_after = retry_after
+
+
+class RateLimitBackend(ABC):
+    """Token buckets keyed by scope.
+    
+    The in-memory backend limits each worker separately; a backend on a
+    shared store (e.g. Redis running the same refill arithmetic in a script)
+    makes the limits hold across workers.
+    """
+    
+    @abstractmethod
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        """Take one token from a bucket refilling at ``rate`` per second.
+        
+        Returns 0 when the token was taken, or the seconds until one is
+        available (nothing is taken then).
+        """
+        pass
+    
+    @abstractmethod
+    async def refund(self, key: str, rate: float, burst: int) -> None:
+        """Return a token taken for a call that another limit then rejected."""
+        pass
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """In-process token buckets, the least recently used dropped past ``max_keys``."""
+    
+    def __init__(self, max_keys: int = 100000):
+        """Initialize memory backend."""
+        self.max_keys = max_keys
+        # key -> (tokens, updated_at)
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        """Take one token from a bucket."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (float(burst), now))
+            tokens = min(float(burst), tokens + (now - updated_at) * rate)
+            
+            retry_after = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                retry_after = (1 - tokens) / rate
+            
+            # A dropped bucket starts full again, so eviction only ever loosens limits
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return retry_after
+    
+    async def refund(self, key: str, rate: float, burst: int) -> None:
+        """Return a token to a bucket."""
+        with self._lock:
+            if key in self._buckets:
+                tokens, updated_at = self._buckets[key]
+                self._buckets[key] = (min(float(burst), tokens + 1), updated_at)
+
+
+class RateLimitLease:
+    """Concurrency slots held by one LLM call; release them when it ends."""
+    
+    def __init__(self, limiter: "RateLimiter", keys: List[str]):
+        """Initialize lease."""
+        self._limiter = limiter
+        self._keys = keys
+    
+    def release(self) -> None:
+        """Give the slots back (safe to call more than once)."""
+        keys, self._keys = self._keys, []
+        self._limiter._release(keys)
+
+
+class RateLimiter:
+    """Token-bucket rate limits and concurrency caps for LLM calls.
+    
+    Each call is checked against the user's, the agent's and the model's
+    limits. Rates are in calls per minute with a burst allowance; a limit of
+    0 disables that check. Concurrency caps count calls in flight in this
+    worker and fail fast rather than queue, so callers get a 429 instead of
+    holding a request open.
+    """
+    
+    def __init__(
+        self,
+        backend: Optional[RateLimitBackend] = None,
+        rates: Optional[Dict[str, Tuple[float, int]]] = None,
+        concurrency: Optional[Dict[str, int]] = None
+    ):
+        """Initialize rate limiter.
+        
+        ``rates`` maps a scope ("user", "agent" or "model") to (calls per
+        minute, burst); ``concurrency`` maps a scope to its maximum calls in
+        flight.
+        """
+        self.backend = backend or MemoryRateLimitBackend()
+        self.rates = rates or {}
+        self.concurrency = concurrency or {}
+        self._in_flight: Dict[str, int] = {}
+    
+    @classmethod
+    def from_settings(cls) -> "RateLimiter":
+        """Build a limiter from application settings."""
+        return cls(
+            rates={
+                "user": (settings.RATE_LIMIT_USER_PER_MINUTE, settings.RATE_LIMIT_USER_BURST),
+                "agent": (settings.RATE_LIMIT_AGENT_PER_MINUTE, settings.RATE_LIMIT_AGENT_BURST),
+                "model": (settings.RATE_LIMIT_MODEL_PER_MINUTE, settings.RATE_LIMIT_MODEL_BURST),
+            },
+            concurrency={
+                "user": settings.RATE_LIMIT_USER_MAX_CONCURRENT,
+                "agent": settings.RATE_LIMIT_AGENT_MAX_CONCURRENT,
+                "model": settings.RATE_LIMIT_MODEL_MAX_CONCURRENT,
+            }
+        )
+    
+    async def acquire(self, user_id: str, agent_id: str, model_name: str) -> RateLimitLease:
+        """Admit one LLM call or raise ``RateLimitExceeded``."""
+        scopes = {"user": user_id, "agent": str(agent_id), "model": model_name}
+        
+        # Check and reserve concurrency slots with no await in between, so
+        # calls racing through the backend below cannot overshoot the cap
+        for scope, value in scopes.items():
+            limit = self.concurrency.get(scope)
+            if limit and self._in_flight.get(f"{scope}:{value}", 0) >= limit:
+                raise RateLimitExceeded(scope, 1.0)
+        keys = [f"{scope}:{value}" for scope, value in scopes.items() if self.concurrency.get(scope)]
+        for key in keys:
+            self._in_flight[key] = self._in_flight.get(key, 0) + 1
+        lease = RateLimitLease(self, keys)
+        
+        # A rejected call gives back its slots and the tokens it already took
+        taken: List[Tuple[str, float, int]] = []
+        try:
+            for scope, value in scopes.items():
+                per_minute, burst = self.rates.get(scope, (0, 0))
+                if per_minute:
+                    bucket = (f"{scope}:{value}", per_minute / 60, burst)
+                    retry_after = await self.backend.take(*bucket)
+                    if retry_after:
+                        raise RateLimitExceeded(scope, retry_after)
+                    taken.append(bucket)
+        except BaseException:
+            lease.release()
+            for bucket in taken:
+                await self.backend.refund(*bucket)
+            raise
+        return lease
+    
+    def _release(self, keys: List[str]) -> None:
+        """Free concurrency slots, forgetting idle keys."""
+        for key in keys:
+            count = self._in_flight.get(key, 0) - 1
+            if count > 0:
+                self._in_flight[key] = count
+            else:
+                self._in_flight.pop(key, None)
+
+
+def get_rate_limiter() -> Optional[RateLimiter]:
+    """Get the process-wide rate limiter, or None when rate limiting is disabled."""
+    global _rate_limiter
+    if not settings.RATE_LIMIT_ENABLED:
+        return None
+    if _rate_limiter is None:
+        _rate_limiter = RateLimiter.from_settings()
+    return _rate_limiter
\ No newline at end of file
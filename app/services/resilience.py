@@ -0,0 +1,263 @@
+"""Timeouts, retries and circuit breaking for LLM provider calls."""
+
+import asyncio
+import random
+import time
+from typing import AsyncIterator, Awaitable, Callable, Dict, Optional, TypeVar
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+# HTTP statuses of provider errors worth retrying (google.api_core errors carry ``code``)
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """Raised without calling the provider while a model's circuit is open."""
+    
+    def __init__(self, model_name: str, retry_after: float):
+        """Initialize with the model and seconds until a trial call is allowed."""
+        super().__init__(f"Model '{model_name}' is unavailable; retry in {retry_after:.0f}s")
+        self.model_name = model_name
+        self.retry_after = retry_after
+
+
+def is_retryable(error: Exception) -> bool:
+    """Whether an error is transient (timeouts, connection and overload errors)."""
+    if isinstance(error, (asyncio.TimeoutError, ConnectionError)):
+        return True
+    return getattr(error, "code", None) in RETRYABLE_STATUS_CODES
+
+
+class CircuitBreaker:
+    """Per-model circuit breaker.
+    
+    After ``failure_threshold`` consecutive transient failures the circuit
+    opens and calls fail fast for ``reset_seconds``. Then one trial call is
+    let through (half-open): success closes the circuit, failure opens it
+    again.
+    """
+    
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        """Initialize circuit breaker."""
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+    
+    @property
+    def state(self) -> str:
+        """"closed", "open" or "half_open"."""
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.reset_seconds:
+            return "open"
+        return "half_open"
+    
+    def before_call(self, model_name: str) -> None:
+        """Raise ``CircuitOpenError`` unless a call may go through."""
+        state = self.state
+        if state == "open" or (state == "half_open" and self._trial_in_flight):
+            retry_after = max(self.reset_seconds - (time.monotonic() - self.opened_at), 1.0)
+            raise CircuitOpenError(model_name, retry_after)
+        if state == "half_open":
+            self._trial_in_flight = True
+    
+    def record_success(self) -> None:
+        """Close the circuit."""
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+    
+    def record_failure(self) -> None:
+        """Count a transient failure, opening the circuit at the threshold."""
+        self.failures += 1
+        if self._trial_in_flight or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self._trial_in_flight = False
+    
+    def release_trial(self) -> None:
+        """End a trial call that neither succeeded nor failed transiently."""
+        self._trial_in_flight = False
+
+
+class ResiliencePolicy:
+    """Per-attempt timeout, overall deadline, jittered retries and circuit breaking.
+    
+    Only transient errors are retried and count against a model's circuit;
+    other errors (bad requests, safety blocks) are raised at once. Retries
+    back off exponentially with full jitter and stop early when the next
+    attempt could not finish before the deadline.
+    """
+    
+    def __init__(
+        self,
+        timeout_seconds: float = 30,
+        deadline_seconds: float = 60,
+        max_retries: int = 2,
+        base_delay_seconds: float = 0.5,
+        max_delay_seconds: float = 8,
+        failure_threshold: int = 5,
+        reset_seconds: float = 30
+    ):
+        """Initialize resilience policy."""
+        self.timeout_seconds = timeout_seconds
+        self.deadline_seconds = deadline_seconds
+        self.max_retries = max_retries
+        self.base_delay_seconds = base_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self.metrics = {
+            "calls": 0,
+            "successes": 0,
+            "failures": 0,
+            "retries": 0,
+            "timeouts": 0,
+            "short_circuits": 0,
+        }
+    
+    @classmethod
+    def from_settings(cls) -> "ResiliencePolicy":
+        """Build a policy from application settings."""
+        return cls(
+            timeout_seconds=settings.LLM_TIMEOUT_SECONDS,
+            deadline_seconds=settings.LLM_DEADLINE_SECONDS,
+            max_retries=settings.LLM_MAX_RETRIES,
+            base_delay_seconds=settings.LLM_RETRY_BASE_DELAY_SECONDS,
+            max_delay_seconds=settings.LLM_RETRY_MAX_DELAY_SECONDS,
+            failure_threshold=settings.LLM_BREAKER_FAILURE_THRESHOLD,
+            reset_seconds=settings.LLM_BREAKER_RESET_SECONDS
+        )
+    
+    def breaker(self, model_name: str) -> CircuitBreaker:
+        """Get a model's circuit breaker."""
+        breaker = self._breakers.get(model_name)
+        if breaker is None:
+            breaker = CircuitBreaker(self.failure_threshold, self.reset_seconds)
+            self._breakers[model_name] = breaker
+        return breaker
+    
+    def before_call(self, model_name: str) -> None:
+        """Check a model's circuit, counting short-circuited attempts."""
+        try:
+            self.breaker(model_name).before_call(model_name)
+        except CircuitOpenError:
+            self.metrics["short_circuits"] += 1
+            raise
+    
+    def record(self, model_name: str, error: Optional[Exception] = None) -> None:
+        """Record the outcome of one attempt."""
+        breaker = self.breaker(model_name)
+        if error is None:
+            self.metrics["successes"] += 1
+            breaker.record_success()
+        elif is_retryable(error):
+            self.metrics["failures"] += 1
+            if isinstance(error, asyncio.TimeoutError):
+                self.metrics["timeouts"] += 1
+            breaker.record_failure()
+        else:
+            self.metrics["failures"] += 1
+            breaker.release_trial()
+    
+    def backoff(self, retry: int) -> float:
+        """Seconds to wait before a retry (full jitter)."""
+        return random.uniform(0, min(self.max_delay_seconds, self.base_delay_seconds * 2 ** retry))
+    
+    async def _retry_or_raise(
+        self,
+        model_name: str,
+        error: Exception,
+        retry: int,
+        deadline: float,
+        timeout: float
+    ) -> None:
+        """Record a failed attempt, then wait for the next one or raise."""
+        self.record(model_name, error)
+        delay = self.backoff(retry)
+        if retry >= self.max_retries or not is_retryable(error) or time.monotonic() + delay >= deadline:
+            if isinstance(error, asyncio.TimeoutError):
+                raise asyncio.TimeoutError(f"LLM call timed out after {timeout:.1f}s") from error
+            raise error
+        
+        await asyncio.sleep(delay)
+        self.metrics["retries"] += 1
+        # The failure may have opened the circuit, in which case this fails fast
+        self.before_call(model_name)
+    
+    async def call(self, model_name: str, attempt: Callable[[], Awaitable[T]]) -> T:
+        """Run ``attempt`` under the policy and return its result."""
+        self.metrics["calls"] += 1
+        self.before_call(model_name)
+        deadline = time.monotonic() + self.deadline_seconds
+        
+        retry = 0
+        while True:
+            timeout = min(self.timeout_seconds, deadline - time.monotonic())
+            try:
+                result = await asyncio.wait_for(attempt(), timeout)
+            except asyncio.CancelledError:
+                # The caller gave up (e.g. a hedged call was won elsewhere)
+                self.breaker(model_name).release_trial()
+                raise
+            except Exception as e:
+                await self._retry_or_raise(model_name, e, retry, deadline, timeout)
+                retry += 1
+                continue
+            
+            self.record(model_name)
+            return result
+    
+    async def stream(self, model_name: str, start: Callable[[], AsyncIterator[T]]) -> AsyncIterator[T]:
+        """Relay a stream under the policy.
+        
+        Attempts are retried only until the first chunk arrives, since
+        chunks already relayed cannot be taken back; after that the timeout
+        applies to the wait for each next chunk, so long answers are not cut
+        off by the deadline.
+        """
+        self.metrics["calls"] += 1
+        self.before_call(model_name)
+        deadline = time.monotonic() + self.deadline_seconds
+        
+        retry = 0
+        relayed = False
+        while True:
+            stream = start()
+            timeout = min(self.timeout_seconds, deadline - time.monotonic())
+            try:
+                while True:
+                    try:
+                        chunk = await asyncio.wait_for(stream.__anext__(), timeout)
+                    except StopAsyncIteration:
+                        break
+                    relayed = True
+                    timeout = self.timeout_seconds
+                    yield chunk
+            except (GeneratorExit, asyncio.CancelledError):
+                # The consumer stopped early or was cancelled; the call did not fail
+                self.breaker(model_name).release_trial()
+                await stream.aclose()
+                raise
+            except Exception as e:
+                await stream.aclose()
+                if relayed:
+                    self.record(model_name, e)
+                    raise
+                await self._retry_or_raise(model_name, e, retry, deadline, timeout)
+                retry += 1
+                continue
+            
+            self.record(model_name)
+            return
+    
+    def stats(self) -> Dict:
+        """Call metrics and the state of every model's circuit."""
+        return {
+            **self.metrics,
+            "circuits": {name: breaker.state for name, breaker in self._breakers.items()},
+        }
\ No newline at end of file
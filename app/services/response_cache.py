@@ -0,0 +1,283 @@
+"""Response cache for deterministic LLM calls."""
+
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+_response_cache: Optional["ResponseCache"] = None
+
+
+def make_cache_key(
+    model_name: str,
+    temperature: float,
+    max_tokens: Optional[int],
+    messages: List[Any]
+) -> str:
+    """Hash an LLM call's configuration and prompt messages into a cache key.
+    
+    ``messages`` is the exact prompt sent to the provider (system prompt,
+    history window and current message), so any change to the context
+    produces a different key.
+    """
+    payload = {
+        "model": model_name,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "messages": [[message.type, message.content] for message in messages],
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class MemoryCacheTier:
+    """LRU cache bounded by the total size of its values in bytes."""
+    
+    def __init__(self, max_bytes: int):
+        """Initialize memory tier."""
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[float, int, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        """Number of cached entries."""
+        return len(self._entries)
+    
+    def get(self, key: str) -> Optional[str]:
+        """Get a fresh value, dropping it if expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            
+            expires_at, size, value = entry
+            if expires_at < time.time():
+                del self._entries[key]
+                self.size_bytes -= size
+                return None
+            
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: str, ttl: float) -> None:
+        """Store a value, evicting least recently used entries to fit."""
+        size = len(value.encode())
+        if size > self.max_bytes:
+            return
+        
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size_bytes -= previous[1]
+            
+            self._entries[key] = (time.time() + ttl, size, value)
+            self.size_bytes += size
+            
+            while self.size_bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self.size_bytes -= evicted_size
+                self.evictions += 1
+
+
+class DiskCacheTier:
+    """Directory of JSON entries bounded by total size in bytes.
+    
+    Entries survive restarts and can be shared by workers on the same host:
+    the total size is recomputed from the directory before evicting, so
+    entries written by other processes count against the limit.
+    File I/O runs in a worker thread so the event loop is never blocked.
+    """
+    
+    def __init__(self, path: str, max_bytes: int):
+        """Initialize disk tier."""
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self.write_errors = 0
+        self._lock = threading.Lock()
+        self.size_bytes = sum(size for _, _, size in self._scan())
+    
+    def _entry_path(self, key: str) -> Path:
+        """File holding a cache entry."""
+        return self.path / f"{key}.json"
+    
+    def _read(self, key: str) -> Optional[str]:
+        """Read a fresh value from disk."""
+        entry_path = self._entry_path(key)
+        try:
+            entry = json.loads(entry_path.read_text())
+        except (OSError, ValueError):
+            return None
+        
+        if entry["expires_at"] < time.time():
+            self._delete(entry_path)
+            return None
+        
+        os.utime(entry_path)  # Refresh mtime so eviction is least-recently-used
+        return entry["value"]
+    
+    def _write(self, key: str, value: str, ttl: float) -> None:
+        """Atomically write an entry, evicting old entries to fit."""
+        data = json.dumps({"expires_at": time.time() + ttl, "value": value})
+        size = len(data.encode())
+        if size > self.max_bytes:
+            return
+        
+        # Temp names are unique per call so concurrent writers never collide
+        with tempfile.NamedTemporaryFile(
+            "w", dir=self.path, suffix=".tmp", delete=False
+        ) as temp_file:
+            temp_file.write(data)
+        
+        entry_path = self._entry_path(key)
+        with self._lock:
+            try:
+                self.size_bytes -= entry_path.stat().st_size
+            except FileNotFoundError:
+                pass
+            try:
+                os.replace(temp_file.name, entry_path)
+            except OSError:
+                os.unlink(temp_file.name)
+                raise
+            self.size_bytes += size
+            if self.size_bytes > self.max_bytes:
+                self._evict()
+    
+    def _scan(self) -> List[Tuple[Path, float, int]]:
+        """List entries with their mtime and size, skipping vanished files."""
+        entries = []
+        for entry_path in self.path.glob("*.json"):
+            try:
+                stat = entry_path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((entry_path, stat.st_mtime, stat.st_size))
+        return entries
+    
+    def _evict(self) -> None:
+        """Delete least recently used entries until under the size limit."""
+        # Other workers write to the same directory, so the running total
+        # is only an estimate; recount before deciding what to delete
+        entries = self._scan()
+        self.size_bytes = sum(size for _, _, size in entries)
+        for entry_path, _, _ in sorted(entries, key=lambda entry: entry[1]):
+            if self.size_bytes <= self.max_bytes:
+                break
+            self._delete(entry_path)
+            self.evictions += 1
+    
+    def _delete(self, entry_path: Path) -> None:
+        """Delete one entry file."""
+        try:
+            size = entry_path.stat().st_size
+            entry_path.unlink()
+            self.size_bytes -= size
+        except OSError:
+            pass
+    
+    async def get(self, key: str) -> Optional[str]:
+        """Get a fresh value."""
+        return await asyncio.to_thread(self._read, key)
+    
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        """Store a value; disk errors are counted, never raised."""
+        try:
+            await asyncio.to_thread(self._write, key, value, ttl)
+        except OSError:
+            self.write_errors += 1
+
+
+class ResponseCache:
+    """Two-tier (memory, then optional disk) cache of LLM responses."""
+    
+    def __init__(
+        self,
+        ttl_seconds: float = 3600,
+        max_bytes: int = 64 * 1024 * 1024,
+        disk_path: Optional[str] = None,
+        disk_max_bytes: int = 512 * 1024 * 1024
+    ):
+        """Initialize response cache."""
+        self.ttl_seconds = ttl_seconds
+        self.memory = MemoryCacheTier(max_bytes)
+        self.disk = DiskCacheTier(disk_path, disk_max_bytes) if disk_path else None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+    
+    async def get(self, key: str) -> Optional[str]:
+        """Get a cached response, promoting disk hits to memory."""
+        value = self.memory.get(key)
+        if value is not None:
+            self.memory_hits += 1
+            return value
+        
+        if self.disk is not None:
+            value = await self.disk.get(key)
+            if value is not None:
+                self.disk_hits += 1
+                self.memory.set(key, value, self.ttl_seconds)
+                return value
+        
+        self.misses += 1
+        return None
+    
+    async def set(self, key: str, value: str) -> None:
+        """Cache a response in every tier."""
+        self.memory.set(key, value, self.ttl_seconds)
+        if self.disk is not None:
+            await self.disk.set(key, value, self.ttl_seconds)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and tier sizes."""
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        stats = {
+            "enabled": True,
+            "hits": hits,
+            "misses": self.misses,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "memory": {
+                "hits": self.memory_hits,
+                "entries": len(self.memory),
+                "size_bytes": self.memory.size_bytes,
+                "max_bytes": self.memory.max_bytes,
+                "evictions": self.memory.evictions,
+            },
+        }
+        if self.disk is not None:
+            stats["disk"] = {
+                "hits": self.disk_hits,
+                "size_bytes": self.disk.size_bytes,
+                "max_bytes": self.disk.max_bytes,
+                "evictions": self.disk.evictions,
+                "write_errors": self.disk.write_errors,
+            }
+        return stats
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Get the process-wide response cache, or None when caching is disabled."""
+    global _response_cache
+    if not settings.LLM_CACHE_ENABLED:
+        return None
+    if _response_cache is None:
+        _response_cache = ResponseCache(
+            ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+            max_bytes=settings.LLM_CACHE_MAX_BYTES,
+            disk_path=settings.LLM_CACHE_DISK_PATH,
+            disk_max_bytes=settings.LLM_CACHE_DISK_MAX_BYTES
+        )
+    return _response_cache
\ No newline at end of file
@@ -0,0 +1,46 @@
+"""Coalescing of concurrent identical calls into one."""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Share one in-flight call among concurrent callers with the same key.
+    
+    The first caller starts the call as its own task and later callers with
+    the same key await that task instead of starting another. The task is
+    shielded, so a caller that goes away (e.g. a client disconnect) does
+    not cancel the call for the others. Keys are forgotten as soon as the
+    call finishes; this only deduplicates calls that overlap in time.
+    """
+    
+    def __init__(self):
+        """Initialize single flight group."""
+        self._calls: Dict[str, asyncio.Task] = {}
+        self.calls = 0
+        self.coalesced = 0
+    
+    async def do(self, key: str, call: Callable[[], Awaitable[T]]) -> T:
+        """Run ``call``, or join the in-flight call with the same key."""
+        self.calls += 1
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+    
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        """Drop a finished call."""
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            task.exception()  # Retrieved here in case every caller went away
+    
+    def stats(self) -> Dict[str, int]:
+        """Call counts and the number of calls deduplicated."""
+        return {"calls": self.calls, "coalesced": self.coalesced, "in_flight": len(self._calls)}
\ No newline at end of file
@@ -0,0 +1,166 @@
+"""Token counting with pluggable offline tokenizers and a content-hash cache."""
+
+import hashlib
+import re
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from app.core.config import settings
+
+# Words, runs of digits and single punctuation marks, each with its leading space
+PRE_TOKEN_PATTERN = re.compile(r" ?[^\W\d]+| ?\d+| ?[^\s\w]|\s+")
+
+_token_counter: Optional["TokenCounter"] = None
+
+
+class Tokenizer(ABC):
+    """Counts the tokens of a text without calling a provider."""
+    
+    @abstractmethod
+    def count(self, text: str) -> int:
+        """Number of tokens in a text."""
+        pass
+    
+    def count_batch(self, texts: List[str]) -> List[int]:
+        """Number of tokens in each of several texts."""
+        return [self.count(text) for text in texts]
+
+
+class HeuristicTokenizer(Tokenizer):
+    """Tokenizer approximating subword vocabularies without a vocab file.
+    
+    Text is split into words, numbers and punctuation like a BPE
+    pre-tokenizer. Short common words are single tokens in such
+    vocabularies, so a word counts as one token per ``chars_per_token``
+    characters, rounded to the nearest with halves rounding down
+    (``(len + 1) // 4`` by default) and at least one. Numbers split into
+    groups of three digits.
+    """
+    
+    def __init__(self, chars_per_token: int = 4):
+        """Initialize heuristic tokenizer."""
+        self.chars_per_token = chars_per_token
+    
+    def count(self, text: str) -> int:
+        """Number of tokens in a text."""
+        tokens = 0
+        for piece in PRE_TOKEN_PATTERN.findall(text):
+            piece = piece.lstrip(" ")
+            if not piece or piece.isspace():
+                tokens += 1 if "\n" in piece else 0
+            elif piece.isdigit():
+                tokens += -(-len(piece) // 3)
+            else:
+                tokens += max(1, (len(piece) + self.chars_per_token // 2 - 1) // self.chars_per_token)
+        return tokens
+
+
+class VocabTokenizer(Tokenizer):
+    """Greedy longest-match tokenizer over a local vocabulary file.
+    
+    The file lists one token per line (a SentencePiece or WordPiece vocab
+    exported as text works). Each pre-token is split into the longest
+    vocabulary entries that match; characters not covered by the vocabulary
+    count as one token each.
+    """
+    
+    def __init__(self, vocab: Set[str]):
+        """Initialize vocab tokenizer."""
+        self.vocab = vocab
+        self.max_piece_length = max((len(piece) for piece in vocab), default=1)
+    
+    @classmethod
+    def from_file(cls, path: str) -> "VocabTokenizer":
+        """Load a vocabulary with one token per line."""
+        lines = Path(path).read_text(encoding="utf-8").splitlines()
+        # SentencePiece marks a leading space with "▁"
+        return cls({line.split("\t")[0].replace("▁", " ") for line in lines if line})
+    
+    def count(self, text: str) -> int:
+        """Number of tokens in a text."""
+        tokens = 0
+        for piece in PRE_TOKEN_PATTERN.findall(text):
+            start = 0
+            while start < len(piece):
+                end = min(len(piece), start + self.max_piece_length)
+                while end > start + 1 and piece[start:end] not in self.vocab:
+                    end -= 1
+                tokens += 1
+                start = end
+        return tokens
+
+
+class TokenCounter:
+    """Counts tokens through a tokenizer, caching counts by content hash.
+    
+    Message contents repeat across turns (history windows, summaries,
+    retries), so each distinct text is tokenized once; the cache is a
+    bounded LRU keyed on a digest of the text, so long texts are not kept
+    in memory.
+    """
+    
+    def __init__(self, tokenizer: Optional[Tokenizer] = None, max_entries: int = 100000):
+        """Initialize token counter."""
+        self.tokenizer = tokenizer or HeuristicTokenizer()
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._counts: "OrderedDict[bytes, int]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def _key(self, text: str) -> bytes:
+        """Cache key for a text."""
+        return hashlib.blake2b(text.encode(), digest_size=16).digest()
+    
+    def _store(self, counts: Dict[bytes, int]) -> None:
+        """Cache new counts, evicting least recently used entries."""
+        with self._lock:
+            self._counts.update(counts)
+            while len(self._counts) > self.max_entries:
+                self._counts.popitem(last=False)
+    
+    def count(self, text: str) -> int:
+        """Number of tokens in a text."""
+        return self.count_many([text])[0]
+    
+    def count_many(self, texts: List[str]) -> List[int]:
+        """Number of tokens in each text, tokenizing only uncached ones in one batch."""
+        keys = [self._key(text) for text in texts]
+        counts: List[Optional[int]] = []
+        missing: Dict[bytes, str] = {}
+        
+        with self._lock:
+            for key, text in zip(keys, texts):
+                count = self._counts.get(key)
+                if count is None:
+                    missing[key] = text
+                else:
+                    self._counts.move_to_end(key)
+                counts.append(count)
+            self.hits += len(texts) - len(missing)
+            self.misses += len(missing)
+        
+        if missing:
+            new_counts = dict(zip(missing, self.tokenizer.count_batch(list(missing.values()))))
+            self._store(new_counts)
+            counts = [new_counts[key] if count is None else count for key, count in zip(keys, counts)]
+        
+        return counts
+    
+    def stats(self) -> Dict[str, int]:
+        """Cache statistics."""
+        return {"size": len(self._counts), "hits": self.hits, "misses": self.misses}
+
+
+def get_token_counter() -> TokenCounter:
+    """Get the process-wide token counter."""
+    global _token_counter
+    if _token_counter is None:
+        tokenizer = None
+        if settings.TOKENIZER_VOCAB_PATH:
+            tokenizer = VocabTokenizer.from_file(settings.TOKENIZER_VOCAB_PATH)
+        _token_counter = TokenCounter(tokenizer, max_entries=settings.TOKEN_COUNT_CACHE_SIZE)
+    return _token_counter
\ No newline at end of file
@@ -1,66 +1,24 @@
 """Tool service for managing tools."""
 
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from uuid import UUID
 
-from app.models.tool import Tool, ToolCreate, ToolUpdate
+from app.models.common import BatchItemResult, CursorPage
+from app.models.tool import Tool, ToolBatchUpdate, ToolCreate, ToolUpdate
+from app.services.batch import check_batch_size, raise_for_failures
+from app.services.pagination import paginate_for_user
+from app.storage.base import StorageBackend
+from app.storage.factory import get_storage_backend
 
 
 class ToolService:
     """Service for managing tools."""
     
-    def __init__(self):
+    def __init__(self, storage: Optional[StorageBackend] = None):
         """Initialize tool service."""
-        # In a real application, you would inject a database service here
-        self._tools_storage = {}  # Temporary in-memory storage
-        
-        # Initialize with some default tools
-        self._initialize_default_tools()
-    
-    def _initialize_default_tools(self):
-        """Initialize with some default tools."""
-        default_tools = [
-            {
-                "name": "Web Search",
-                "description": "Search the web for information",
-                "tool_type": "API Integration",
-                "category": "Data",
-                "user_id": "default_user"
-            },
-            {
-                "name": "File Reader",
-                "description": "Read and process various file formats",
-                "tool_type": "File Handler",
-                "category": "Utility",
-                "user_id": "default_user"
-            },
-            {
-                "name": "Calculator",
-                "description": "Perform mathematical calculations",
-                "tool_type": "Calculator",
-                "category": "Utility",
-                "user_id": "default_user"
-            },
-            {
-                "name": "Email Sender",
-                "description": "Send emails to recipients",
-                "tool_type": "Communication",
-                "category": "Communication",
-                "user_id": "default_user"
-            },
-            {
-                "name": "Data Analyzer",
-                "description": "Analyze and process data",
-                "tool_type": "Data Processing",
-                "category": "Analysis",
-                "user_id": "default_user"
-            }
-        ]
-        
-        for tool_data in default_tools:
-            tool = Tool(**tool_data)
-            self._tools_storage[str(tool.id)] = tool
+        self.storage = storage or get_storage_backend()
+        self._tools_storage = self.storage.tools
     
     async def create_tool(self, tool_data: ToolCreate, user_id: str) -> Tool:
         """Create a new tool."""
@@ -69,14 +27,14 @@ class ToolService:
             user_id=user_id
         )
         
-        # Store tool (in real app, this would be in a database)
-        self._tools_storage[str(tool.id)] = tool
+        # Store tool
+        await self._tools_storage.add(tool)
         
         return tool
     
     async def get_tool(self, tool_id: UUID, user_id: str) -> Optional[Tool]:
         """Get tool by ID."""
-        tool = self._tools_storage.get(str(tool_id))
+        tool = await self._tools_storage.get(tool_id)
         if tool and tool.user_id == user_id:
             return tool
         return None
@@ -84,15 +42,16 @@ class ToolService:
     async def list_tools(
         self, 
         user_id: str, 
-        skip: int = 0, 
-        limit: int = 100
-    ) -> List[Tool]:
-        """List all tools for a user."""
-        user_tools = [
-            tool for tool in self._tools_storage.values()
-            if tool.user_id == user_id and tool.is_active
-        ]
-        return user_tools[skip:skip + limit]
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> CursorPage[Tool]:
+        """List one page of a user's tools, oldest first."""
+        return await paginate_for_user(self._tools_storage, user_id, limit=limit, cursor=cursor)
+    
+    async def get_tools_version(self, user_id: str) -> str:
+        """Version of a user's tool list; changes on every tool write."""
+        version = await self._tools_storage.version_for_user(user_id)
+        return f"{self.storage.epoch}.{version}"
     
     async def update_tool(
         self, 
@@ -113,7 +72,7 @@ class ToolService:
         tool.updated_at = datetime.utcnow()
         
         # Store updated tool
-        self._tools_storage[str(tool.id)] = tool
+        await self._tools_storage.save(tool)
         
         return tool
     
@@ -126,5 +85,80 @@ class ToolService:
         # Soft delete
         tool.is_active = False
         tool.updated_at = datetime.utcnow()
+        await self._tools_storage.save(tool)
+        
+        return True
+    
+    async def _load_batch_targets(
+        self,
+        tool_ids: List[UUID],
+        user_id: str
+    ) -> Tuple[List[Optional[Tool]], List[BatchItemResult]]:
+        """Fetch the tools a batch refers to, flagging missing and repeated IDs."""
+        tools = []
+        results = []
+        seen = set()
+        for index, tool_id in enumerate(tool_ids):
+            tool = await self.get_tool(tool_id, user_id)
+            result = BatchItemResult(index=index, id=tool_id)
+            if tool_id in seen:
+                result.success = False
+                result.error = "Duplicate tool ID in batch"
+            elif not tool or not tool.is_active:
+                result.success = False
+                result.error = "Tool not found"
+            seen.add(tool_id)
+            tools.append(tool)
+            results.append(result)
+        return tools, results
+    
+    async def create_tools(
+        self,
+        tools_data: List[ToolCreate],
+        user_id: str
+    ) -> List[BatchItemResult]:
+        """Create several tools; either all are created or none are."""
+        check_batch_size(len(tools_data))
+        tools = [Tool(**tool_data.dict(), user_id=user_id) for tool_data in tools_data]
+        await self._tools_storage.save_many(tools)
+        
+        return [BatchItemResult(index=index, id=tool.id) for index, tool in enumerate(tools)]
+    
+    async def update_tools(
+        self,
+        tool_updates: List[ToolBatchUpdate],
+        user_id: str
+    ) -> List[BatchItemResult]:
+        """Update several tools; either all are updated or none are."""
+        check_batch_size(len(tool_updates))
+        
+        current, results = await self._load_batch_targets(
+            [tool_update.id for tool_update in tool_updates],
+            user_id
+        )
+        raise_for_failures(results)
+        
+        now = datetime.utcnow()
+        await self._tools_storage.save_many([
+            tool.copy(update={
+                **tool_update.dict(exclude_unset=True, exclude={"id"}),
+                "updated_at": now
+            })
+            for tool, tool_update in zip(current, tool_updates)
+        ])
+        
+        return results
+    
+    async def delete_tools(self, tool_ids: List[UUID], user_id: str) -> List[BatchItemResult]:
+        """Soft delete several tools; either all are deleted or none are."""
+        check_batch_size(len(tool_ids))
+        
+        current, results = await self._load_batch_targets(tool_ids, user_id)
+        raise_for_failures(results)
+        
+        now = datetime.utcnow()
+        await self._tools_storage.save_many([
+            tool.copy(update={"is_active": False, "updated_at": now}) for tool in current
+        ])
         
-        return True
\ No newline at end of file
+        return results
\ No newline at end of file
@@ -0,0 +1 @@
+"""Storage layer modules."""
\ No newline at end of file
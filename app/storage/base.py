@@ -0,0 +1,165 @@
+"""Storage backend interfaces."""
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Generic, List, Optional, Tuple, TypeVar
+
+from app.models.agent import Agent
+from app.models.chat import ChatMessage, ChatSession
+from app.models.common import BaseEntity
+from app.models.tool import Tool
+from app.storage.defaults import default_tools
+
+T = TypeVar("T", bound=BaseEntity)
+
+CursorKey = Tuple[Any, str]
+
+
+def apply_changes(
+    entity: T,
+    changes: Optional[Dict[str, Any]] = None,
+    increments: Optional[Dict[str, int]] = None
+) -> T:
+    """Set and increment fields of an entity in place."""
+    for field, value in (changes or {}).items():
+        setattr(entity, field, value)
+    for field, amount in (increments or {}).items():
+        setattr(entity, field, getattr(entity, field) + amount)
+    return entity
+
+
+class EntityRepository(ABC, Generic[T]):
+    """Storage for user-owned, soft-deletable entities."""
+    
+    @abstractmethod
+    async def get(self, entity_id: Any) -> Optional[T]:
+        """Get entity by ID."""
+    
+    @abstractmethod
+    async def add(self, entity: T) -> T:
+        """Store a new entity."""
+    
+    @abstractmethod
+    async def save(self, entity: T) -> T:
+        """Store an updated entity."""
+    
+    async def save_many(self, entities: List[T]) -> List[T]:
+        """Store several entities as one unit."""
+        for entity in entities:
+            await self.save(entity)
+        return entities
+    
+    async def update(
+        self,
+        entity_id: Any,
+        changes: Optional[Dict[str, Any]] = None,
+        increments: Optional[Dict[str, int]] = None
+    ) -> Optional[T]:
+        """Change some fields of a stored entity atomically and return it.
+        
+        Unlike ``get`` followed by ``save``, concurrent updates of different
+        fields (or increments of the same one) never overwrite each other.
+        """
+        entity = await self.get(entity_id)
+        if entity is None:
+            return None
+        return await self.save(apply_changes(entity, changes, increments))
+    
+    async def add_missing(self, entities: List[T]) -> int:
+        """Store the entities whose IDs are not stored yet, as one unit; return how many."""
+        missing = [entity for entity in entities if await self.get(entity.id) is None]
+        await self.save_many(missing)
+        return len(missing)
+    
+    @abstractmethod
+    def cursor_key(self, entity: T) -> CursorKey:
+        """Position of an entity in index order, as ``(sort value, id)``."""
+    
+    @abstractmethod
+    async def list_for_user(
+        self,
+        user_id: str,
+        skip: int = 0,
+        limit: int = 100,
+        is_active: bool = True,
+        after: Optional[CursorKey] = None
+    ) -> List[T]:
+        """List one page of a user's entities in index order.
+        
+        ``after`` is the ``cursor_key`` of the last entity of the previous
+        page; the page starts right after it without scanning skipped rows.
+        """
+    
+    @abstractmethod
+    async def count_for_user(self, user_id: str, is_active: bool = True) -> int:
+        """Count a user's entities."""
+    
+    @abstractmethod
+    async def version_for_user(self, user_id: str) -> int:
+        """Counter bumped on every write to a user's entities."""
+
+
+class MessageRepository(ABC):
+    """Append-only storage for chat messages, ordered per session."""
+    
+    @abstractmethod
+    async def get(self, message_id: Any) -> Optional[ChatMessage]:
+        """Get message by ID."""
+    
+    @abstractmethod
+    async def append(self, message: ChatMessage) -> ChatMessage:
+        """Append a message to the end of its session's log."""
+    
+    @abstractmethod
+    async def tail(self, session_id: Any, count: int) -> List[ChatMessage]:
+        """Get the most recent ``count`` messages of a session, oldest first."""
+    
+    @abstractmethod
+    async def page(
+        self,
+        session_id: Any,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[Any] = None
+    ) -> List[ChatMessage]:
+        """Get one page of a session's messages, oldest first.
+        
+        ``after_id`` is the ID of the last message of the previous page.
+        """
+    
+    @abstractmethod
+    async def count(self, session_id: Any) -> int:
+        """Count messages in a session."""
+
+
+class StorageBackend(ABC):
+    """Bundle of repositories the services depend on.
+    
+    ``epoch`` identifies the lifetime of the stored data; together with a
+    repository's version counter it changes whenever a collection changes,
+    even if the counters restart from zero.
+    """
+    
+    epoch: str
+    agents: EntityRepository[Agent]
+    tools: EntityRepository[Tool]
+    sessions: EntityRepository[ChatSession]
+    messages: MessageRepository
+    
+    async def connect(self) -> None:
+        """Open connections, prepare the schema and seed default data."""
+        await self.seed()
+    
+    async def seed(self) -> None:
+        """Store the default tools, unless they were stored before.
+        
+        Defaults have fixed IDs, so they are seeded once per database even
+        when several processes connect at the same time, and soft-deleted
+        defaults stay deleted.
+        """
+        await self.tools.add_missing(default_tools())
+    
+    async def close(self) -> None:
+        """Release connections."""
+    
+    async def ping(self) -> None:
+        """Check the backend can serve a query, raising if it cannot."""
\ No newline at end of file
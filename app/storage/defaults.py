@@ -0,0 +1,57 @@
+"""Entities every storage backend starts with."""
+
+from typing import List
+from uuid import UUID, uuid5
+
+from app.models.tool import Tool
+
+DEFAULT_TOOLS_USER_ID = "default_user"
+
+# Default tool IDs are derived from their names, so every process seeding
+# the same database inserts the same rows
+DEFAULT_TOOLS_NAMESPACE = UUID("6f1c3a52-5d0e-4c8b-9a57-2f4e1d7b8c90")
+
+DEFAULT_TOOLS = [
+    {
+        "name": "Web Search",
+        "description": "Search the web for information",
+        "tool_type": "API Integration",
+        "category": "Data"
+    },
+    {
+        "name": "File Reader",
+        "description": "Read and process various file formats",
+        "tool_type": "File Handler",
+        "category": "Utility"
+    },
+    {
+        "name": "Calculator",
+        "description": "Perform mathematical calculations",
+        "tool_type": "Calculator",
+        "category": "Utility"
+    },
+    {
+        "name": "Email Sender",
+        "description": "Send emails to recipients",
+        "tool_type": "Communication",
+        "category": "Communication"
+    },
+    {
+        "name": "Data Analyzer",
+        "description": "Analyze and process data",
+        "tool_type": "Data Processing",
+        "category": "Analysis"
+    }
+]
+
+
+def default_tools() -> List[Tool]:
+    """Build the default tools with deterministic IDs."""
+    return [
+        Tool(
+            **tool_data,
+            id=uuid5(DEFAULT_TOOLS_NAMESPACE, tool_data["name"]),
+            user_id=DEFAULT_TOOLS_USER_ID
+        )
+        for tool_data in DEFAULT_TOOLS
+    ]
\ No newline at end of file
@@ -0,0 +1,33 @@
+"""Storage backend selection."""
+
+from typing import Optional
+
+from app.core.config import settings
+from app.storage.base import StorageBackend
+from app.storage.memory import MemoryStorageBackend
+
+_storage_backend: Optional[StorageBackend] = None
+
+
+def create_storage_backend(backend: Optional[str] = None) -> StorageBackend:
+    """Create the storage backend named in settings (``memory`` or ``sqlite``)."""
+    backend = (backend or settings.STORAGE_BACKEND).lower()
+    
+    if backend == "memory":
+        return MemoryStorageBackend()
+    
+    if backend == "sqlite":
+        # Imported lazily so aiosqlite is only required when SQLite is used
+        from app.storage.sqlite import SQLiteStorageBackend
+        
+        return SQLiteStorageBackend(settings.SQLITE_PATH, pool_size=settings.SQLITE_POOL_SIZE)
+    
+    raise ValueError(f"Unknown storage backend: {backend}")
+
+
+def get_storage_backend() -> StorageBackend:
+    """Get the process-wide storage backend shared by all services."""
+    global _storage_backend
+    if _storage_backend is None:
+        _storage_backend = create_storage_backend()
+    return _storage_backend
\ No newline at end of file
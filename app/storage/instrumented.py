@@ -0,0 +1,63 @@
+"""Storage backend wrapper timing every repository call."""
+
+import inspect
+import time
+from typing import Any
+
+from app.core.metrics import STORAGE_OPERATION_SECONDS
+from app.storage.base import StorageBackend
+
+
+class TimedRepository:
+    """Proxy recording the latency of a repository's coroutine methods."""
+    
+    def __init__(self, repository: Any, name: str):
+        """Initialize timed repository."""
+        self._repository = repository
+        self._name = name
+    
+    def __getattr__(self, attribute: str) -> Any:
+        """Get a repository attribute, wrapping coroutine methods in a timer."""
+        value = getattr(self._repository, attribute)
+        if not inspect.iscoroutinefunction(value):
+            return value
+        
+        async def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await value(*args, **kwargs)
+            finally:
+                STORAGE_OPERATION_SECONDS.observe(time.perf_counter() - start, self._name, attribute)
+        
+        # Cached on the instance so later lookups skip __getattr__
+        setattr(self, attribute, timed)
+        return timed
+
+
+class InstrumentedStorageBackend(StorageBackend):
+    """Storage backend whose repositories report call latency to ``/metrics``."""
+    
+    def __init__(self, backend: StorageBackend):
+        """Wrap a storage backend."""
+        self.backend = backend
+        self.agents = TimedRepository(backend.agents, "agents")
+        self.tools = TimedRepository(backend.tools, "tools")
+        self.sessions = TimedRepository(backend.sessions, "sessions")
+        self.messages = TimedRepository(backend.messages, "messages")
+    
+    @property
+    def epoch(self) -> str:
+        """Epoch of the wrapped backend (set when it connects)."""
+        return self.backend.epoch
+    
+    async def connect(self) -> None:
+        """Open connections and prepare the schema."""
+        await self.backend.connect()
+    
+    async def close(self) -> None:
+        """Release connections."""
+        await self.backend.close()
+    
+    async def ping(self) -> None:
+        """Check the wrapped backend can serve a query."""
+        await self.backend.ping()
\ No newline at end of file
@@ -0,0 +1,202 @@
+"""In-memory storage with secondary indexes."""
+
+import bisect
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+from uuid import uuid4
+
+from app.models.chat import ChatMessage
+from app.models.common import BaseEntity
+from app.storage.base import CursorKey, EntityRepository, MessageRepository, StorageBackend
+
+T = TypeVar("T", bound=BaseEntity)
+
+SortKey = Callable[[BaseEntity], Any]
+
+
+def created_at_key(entity: BaseEntity) -> Any:
+    """Order entities by creation time."""
+    return entity.created_at
+
+
+def updated_at_key(entity: BaseEntity) -> Any:
+    """Order entities by last update, falling back to creation time."""
+    return entity.updated_at or entity.created_at
+
+
+class InMemoryRepository(EntityRepository[T]):
+    """Entity store with per-user and per-active-flag secondary indexes.
+    
+    Every (user_id, is_active) pair owns a list of ``(sort_key, id)`` entries
+    kept in order on write, so listing or paging one user's entities costs
+    O(log n + page) no matter how many entities other users own. Entities are
+    mutated in place by the services, which must call ``save`` afterwards so
+    the indexes follow the new field values.
+    """
+    
+    def __init__(self, sort_key: SortKey = created_at_key, descending: bool = False):
+        """Initialize repository."""
+        self._sort_key = sort_key
+        self._descending = descending
+        self._items: Dict[str, T] = {}
+        self._index: Dict[Tuple[str, bool], List[Tuple[Any, str]]] = {}
+        self._indexed_as: Dict[str, Tuple[Tuple[str, bool], Tuple[Any, str]]] = {}
+        self._versions: Counter = Counter()
+    
+    def __len__(self) -> int:
+        """Number of stored entities, active or not."""
+        return len(self._items)
+    
+    def __contains__(self, entity_id: Any) -> bool:
+        """Check whether an entity ID is stored."""
+        return str(entity_id) in self._items
+    
+    async def get(self, entity_id: Any) -> Optional[T]:
+        """Get entity by ID."""
+        return self._items.get(str(entity_id))
+    
+    async def add(self, entity: T) -> T:
+        """Store a new entity."""
+        return await self.save(entity)
+    
+    async def save(self, entity: T) -> T:
+        """Store an entity and refresh its index entries."""
+        entity_id = str(entity.id)
+        self._unindex(entity_id)
+        self._items[entity_id] = entity
+        
+        bucket_key = (entity.user_id, entity.is_active)
+        entry = (self._sort_key(entity), entity_id)
+        bisect.insort(self._index.setdefault(bucket_key, []), entry)
+        self._indexed_as[entity_id] = (bucket_key, entry)
+        self._versions[entity.user_id] += 1
+        
+        return entity
+    
+    async def remove(self, entity_id: Any) -> Optional[T]:
+        """Remove an entity entirely (hard delete)."""
+        entity_id = str(entity_id)
+        self._unindex(entity_id)
+        entity = self._items.pop(entity_id, None)
+        if entity is not None:
+            self._versions[entity.user_id] += 1
+        return entity
+    
+    def cursor_key(self, entity: T) -> CursorKey:
+        """Position of an entity in index order."""
+        return (self._sort_key(entity), str(entity.id))
+    
+    async def list_for_user(
+        self,
+        user_id: str,
+        skip: int = 0,
+        limit: int = 100,
+        is_active: bool = True,
+        after: Optional[CursorKey] = None
+    ) -> List[T]:
+        """List one page of a user's entities in index order."""
+        entries = self._index.get((user_id, is_active), [])
+        skip = max(skip, 0)
+        
+        if self._descending:
+            end = bisect.bisect_left(entries, after) if after else len(entries)
+            end = max(end - skip, 0)
+            page = reversed(entries[max(end - limit, 0):end])
+        else:
+            start = bisect.bisect_right(entries, after) if after else 0
+            page = entries[start + skip:start + skip + limit]
+        
+        return [self._items[entity_id] for _, entity_id in page]
+    
+    async def count_for_user(self, user_id: str, is_active: bool = True) -> int:
+        """Count a user's entities without materializing them."""
+        return len(self._index.get((user_id, is_active), ()))
+    
+    async def version_for_user(self, user_id: str) -> int:
+        """Counter bumped on every write to a user's entities."""
+        return self._versions[user_id]
+    
+    def _unindex(self, entity_id: str) -> None:
+        """Drop the index entry recorded for an entity, if any."""
+        indexed = self._indexed_as.pop(entity_id, None)
+        if indexed is None:
+            return
+        
+        bucket_key, entry = indexed
+        entries = self._index[bucket_key]
+        position = bisect.bisect_left(entries, entry)
+        if position < len(entries) and entries[position] == entry:
+            del entries[position]
+        if not entries:
+            del self._index[bucket_key]
+
+
+class MessageLog(MessageRepository):
+    """Append-only, per-session ordered message log.
+    
+    Messages are appended as they are written, so each session's list is
+    already in ``created_at`` order: the last N messages are a tail slice
+    and history reads are a plain slice, both independent of how many
+    messages other sessions hold. Each message's position in its session is
+    recorded so cursor reads start without scanning earlier messages.
+    """
+    
+    def __init__(self):
+        """Initialize message log."""
+        self._by_session: Dict[str, List[ChatMessage]] = {}
+        self._by_id: Dict[str, ChatMessage] = {}
+        self._positions: Dict[str, int] = {}
+    
+    def __len__(self) -> int:
+        """Total number of messages across all sessions."""
+        return len(self._by_id)
+    
+    async def get(self, message_id: Any) -> Optional[ChatMessage]:
+        """Get message by ID."""
+        return self._by_id.get(str(message_id))
+    
+    async def append(self, message: ChatMessage) -> ChatMessage:
+        """Append a message to the end of its session's log."""
+        messages = self._by_session.setdefault(str(message.session_id), [])
+        self._positions[str(message.id)] = len(messages)
+        messages.append(message)
+        self._by_id[str(message.id)] = message
+        return message
+    
+    async def tail(self, session_id: Any, count: int) -> List[ChatMessage]:
+        """Get the most recent ``count`` messages of a session, oldest first."""
+        if count <= 0:
+            return []
+        return self._by_session.get(str(session_id), [])[-count:]
+    
+    async def page(
+        self,
+        session_id: Any,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[Any] = None
+    ) -> List[ChatMessage]:
+        """Get one page of a session's messages, oldest first."""
+        start = max(skip, 0)
+        if after_id is not None:
+            after = self._by_id.get(str(after_id))
+            if after is None or str(after.session_id) != str(session_id):
+                return []
+            start += self._positions[str(after_id)] + 1
+        return self._by_session.get(str(session_id), [])[start:start + limit]
+    
+    async def count(self, session_id: Any) -> int:
+        """Count messages in a session."""
+        return len(self._by_session.get(str(session_id), ()))
+
+
+class MemoryStorageBackend(StorageBackend):
+    """Process-local storage backend; state is lost on restart."""
+    
+    def __init__(self):
+        """Initialize in-memory repositories."""
+        self.epoch = uuid4().hex[:8]
+        self.agents = InMemoryRepository()
+        self.tools = InMemoryRepository()
+        self.sessions = InMemoryRepository(sort_key=updated_at_key, descending=True)
+        self.messages = MessageLog()
\ No newline at end of file
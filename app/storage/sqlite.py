@@ -0,0 +1,451 @@
+"""SQLite storage backend built on aiosqlite.
+
+Entities are stored as JSON documents next to the columns we filter and
+order on, so every list query is an index range scan. The database runs in
+WAL mode, which lets several uvicorn workers read concurrently while one of
+them writes.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Type
+from uuid import uuid4
+
+import aiosqlite
+
+from app.models.agent import Agent
+from app.models.chat import ChatMessage, ChatSession
+from app.models.tool import Tool
+from app.storage.base import (
+    CursorKey,
+    EntityRepository,
+    MessageRepository,
+    StorageBackend,
+    T,
+    apply_changes
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS {table} (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    is_active INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    sort_at TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_{table}_user_active_sort
+    ON {table} (user_id, is_active, sort_at, id);
+"""
+
+MESSAGES_SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    session_id TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_messages_session_seq ON messages (session_id, seq);
+CREATE INDEX IF NOT EXISTS ix_messages_session_created ON messages (session_id, created_at);
+CREATE INDEX IF NOT EXISTS ix_messages_user ON messages (user_id);
+"""
+
+VERSIONS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS collection_versions (
+    collection TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    PRIMARY KEY (collection, user_id)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+def format_timestamp(value: datetime) -> str:
+    """Format a timestamp so that string order matches time order."""
+    return value.strftime("%Y-%m-%dT%H:%M:%S.%f")
+
+
+class SQLiteConnectionPool:
+    """Fixed-size pool of aiosqlite connections.
+    
+    Each connection keeps its own prepared-statement cache, so reusing
+    connections (and constant SQL strings) avoids re-parsing queries.
+    """
+    
+    def __init__(self, path: str, size: int = 5, statement_cache_size: int = 256):
+        """Initialize connection pool."""
+        self.path = path
+        self.size = size
+        self.statement_cache_size = statement_cache_size
+        self._pool: Optional[asyncio.Queue] = None
+        self._connections: List[aiosqlite.Connection] = []
+        self._open_lock = asyncio.Lock()
+    
+    async def open(self, schema: str) -> None:
+        """Open all connections and apply the schema once."""
+        async with self._open_lock:
+            if self._pool is not None:
+                return
+            
+            if self.path != ":memory:":
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            
+            pool: asyncio.Queue = asyncio.Queue()
+            for index in range(self.size):
+                connection = await aiosqlite.connect(
+                    self.path,
+                    cached_statements=self.statement_cache_size
+                )
+                for pragma in PRAGMAS:
+                    await connection.execute(pragma)
+                if index == 0:
+                    await connection.executescript(schema)
+                    await connection.commit()
+                self._connections.append(connection)
+                pool.put_nowait(connection)
+            
+            self._pool = pool
+    
+    async def close(self) -> None:
+        """Close all connections."""
+        async with self._open_lock:
+            for connection in self._connections:
+                await connection.close()
+            self._connections = []
+            self._pool = None
+    
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Borrow a connection for the duration of the block."""
+        if self._pool is None:
+            raise RuntimeError("SQLite storage is not connected")
+        
+        connection = await self._pool.get()
+        try:
+            yield connection
+        finally:
+            self._pool.put_nowait(connection)
+
+
+class SQLiteEntityRepository(EntityRepository[T]):
+    """Entity repository backed by one SQLite table."""
+    
+    def __init__(
+        self,
+        pool: SQLiteConnectionPool,
+        table: str,
+        model: Type[T],
+        sort_by_updated: bool = False,
+        descending: bool = False
+    ):
+        """Initialize repository and build its SQL statements."""
+        self._pool = pool
+        self._model = model
+        self._sort_by_updated = sort_by_updated
+        order = "DESC" if descending else "ASC"
+        beyond = "<" if descending else ">"
+        
+        self._get_sql = f"SELECT data FROM {table} WHERE id = ?"
+        self._upsert_sql = (
+            f"INSERT INTO {table} (id, user_id, is_active, created_at, sort_at, data) "
+            f"VALUES (?, ?, ?, ?, ?, ?) "
+            f"ON CONFLICT(id) DO UPDATE SET user_id = excluded.user_id, "
+            f"is_active = excluded.is_active, sort_at = excluded.sort_at, data = excluded.data"
+        )
+        self._list_sql = (
+            f"SELECT data FROM {table} WHERE user_id = ? AND is_active = ? "
+            f"ORDER BY sort_at {order}, id {order} LIMIT ? OFFSET ?"
+        )
+        self._list_after_sql = (
+            f"SELECT data FROM {table} WHERE user_id = ? AND is_active = ? "
+            f"AND (sort_at, id) {beyond} (?, ?) "
+            f"ORDER BY sort_at {order}, id {order} LIMIT ? OFFSET ?"
+        )
+        self._insert_missing_sql = (
+            f"INSERT OR IGNORE INTO {table} (id, user_id, is_active, created_at, sort_at, data) "
+            f"VALUES (?, ?, ?, ?, ?, ?)"
+        )
+        self._count_sql = f"SELECT COUNT(*) FROM {table} WHERE user_id = ? AND is_active = ?"
+        self._bump_version_sql = (
+            f"INSERT INTO collection_versions (collection, user_id, version) VALUES ('{table}', ?, 1) "
+            f"ON CONFLICT(collection, user_id) DO UPDATE SET version = version + 1"
+        )
+        self._version_sql = (
+            f"SELECT version FROM collection_versions WHERE collection = '{table}' AND user_id = ?"
+        )
+    
+    async def get(self, entity_id: Any) -> Optional[T]:
+        """Get entity by ID."""
+        async with self._pool.acquire() as connection:
+            async with connection.execute(self._get_sql, (str(entity_id),)) as cursor:
+                row = await cursor.fetchone()
+        return self._model.parse_raw(row[0]) if row else None
+    
+    async def add(self, entity: T) -> T:
+        """Store a new entity."""
+        return await self.save(entity)
+    
+    def _sort_at(self, entity: T) -> datetime:
+        """Value of the ``sort_at`` column for an entity."""
+        if self._sort_by_updated and entity.updated_at:
+            return entity.updated_at
+        return entity.created_at
+    
+    def _row(self, entity: T) -> tuple:
+        """Column values for the upsert statement."""
+        return (
+            str(entity.id),
+            entity.user_id,
+            int(entity.is_active),
+            format_timestamp(entity.created_at),
+            format_timestamp(self._sort_at(entity)),
+            entity.json()
+        )
+    
+    def cursor_key(self, entity: T) -> CursorKey:
+        """Position of an entity in index order."""
+        return (self._sort_at(entity), str(entity.id))
+    
+    async def save(self, entity: T) -> T:
+        """Insert or update an entity and bump its owner's version."""
+        async with self._pool.acquire() as connection:
+            try:
+                await connection.execute(self._upsert_sql, self._row(entity))
+                await connection.execute(self._bump_version_sql, (entity.user_id,))
+                await connection.commit()
+            except Exception:
+                await connection.rollback()
+                raise
+        return entity
+    
+    async def save_many(self, entities: List[T]) -> List[T]:
+        """Insert or update several entities in a single transaction."""
+        rows = [self._row(entity) for entity in entities]
+        owners = [(user_id,) for user_id in {entity.user_id for entity in entities}]
+        async with self._pool.acquire() as connection:
+            try:
+                await connection.executemany(self._upsert_sql, rows)
+                await connection.executemany(self._bump_version_sql, owners)
+                await connection.commit()
+            except Exception:
+                await connection.rollback()
+                raise
+        return entities
+    
+    async def update(
+        self,
+        entity_id: Any,
+        changes: Optional[Dict[str, Any]] = None,
+        increments: Optional[Dict[str, int]] = None
+    ) -> Optional[T]:
+        """Read, change and write an entity in one write transaction."""
+        async with self._pool.acquire() as connection:
+            try:
+                # Take the write lock before reading, so no other writer
+                # (in this process or another) can interleave
+                await connection.execute("BEGIN IMMEDIATE")
+                async with connection.execute(self._get_sql, (str(entity_id),)) as cursor:
+                    row = await cursor.fetchone()
+                if row is None:
+                    await connection.rollback()
+                    return None
+                
+                entity = apply_changes(self._model.parse_raw(row[0]), changes, increments)
+                await connection.execute(self._upsert_sql, self._row(entity))
+                await connection.execute(self._bump_version_sql, (entity.user_id,))
+                await connection.commit()
+            except Exception:
+                await connection.rollback()
+                raise
+        return entity
+    
+    async def add_missing(self, entities: List[T]) -> int:
+        """Insert the entities whose IDs are not stored yet in a single transaction."""
+        rows = [self._row(entity) for entity in entities]
+        owners = [(user_id,) for user_id in {entity.user_id for entity in entities}]
+        async with self._pool.acquire() as connection:
+            try:
+                cursor = await connection.executemany(self._insert_missing_sql, rows)
+                added = cursor.rowcount
+                if added:
+                    await connection.executemany(self._bump_version_sql, owners)
+                await connection.commit()
+            except Exception:
+                await connection.rollback()
+                raise
+        return added
+    
+    async def list_for_user(
+        self,
+        user_id: str,
+        skip: int = 0,
+        limit: int = 100,
+        is_active: bool = True,
+        after: Optional[CursorKey] = None
+    ) -> List[T]:
+        """List one page of a user's entities in index order."""
+        if after:
+            sql = self._list_after_sql
+            params = (user_id, int(is_active), format_timestamp(after[0]), after[1], limit, max(skip, 0))
+        else:
+            sql = self._list_sql
+            params = (user_id, int(is_active), limit, max(skip, 0))
+        
+        async with self._pool.acquire() as connection:
+            async with connection.execute(sql, params) as cursor:
+                rows = await cursor.fetchall()
+        return [self._model.parse_raw(row[0]) for row in rows]
+    
+    async def count_for_user(self, user_id: str, is_active: bool = True) -> int:
+        """Count a user's entities."""
+        async with self._pool.acquire() as connection:
+            async with connection.execute(self._count_sql, (user_id, int(is_active))) as cursor:
+                row = await cursor.fetchone()
+        return row[0]
+    
+    async def version_for_user(self, user_id: str) -> int:
+        """Counter bumped on every write to a user's entities."""
+        async with self._pool.acquire() as connection:
+            async with connection.execute(self._version_sql, (user_id,)) as cursor:
+                row = await cursor.fetchone()
+        return row[0] if row else 0
+
+
+class SQLiteMessageRepository(MessageRepository):
+    """Message log backed by the ``messages`` table, ordered by insert sequence."""
+    
+    GET_SQL = "SELECT data FROM messages WHERE id = ?"
+    APPEND_SQL = (
+        "INSERT INTO messages (id, session_id, user_id, created_at, data) "
+        "VALUES (?, ?, ?, ?, ?)"
+    )
+    TAIL_SQL = (
+        "SELECT data FROM (SELECT seq, data FROM messages WHERE session_id = ? "
+        "ORDER BY seq DESC LIMIT ?) ORDER BY seq ASC"
+    )
+    PAGE_SQL = "SELECT data FROM messages WHERE session_id = ? ORDER BY seq ASC LIMIT ? OFFSET ?"
+    PAGE_AFTER_SQL = (
+        "SELECT data FROM messages WHERE session_id = ? "
+        "AND seq > (SELECT seq FROM messages WHERE id = ? AND session_id = ?) "
+        "ORDER BY seq ASC LIMIT ? OFFSET ?"
+    )
+    COUNT_SQL = "SELECT COUNT(*) FROM messages WHERE session_id = ?"
+    
+    def __init__(self, pool: SQLiteConnectionPool):
+        """Initialize repository."""
+        self._pool = pool
+    
+    async def _fetch(self, sql: str, params: tuple) -> List[ChatMessage]:
+        """Run a query returning message documents."""
+        async with self._pool.acquire() as connection:
+            async with connection.execute(sql, params) as cursor:
+                rows = await cursor.fetchall()
+        return [ChatMessage.parse_raw(row[0]) for row in rows]
+    
+    async def get(self, message_id: Any) -> Optional[ChatMessage]:
+        """Get message by ID."""
+        messages = await self._fetch(self.GET_SQL, (str(message_id),))
+        return messages[0] if messages else None
+    
+    async def append(self, message: ChatMessage) -> ChatMessage:
+        """Append a message to the end of its session's log."""
+        async with self._pool.acquire() as connection:
+            try:
+                await connection.execute(self.APPEND_SQL, (
+                    str(message.id),
+                    str(message.session_id),
+                    message.user_id,
+                    format_timestamp(message.created_at),
+                    message.json()
+                ))
+                await connection.commit()
+            except Exception:
+                await connection.rollback()
+                raise
+        return message
+    
+    async def tail(self, session_id: Any, count: int) -> List[ChatMessage]:
+        """Get the most recent ``count`` messages of a session, oldest first."""
+        if count <= 0:
+            return []
+        return await self._fetch(self.TAIL_SQL, (str(session_id), count))
+    
+    async def page(
+        self,
+        session_id: Any,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[Any] = None
+    ) -> List[ChatMessage]:
+        """Get one page of a session's messages, oldest first."""
+        if after_id is not None:
+            params = (str(session_id), str(after_id), str(session_id), limit, max(skip, 0))
+            return await self._fetch(self.PAGE_AFTER_SQL, params)
+        return await self._fetch(self.PAGE_SQL, (str(session_id), limit, max(skip, 0)))
+    
+    async def count(self, session_id: Any) -> int:
+        """Count messages in a session."""
+        async with self._pool.acquire() as connection:
+            async with connection.execute(self.COUNT_SQL, (str(session_id),)) as cursor:
+                row = await cursor.fetchone()
+        return row[0]
+
+
+class SQLiteStorageBackend(StorageBackend):
+    """Storage backend persisting to a shared SQLite database file."""
+    
+    INIT_EPOCH_SQL = "INSERT OR IGNORE INTO meta (key, value) VALUES ('epoch', ?)"
+    EPOCH_SQL = "SELECT value FROM meta WHERE key = 'epoch'"
+    
+    def __init__(self, path: str, pool_size: int = 5):
+        """Initialize backend; call ``connect`` before use."""
+        self.pool = SQLiteConnectionPool(path, size=pool_size)
+        self.agents = SQLiteEntityRepository(self.pool, "agents", Agent)
+        self.tools = SQLiteEntityRepository(self.pool, "tools", Tool)
+        self.sessions = SQLiteEntityRepository(
+            self.pool,
+            "sessions",
+            ChatSession,
+            sort_by_updated=True,
+            descending=True
+        )
+        self.messages = SQLiteMessageRepository(self.pool)
+    
+    async def connect(self) -> None:
+        """Open the connection pool, create tables and indexes, load the epoch and seed."""
+        schema = "".join(SCHEMA.format(table=table) for table in ("agents", "tools", "sessions"))
+        await self.pool.open(schema + MESSAGES_SCHEMA + VERSIONS_SCHEMA)
+        
+        # The epoch is created with the database, so versions are never reused
+        async with self.pool.acquire() as connection:
+            await connection.execute(self.INIT_EPOCH_SQL, (uuid4().hex[:8],))
+            await connection.commit()
+            async with connection.execute(self.EPOCH_SQL) as cursor:
+                self.epoch = (await cursor.fetchone())[0]
+        
+        await self.seed()
+    
+    async def close(self) -> None:
+        """Close the connection pool."""
+        await self.pool.close()
+    
+    async def ping(self) -> None:
+        """Run a trivial query on a pooled connection."""
+        async with self.pool.acquire() as connection:
+            async with connection.execute("SELECT 1") as cursor:
+                await cursor.fetchone()
\ No newline at end of file
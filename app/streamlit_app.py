@@ -5,7 +5,7 @@ from pathlib import Path
 import streamlit as st
 from app.utils.api_client import get_api_client
 from app.utils.config import get_config
-from app.utils.error_handler import safe_async_call, LoadingState
+from app.utils.error_handler import safe_async_call, safe_async_gather, LoadingState
 from app.components.agent_management import agent_management_section, load_agents
 from app.components.tool_management import tool_management_section, load_tools
 from app.components.chat_interface import chat_interface
@@ -34,22 +34,28 @@ def initialize_app():
 
 
 def load_data(api_client):
-    """Load agents and tools data."""
+    """Load agents, tools and API health."""
     # Initialize session states
     if 'agents_data' not in st.session_state:
         st.session_state.agents_data = []
     if 'tools_data' not in st.session_state:
         st.session_state.tools_data = []
+    if 'api_health' not in st.session_state:
+        st.session_state.api_health = None
 
-    # Load data
+    # Load data concurrently so the page waits for one round-trip, not three
     with LoadingState("Loading data..."):
-        agents = safe_async_call(load_agents, api_client)
-        tools = safe_async_call(load_tools, api_client)
+        agents, tools, health = safe_async_gather(
+            (load_agents, api_client),
+            (load_tools, api_client),
+            (api_client.health_check,)
+        )
         
         if agents is not None:
             st.session_state.agents_data = agents
         if tools is not None:
             st.session_state.tools_data = tools
+        st.session_state.api_health = health
 
 
 def setup_sidebar(config, api_client):
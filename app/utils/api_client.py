@@ -1,16 +1,38 @@
 """API client for Streamlit to communicate with FastAPI backend."""
 
+import asyncio
+import importlib.util
 import json
-from typing import Dict, List, Optional, Any
+import threading
+import weakref
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple
 from uuid import UUID
 import httpx
 import streamlit as st
 
+from app.utils.async_runner import get_async_runner
+from app.utils.config import get_config
+from app.utils.data_cache import StaleWhileRevalidateCache
+
 
 class APIClient:
-    """Client for communicating with FastAPI backend."""
+    """Client for communicating with FastAPI backend.
+    
+    Requests share a pooled ``httpx.AsyncClient`` so keep-alive connections
+    are reused across calls. httpx connections are bound to the event loop
+    that opened them, so one pooled client is kept per running loop and is
+    dropped together with its loop.
+    """
     
-    def __init__(self, base_url: str = "http://localhost:8000", api_key: Optional[str] = None):
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8000",
+        api_key: Optional[str] = None,
+        timeout: Optional[httpx.Timeout] = None,
+        limits: Optional[httpx.Limits] = None,
+        http2: bool = False,
+        cache_ttl_seconds: float = 30.0
+    ):
         """Initialize API client."""
         self.base_url = base_url.rstrip("/")
         self.api_v1_url = f"{self.base_url}/api/v1"
@@ -19,37 +41,73 @@ class APIClient:
         }
         if api_key:
             self.headers["Authorization"] = f"Bearer {api_key}"
+        
+        self.timeout = timeout or httpx.Timeout(30.0, connect=5.0)
+        self.limits = limits or httpx.Limits(
+            max_connections=20,
+            max_keepalive_connections=10,
+            keepalive_expiry=30.0
+        )
+        # HTTP/2 needs the optional ``h2`` package (``httpx[http2]``)
+        self.http2 = http2 and importlib.util.find_spec("h2") is not None
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._clients_lock = threading.Lock()
+        
+        # Agent and tool lists, revalidated with ETags
+        self.cache = StaleWhileRevalidateCache(ttl_seconds=cache_ttl_seconds)
     
-    async def _make_request(
-        self, 
-        method: str, 
-        endpoint: str, 
-        data: Optional[Dict] = None,
-        params: Optional[Dict] = None
-    ) -> Dict[str, Any]:
-        """Make HTTP request to API."""
-        url = f"{self.api_v1_url}{endpoint}"
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the pooled HTTP client for the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._clients_lock:
+            client = self._clients.get(loop)
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient(
+                    base_url=self.api_v1_url,
+                    headers=self.headers,
+                    timeout=self.timeout,
+                    limits=self.limits,
+                    http2=self.http2
+                )
+                self._clients[loop] = client
+        return client
+    
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client of the running event loop."""
+        with self._clients_lock:
+            client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+    
+    async def _send(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Any] = None,
+        params: Optional[Dict] = None,
+        headers: Optional[Dict] = None
+    ) -> httpx.Response:
+        """Send an HTTP request to the API and return the raw response."""
+        method = method.upper()
+        if method not in ("GET", "POST", "PUT", "DELETE"):
+            raise ValueError(f"Unsupported HTTP method: {method}")
         
         try:
-            async with httpx.AsyncClient() as client:
-                if method.upper() == "GET":
-                    response = await client.get(url, headers=self.headers, params=params)
-                elif method.upper() == "POST":
-                    response = await client.post(url, headers=self.headers, json=data)
-                elif method.upper() == "PUT":
-                    response = await client.put(url, headers=self.headers, json=data)
-                elif method.upper() == "DELETE":
-                    response = await client.delete(url, headers=self.headers)
-                else:
-                    raise ValueError(f"Unsupported HTTP method: {method}")
-                
+            client = self._get_client()
+            response = await client.request(
+                method,
+                endpoint,
+                params=params,
+                headers=headers,
+                json=data if method in ("POST", "PUT") else None
+            )
+            
+            # 304 answers a conditional GET; httpx would treat it as a failed redirect
+            if response.status_code != 304:
                 response.raise_for_status()
-                
-                # Handle empty responses (like DELETE)
-                if response.status_code == 204:
-                    return {"success": True}
-                
-                return response.json()
+            return response
                 
         except httpx.HTTPStatusError as e:
             error_detail = "Unknown error"
@@ -65,6 +123,63 @@ class APIClient:
         except Exception as e:
             raise Exception(f"Unexpected Error: {str(e)}")
     
+    async def _make_request(
+        self, 
+        method: str, 
+        endpoint: str, 
+        data: Optional[Any] = None,
+        params: Optional[Dict] = None
+    ) -> Dict[str, Any]:
+        """Make HTTP request to API."""
+        response = await self._send(method, endpoint, data=data, params=params)
+        
+        # Handle empty responses (like DELETE)
+        if response.status_code == 204:
+            return {"success": True}
+        
+        return response.json()
+    
+    async def _fetch_all(
+        self,
+        endpoint: str,
+        etag: Optional[str] = None,
+        page_size: int = 100
+    ) -> Tuple[Optional[List[Dict]], Optional[str]]:
+        """Fetch every item of a paginated list, or (None, etag) if unchanged.
+        
+        The first page is requested with ``If-None-Match``; a 304 means the
+        collection has not changed since ``etag`` and nothing else is fetched.
+        """
+        headers = {"If-None-Match": etag} if etag else None
+        params = {"limit": page_size}
+        response = await self._send("GET", endpoint, params=params, headers=headers)
+        if response.status_code == 304:
+            return None, etag
+        
+        page = response.json()
+        items = list(page["items"])
+        while page.get("next_cursor"):
+            page = await self._make_request("GET", endpoint, params={**params, "cursor": page["next_cursor"]})
+            items.extend(page["items"])
+        
+        return items, response.headers.get("ETag")
+    
+    async def _iter_pages(
+        self,
+        endpoint: str,
+        page_size: int = 100,
+        params: Optional[Dict] = None
+    ) -> AsyncIterator[Dict]:
+        """Yield the items of a cursor-paginated endpoint, fetching pages lazily."""
+        params = {**(params or {}), "limit": page_size}
+        while True:
+            page = await self._make_request("GET", endpoint, params=params)
+            for item in page["items"]:
+                yield item
+            if not page.get("next_cursor"):
+                return
+            params["cursor"] = page["next_cursor"]
+    
     # Agent endpoints
     async def create_agent(self, agent_data: Dict) -> Dict:
         """Create a new agent."""
@@ -74,11 +189,21 @@ class APIClient:
         """Get agent by ID."""
         return await self._make_request("GET", f"/agents/{agent_id}")
     
-    async def list_agents(self, skip: int = 0, limit: int = 100) -> List[Dict]:
-        """List all agents."""
-        params = {"skip": skip, "limit": limit}
+    async def list_agents(self, limit: int = 100, cursor: Optional[str] = None) -> Dict:
+        """Get one page of agents (``items`` and ``next_cursor``)."""
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
         return await self._make_request("GET", "/agents", params=params)
     
+    def iter_agents(self, page_size: int = 100) -> AsyncIterator[Dict]:
+        """Iterate over all agents, one page request at a time."""
+        return self._iter_pages("/agents", page_size)
+    
+    async def fetch_agents(self, etag: Optional[str] = None) -> Tuple[Optional[List[Dict]], Optional[str]]:
+        """Fetch all agents unless they are unchanged since ``etag``."""
+        return await self._fetch_all("/agents", etag)
+    
     async def update_agent(self, agent_id: str, agent_data: Dict) -> Dict:
         """Update an agent."""
         return await self._make_request("PUT", f"/agents/{agent_id}", data=agent_data)
@@ -87,6 +212,18 @@ class APIClient:
         """Delete an agent."""
         return await self._make_request("DELETE", f"/agents/{agent_id}")
     
+    async def create_agents_bulk(self, agents_data: List[Dict]) -> Dict:
+        """Create several agents in one atomic request."""
+        return await self._make_request("POST", "/agents:batch", data=agents_data)
+    
+    async def update_agents_bulk(self, agent_updates: List[Dict]) -> Dict:
+        """Update several agents (each dict includes its ``id``) in one atomic request."""
+        return await self._make_request("PUT", "/agents:batch", data=agent_updates)
+    
+    async def delete_agents_bulk(self, agent_ids: List[str]) -> Dict:
+        """Delete several agents in one atomic request."""
+        return await self._make_request("POST", "/agents:batchDelete", data={"ids": agent_ids})
+    
     # Tool endpoints
     async def create_tool(self, tool_data: Dict) -> Dict:
         """Create a new tool."""
@@ -96,11 +233,21 @@ class APIClient:
         """Get tool by ID."""
         return await self._make_request("GET", f"/tools/{tool_id}")
     
-    async def list_tools(self, skip: int = 0, limit: int = 100) -> List[Dict]:
-        """List all tools."""
-        params = {"skip": skip, "limit": limit}
+    async def list_tools(self, limit: int = 100, cursor: Optional[str] = None) -> Dict:
+        """Get one page of tools (``items`` and ``next_cursor``)."""
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
         return await self._make_request("GET", "/tools", params=params)
     
+    def iter_tools(self, page_size: int = 100) -> AsyncIterator[Dict]:
+        """Iterate over all tools, one page request at a time."""
+        return self._iter_pages("/tools", page_size)
+    
+    async def fetch_tools(self, etag: Optional[str] = None) -> Tuple[Optional[List[Dict]], Optional[str]]:
+        """Fetch all tools unless they are unchanged since ``etag``."""
+        return await self._fetch_all("/tools", etag)
+    
     async def update_tool(self, tool_id: str, tool_data: Dict) -> Dict:
         """Update a tool."""
         return await self._make_request("PUT", f"/tools/{tool_id}", data=tool_data)
@@ -109,19 +256,46 @@ class APIClient:
         """Delete a tool."""
         return await self._make_request("DELETE", f"/tools/{tool_id}")
     
+    async def create_tools_bulk(self, tools_data: List[Dict]) -> Dict:
+        """Create several tools in one atomic request."""
+        return await self._make_request("POST", "/tools:batch", data=tools_data)
+    
+    async def update_tools_bulk(self, tool_updates: List[Dict]) -> Dict:
+        """Update several tools (each dict includes its ``id``) in one atomic request."""
+        return await self._make_request("PUT", "/tools:batch", data=tool_updates)
+    
+    async def delete_tools_bulk(self, tool_ids: List[str]) -> Dict:
+        """Delete several tools in one atomic request."""
+        return await self._make_request("POST", "/tools:batchDelete", data={"ids": tool_ids})
+    
     # Chat endpoints
-    async def send_message(self, message_data: Dict) -> Dict:
-        """Send a chat message."""
-        return await self._make_request("POST", "/chat/message", data=message_data)
+    async def create_session(self, agent_id: str, title: Optional[str] = None) -> Dict:
+        """Start a chat session with an agent."""
+        return await self._make_request("POST", "/chat/sessions", data={"agent_id": agent_id, "title": title})
+    
+    async def send_message(self, session_id: str, content: str) -> Dict:
+        """Send a chat message and get the agent's reply."""
+        data = {"session_id": session_id, "content": content, "role": "user"}
+        return await self._make_request("POST", "/chat/message", data=data)
+    
+    async def get_chat_history(self, session_id: str, limit: int = 100, cursor: Optional[str] = None) -> Dict:
+        """Get one page of a session's messages (``items`` and ``next_cursor``)."""
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        return await self._make_request("GET", f"/chat/sessions/{session_id}/messages", params=params)
     
-    async def get_chat_history(self, skip: int = 0, limit: int = 100) -> List[Dict]:
-        """Get chat history."""
-        params = {"skip": skip, "limit": limit}
-        return await self._make_request("GET", "/chat/history", params=params)
+    async def delete_session(self, session_id: str) -> Dict:
+        """Delete a chat session."""
+        return await self._make_request("DELETE", f"/chat/sessions/{session_id}")
     
-    async def clear_chat_history(self) -> Dict:
-        """Clear chat history."""
-        return await self._make_request("DELETE", "/chat/history")
+    def iter_sessions(self, page_size: int = 100) -> AsyncIterator[Dict]:
+        """Iterate over chat sessions, most recently updated first."""
+        return self._iter_pages("/chat/sessions", page_size)
+    
+    def iter_session_messages(self, session_id: str, page_size: int = 100) -> AsyncIterator[Dict]:
+        """Iterate over a session's messages, oldest first."""
+        return self._iter_pages(f"/chat/sessions/{session_id}/messages", page_size)
     
     # Health check
     async def health_check(self) -> Dict:
@@ -133,10 +307,19 @@ class APIClient:
 @st.cache_resource
 def get_api_client() -> APIClient:
     """Get cached API client instance."""
-    # You can configure these via environment variables or Streamlit secrets
-    # base_url = st.secrets.get("API_BASE_URL", "http://localhost:8000")
-    base_url = "http://localhost:8000"
-    # api_key = st.secrets.get("API_KEY", None)
-    api_key = None
-    
-    return APIClient(base_url=base_url, api_key=api_key)
\ No newline at end of file
+    config = get_config()
+    client = APIClient(
+        base_url=config.api_base_url,
+        api_key=config.api_key,
+        timeout=httpx.Timeout(config.api_timeout_seconds, connect=config.api_connect_timeout_seconds),
+        limits=httpx.Limits(
+            max_connections=config.api_max_connections,
+            max_keepalive_connections=config.api_max_keepalive_connections,
+            keepalive_expiry=config.api_keepalive_expiry_seconds
+        ),
+        http2=config.api_http2,
+        cache_ttl_seconds=config.data_cache_ttl_seconds
+    )
+    # Requests run on the shared runner's loop; close its pooled client with it
+    get_async_runner().add_cleanup(client.aclose)
+    return client
\ No newline at end of file
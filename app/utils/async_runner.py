@@ -0,0 +1,66 @@
+"""Persistent event loop for running API calls from Streamlit scripts."""
+
+import asyncio
+import atexit
+import threading
+from typing import Any, Awaitable, Callable, List, Optional
+
+import streamlit as st
+
+
+class AsyncRunner:
+    """Event loop running forever in a daemon thread.
+    
+    Streamlit scripts are synchronous and rerun on every interaction, so
+    calling ``asyncio.run`` per API call creates and tears down a loop (and
+    with it every pooled HTTP connection) each time. Submitting coroutines
+    to one long-lived loop keeps connections warm across reruns and lets
+    several calls run concurrently.
+    """
+    
+    def __init__(self):
+        """Start the loop thread."""
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self.loop.run_forever,
+            name="streamlit-async-runner",
+            daemon=True
+        )
+        self._thread.start()
+        self._cleanups: List[Callable[[], Awaitable[Any]]] = []
+    
+    def run(self, coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """Run a coroutine on the loop and wait for its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+    
+    def gather(self, *coros: Awaitable[Any], timeout: Optional[float] = None) -> List[Any]:
+        """Run coroutines concurrently; failed calls return their exception."""
+        
+        async def gather_all():
+            return await asyncio.gather(*coros, return_exceptions=True)
+        
+        return self.run(gather_all(), timeout)
+    
+    def add_cleanup(self, cleanup: Callable[[], Awaitable[Any]]) -> None:
+        """Run ``cleanup()`` on the loop when the runner closes, e.g. to close HTTP clients."""
+        self._cleanups.append(cleanup)
+    
+    def close(self, timeout: float = 5.0) -> None:
+        """Run the cleanups, stop the loop and wait for its thread to exit."""
+        if self.loop.is_closed():
+            return
+        
+        cleanups, self._cleanups = self._cleanups, []
+        self.gather(*(cleanup() for cleanup in cleanups), timeout=timeout)
+        
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+
+@st.cache_resource
+def get_async_runner() -> AsyncRunner:
+    """Get the event loop runner shared by all sessions and reruns."""
+    runner = AsyncRunner()
+    atexit.register(runner.close)
+    return runner
\ No newline at end of file
@@ -15,6 +15,17 @@ class StreamlitConfig:
         self.debug = self._get_config_value("DEBUG", "false").lower() == "true"
         self.page_title = self._get_config_value("PAGE_TITLE", "AI Agent Management")
         self.page_icon = self._get_config_value("PAGE_ICON", "🤖")
+        
+        # HTTP client pool used for backend calls
+        self.api_http2 = str(self._get_config_value("API_HTTP2", "false")).lower() == "true"
+        self.api_timeout_seconds = float(self._get_config_value("API_TIMEOUT_SECONDS", "30"))
+        self.api_connect_timeout_seconds = float(self._get_config_value("API_CONNECT_TIMEOUT_SECONDS", "5"))
+        self.api_max_connections = int(self._get_config_value("API_MAX_CONNECTIONS", "20"))
+        self.api_max_keepalive_connections = int(self._get_config_value("API_MAX_KEEPALIVE_CONNECTIONS", "10"))
+        self.api_keepalive_expiry_seconds = float(self._get_config_value("API_KEEPALIVE_EXPIRY_SECONDS", "30"))
+        
+        # Seconds agent/tool lists are served from cache before revalidating
+        self.data_cache_ttl_seconds = float(self._get_config_value("DATA_CACHE_TTL_SECONDS", "30"))
     
     def _get_config_value(self, key: str, default: Optional[str] = None) -> Optional[str]:
         """Get configuration value from various sources."""
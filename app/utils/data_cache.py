@@ -0,0 +1,86 @@
+"""Stale-while-revalidate cache for data fetched from the backend."""
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+# Fetches a value given the cached ETag; returns (None, etag) when unchanged
+Fetcher = Callable[[Optional[str]], Awaitable[Tuple[Optional[Any], Optional[str]]]]
+
+
+@dataclass
+class CacheEntry:
+    """Cached value with its validator."""
+    
+    value: Any
+    etag: Optional[str]
+    fetched_at: float
+    invalidated: bool = False
+
+
+class StaleWhileRevalidateCache:
+    """Per-key cache that serves stale data while refreshing in the background.
+    
+    Within ``ttl_seconds`` of a fetch the cached value is returned as is.
+    After that it is still returned immediately, and a background task
+    revalidates it with the stored ETag, so a rerun never waits on the
+    backend for data it already has. Invalidated or missing keys are
+    fetched before returning, so a user sees their own changes at once.
+    """
+    
+    def __init__(self, ttl_seconds: float = 30.0):
+        """Initialize cache."""
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, CacheEntry] = {}
+        self._generations: Dict[str, int] = {}
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self._lock = threading.Lock()
+    
+    async def get(self, key: str, fetch: Fetcher) -> Any:
+        """Get a value, fetching or revalidating it as needed."""
+        with self._lock:
+            entry = self._entries.get(key)
+        
+        if entry is None or entry.invalidated:
+            return await self._revalidate(key, fetch, entry)
+        
+        if time.monotonic() - entry.fetched_at >= self.ttl_seconds:
+            task = self._refreshing.get(key)
+            if task is None or task.done():
+                self._refreshing[key] = asyncio.create_task(self._refresh(key, fetch, entry))
+        
+        return entry.value
+    
+    def invalidate(self, key: str) -> None:
+        """Force the next ``get`` to fetch fresh data; in-flight results are discarded."""
+        with self._lock:
+            self._generations[key] = self._generations.get(key, 0) + 1
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.invalidated = True
+    
+    async def _refresh(self, key: str, fetch: Fetcher, entry: CacheEntry) -> None:
+        """Revalidate in the background, keeping the stale value on errors."""
+        try:
+            await self._revalidate(key, fetch, entry)
+        except Exception:
+            pass  # Stale data keeps being served; the next get retries
+    
+    async def _revalidate(self, key: str, fetch: Fetcher, entry: Optional[CacheEntry]) -> Any:
+        """Fetch a value, sending the cached ETag when the cached value is usable."""
+        with self._lock:
+            generation = self._generations.get(key, 0)
+        
+        usable = entry is not None and not entry.invalidated
+        value, etag = await fetch(entry.etag if usable else None)
+        if value is None and usable:
+            value, etag = entry.value, entry.etag  # 304 Not Modified
+        
+        with self._lock:
+            # Drop results fetched before an invalidation
+            if self._generations.get(key, 0) == generation:
+                self._entries[key] = CacheEntry(value, etag, time.monotonic())
+        
+        return value
\ No newline at end of file
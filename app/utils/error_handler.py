@@ -1,10 +1,11 @@
 """Error handling utilities for Streamlit app."""
 
 import streamlit as st
-from typing import Callable, Any
-import asyncio
+from typing import Callable, Any, List, Tuple
 import functools
 
+from app.utils.async_runner import get_async_runner
+
 
 def handle_api_errors(func: Callable) -> Callable:
     """Decorator to handle API errors gracefully for async functions."""
@@ -64,30 +65,52 @@ def handle_sync_api_errors(func: Callable) -> Callable:
     return wrapper
 
 
+def show_api_error(error_message: str):
+    """Show a user-friendly message for an API call error."""
+    if "Connection Error" in error_message:
+        st.error("🔌 **Connection Error**: Unable to connect to the API server. Please check if the backend is running.")
+    elif "API Error (401)" in error_message:
+        st.error("🔐 **Authentication Error**: Invalid or missing API credentials.")
+    elif "API Error (404)" in error_message:
+        st.error("🔍 **Not Found**: The requested resource was not found.")
+    elif "API Error (400)" in error_message:
+        st.error(f"⚠️ **Validation Error**: {error_message}")
+    elif "API Error (500)" in error_message:
+        st.error("🚨 **Server Error**: Internal server error occurred. Please try again later.")
+    else:
+        st.error(f"❌ **Error**: {error_message}")
+
+
 def safe_async_call(async_func, *args, **kwargs):
     """Safely call an async function and handle errors."""
     try:
-        return asyncio.run(async_func(*args, **kwargs))
+        return get_async_runner().run(async_func(*args, **kwargs))
     except Exception as e:
-        error_message = str(e)
-        
-        # Parse different types of errors
-        if "Connection Error" in error_message:
-            st.error("🔌 **Connection Error**: Unable to connect to the API server. Please check if the backend is running.")
-        elif "API Error (401)" in error_message:
-            st.error("🔐 **Authentication Error**: Invalid or missing API credentials.")
-        elif "API Error (404)" in error_message:
-            st.error("🔍 **Not Found**: The requested resource was not found.")
-        elif "API Error (400)" in error_message:
-            st.error(f"⚠️ **Validation Error**: {error_message}")
-        elif "API Error (500)" in error_message:
-            st.error("🚨 **Server Error**: Internal server error occurred. Please try again later.")
-        else:
-            st.error(f"❌ **Error**: {error_message}")
-        
+        show_api_error(str(e))
         return None
 
 
+def safe_async_gather(*calls: Tuple) -> List[Any]:
+    """Run several ``(async_func, *args)`` calls concurrently and handle errors.
+    
+    Returns one result per call, in order, with None for calls that failed.
+    Each kind of error (e.g. "Connection Error") is shown once, so an
+    unreachable backend does not produce one message per call.
+    """
+    results = get_async_runner().gather(*(func(*args) for func, *args in calls))
+    
+    shown = set()
+    for result in results:
+        if not isinstance(result, Exception):
+            continue
+        error_kind = str(result).split(":", 1)[0]
+        if error_kind not in shown:
+            shown.add(error_kind)
+            show_api_error(str(result))
+    
+    return [None if isinstance(result, Exception) else result for result in results]
+
+
 def show_loading_spinner(message: str = "Loading..."):
     """Show loading spinner with message."""
     return st.spinner(message)
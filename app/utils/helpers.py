@@ -6,6 +6,8 @@ from datetime import datetime, timedelta
 from typing import Any, Dict, Optional
 from uuid import UUID
 
+from app.services.token_counter import get_token_counter
+
 
 def generate_api_key() -> str:
     """Generate a secure API key."""
@@ -49,9 +51,8 @@ def format_response(
 
 
 def calculate_token_estimate(text: str) -> int:
-    """Rough estimate of token count for text."""
-    # Very rough estimate: ~4 characters per token
-    return len(text) // 4
+    """Count the tokens of a text with the shared token counter."""
+    return get_token_counter().count(text)
 
 
 def truncate_text(text: str, max_length: int = 1000) -> str:
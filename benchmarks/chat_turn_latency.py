@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark chat turn latency against the total number of stored messages.
+
+Fills the in-memory message log with filler sessions until the global message count
+reaches each target size, then times ``ChatService.send_message`` for a
+single session. The LLM call is replaced by an instant coroutine so only
+service and storage overhead is measured; latency should stay flat as the
+global count grows.
+
+Usage:
+    python benchmarks/chat_turn_latency.py [--sizes 1000 100000 1000000] [--turns 200]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.models.agent import AgentCreate
+from app.models.chat import ChatMessage, ChatMessageCreate, ChatSessionCreate, MessageRole
+from app.services.chat_service import ChatService
+from app.storage.memory import MemoryStorageBackend
+
+USER_ID = "bench_user"
+MESSAGES_PER_FILLER_SESSION = 50
+
+
+async def instant_response(agent, message, chat_history=None, summary=None):
+    """Stand-in for the provider call."""
+    return {"content": "ok", "response_time_ms": 0, "token_count": 1, "model": agent.model_name}
+
+
+async def instant_validation(agent):
+    """Stand-in for live agent validation."""
+    return True
+
+
+async def fill_messages(chat_service: ChatService, target: int) -> None:
+    """Append filler messages from other sessions until the log holds ``target``."""
+    log = chat_service._messages_storage
+    session_id = uuid4()
+    while len(log) < target:
+        if await log.count(session_id) >= MESSAGES_PER_FILLER_SESSION:
+            session_id = uuid4()
+        # construct() skips validation so filling millions of rows stays fast
+        await log.append(ChatMessage.construct(
+            id=uuid4(),
+            session_id=session_id,
+            user_id="filler",
+            content="filler",
+            role=MessageRole.USER
+        ))
+
+
+async def time_turns(chat_service: ChatService, session_id, turns: int) -> list:
+    """Time ``turns`` consecutive send_message calls in microseconds."""
+    timings = []
+    for i in range(turns):
+        message = ChatMessageCreate(content=f"turn {i}", role=MessageRole.USER, session_id=session_id)
+        start = time.perf_counter()
+        await chat_service.send_message(message, USER_ID)
+        timings.append((time.perf_counter() - start) * 1_000_000)
+    return timings
+
+
+async def run(sizes: list, turns: int) -> None:
+    """Run the benchmark for each global message count."""
+    chat_service = ChatService(storage=MemoryStorageBackend())
+    chat_service.llm_service.generate_response = instant_response
+    chat_service.agent_service.llm_service.validate_agent_config = instant_validation
+    
+    agent = await chat_service.agent_service.create_agent(
+        AgentCreate(name="Bench", system_prompt="You are a benchmark."),
+        USER_ID
+    )
+    
+    print(f"{'global messages':>16} {'p50 (us)':>10} {'p95 (us)':>10} {'max (us)':>10}")
+    for size in sorted(sizes):
+        await fill_messages(chat_service, size)
+        session = await chat_service.create_session(ChatSessionCreate(agent_id=agent.id), USER_ID)
+        timings = sorted(await time_turns(chat_service, session.id, turns))
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        print(f"{len(chat_service._messages_storage):>16,} {statistics.median(timings):>10.1f} {p95:>10.1f} {timings[-1]:>10.1f}")
+
+
+def main():
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--turns", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args.sizes, args.turns))
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
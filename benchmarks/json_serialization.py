@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark JSON serialization of large list responses.
+
+Builds a page of ``--items`` agents, tools and chat messages and times two
+ways of turning it into a response body: FastAPI's default path (validate
+against the response model, ``jsonable_encoder``, stdlib ``json``) and the
+direct path used by list endpoints (``model_response``, orjson when
+installed).
+
+Usage:
+    python benchmarks/json_serialization.py [--items 10000] [--rounds 10]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.core import responses
+from app.core.responses import model_response
+from app.models.agent import Agent
+from app.models.chat import ChatMessage, MessageRole
+from app.models.common import CursorPage
+from app.models.tool import Tool
+
+USER_ID = "bench_user"
+
+
+def make_pages(items: int) -> dict:
+    """One page of ``items`` entities per model."""
+    session_id = uuid4()
+    return {
+        "Agent": CursorPage[Agent](items=[
+            Agent(name=f"Agent {i}", system_prompt="You are a benchmark.", user_id=USER_ID, tools=["search"])
+            for i in range(items)
+        ]),
+        "Tool": CursorPage[Tool](items=[
+            Tool(name=f"tool_{i}", tool_type="api", user_id=USER_ID, configuration={"timeout": 30})
+            for i in range(items)
+        ]),
+        "ChatMessage": CursorPage[ChatMessage](items=[
+            ChatMessage(content=f"message {i}", role=MessageRole.USER, session_id=session_id, user_id=USER_ID)
+            for i in range(items)
+        ]),
+    }
+
+
+async def default_path(page: CursorPage) -> bytes:
+    """Serialize a page the way FastAPI does for a returned model."""
+    field = create_response_field(name="response", type_=type(page))
+    content = await serialize_response(field=field, response_content=page)
+    return JSONResponse(content).body
+
+
+async def direct_path(page: CursorPage) -> bytes:
+    """Serialize a page the way list endpoints do."""
+    return model_response(page).body
+
+
+async def time_path(path, page: CursorPage, rounds: int) -> float:
+    """Median time of ``rounds`` serializations in milliseconds."""
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        await path(page)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+async def run(items: int, rounds: int) -> None:
+    """Run the benchmark for each model."""
+    library = "orjson" if responses.orjson is not None else "json (orjson not installed)"
+    print(f"{items:,} items per page, direct path using {library}")
+    print(f"{'model':>12} {'default (ms)':>13} {'direct (ms)':>12} {'speedup':>8} {'body (KB)':>10}")
+    for name, page in make_pages(items).items():
+        default_ms = await time_path(default_path, page, rounds)
+        direct_ms = await time_path(direct_path, page, rounds)
+        size_kb = len(await direct_path(page)) / 1024
+        print(f"{name:>12} {default_ms:>13.1f} {direct_ms:>12.1f} {default_ms / direct_ms:>7.1f}x {size_kb:>10,.0f}")
+
+
+def main():
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=10_000)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(run(args.items, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -2,12 +2,14 @@
 """
 Simple launcher for the AI Agent Management Platform.
 Starts both FastAPI backend and Streamlit frontend.
+
+Set SERVER_MODE=production to run several uvicorn workers without the
+reloader; see the server settings in app/core/config.py.
 """
 
 import subprocess
 import sys
 import time
-import threading
 import os
 from pathlib import Path
 
@@ -33,43 +35,96 @@ def check_requirements():
         return False
 
 
-def run_fastapi():
-    """Run FastAPI backend server."""
-    print("🚀 Starting FastAPI backend...")
-    try:
-        subprocess.run([
-            sys.executable, "-m", "uvicorn", 
-            "app.main:app", 
-            "--host", "0.0.0.0", 
-            "--port", "8000", 
-            "--reload"
-        ], check=True)
-    except KeyboardInterrupt:
-        print("\n⏹️ FastAPI server stopped")
-    except Exception as e:
-        print(f"❌ Error running FastAPI: {e}")
+def worker_count(settings):
+    """Number of backend worker processes for the configured mode."""
+    if settings.SERVER_MODE != "production":
+        return 1
+    
+    # In-memory storage is private to each worker, so only shared storage
+    # such as SQLite can back more than one process
+    if settings.STORAGE_BACKEND == "memory":
+        print("⚠️  Warning: STORAGE_BACKEND=memory is per-process; running a single worker.")
+        return 1
+    
+    return settings.SERVER_WORKERS or os.cpu_count() or 1
+
+
+def fastapi_command(settings, workers):
+    """Build the uvicorn command line for the configured mode and worker count."""
+    command = [
+        sys.executable, "-m", "uvicorn", 
+        "app.main:app", 
+        "--host", settings.HOST, 
+        "--port", str(settings.PORT), 
+    ]
+    if settings.SERVER_MODE != "production":
+        return command + ["--reload"]
+    
+    # On SIGTERM uvicorn stops accepting connections and waits for open
+    # ones (including streaming chats) up to the graceful shutdown timeout
+    return command + [
+        "--workers", str(workers),
+        "--loop", "uvloop",
+        "--http", "httptools",
+        "--timeout-graceful-shutdown", str(settings.SERVER_GRACEFUL_SHUTDOWN_SECONDS),
+        "--proxy-headers",
+    ]
+
 
+def run_fastapi(settings):
+    """Start the FastAPI backend server."""
+    workers = worker_count(settings)
+    print(f"🚀 Starting FastAPI backend ({settings.SERVER_MODE} mode, {workers} worker(s))...")
+    return subprocess.Popen(fastapi_command(settings, workers))
 
-def run_streamlit():
-    """Run Streamlit frontend."""
+
+def wait_until_ready(settings, process):
+    """Wait for the backend health check to answer, or for the backend to exit."""
+    import httpx
+    
+    url = f"http://127.0.0.1:{settings.PORT}/health"
+    deadline = time.monotonic() + settings.SERVER_READY_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            return False
+        try:
+            if httpx.get(url, timeout=1).status_code == 200:
+                return True
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    return False
+
+
+def run_streamlit(settings):
+    """Start the Streamlit frontend."""
     print("🎨 Starting Streamlit frontend...")
-    time.sleep(3)  # Wait for FastAPI to start
     
     # Set up environment
     env = os.environ.copy()
     env['PYTHONPATH'] = str(Path.cwd())
     
+    command = [
+        sys.executable, "-m", "streamlit", "run", 
+        "app/streamlit_app.py",
+        "--server.port", str(settings.FRONTEND_PORT),
+        "--server.address", settings.HOST
+    ]
+    if settings.SERVER_MODE == "production":
+        command += ["--server.headless", "true"]
+    return subprocess.Popen(command, env=env)
+
+
+def stop(process, timeout):
+    """Ask a server to shut down gracefully, killing it after the timeout."""
+    if process.poll() is not None:
+        return
+    process.terminate()
     try:
-        subprocess.run([
-            sys.executable, "-m", "streamlit", "run", 
-            "app/streamlit_app.py",
-            "--server.port", "8501",
-            "--server.address", "0.0.0.0"
-        ], env=env, check=True)
-    except KeyboardInterrupt:
-        print("\n⏹️ Streamlit server stopped")
-    except Exception as e:
-        print(f"❌ Error running Streamlit: {e}")
+        process.wait(timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
 
 
 def main():
@@ -82,26 +137,37 @@ def main():
         print("❌ Requirements check failed. Please install dependencies first.")
         return 1
     
+    from app.core.config import settings
+    
     print("🚀 Starting both FastAPI backend and Streamlit frontend...")
-    print("📍 FastAPI will be available at: http://localhost:8000")
-    print("📍 Streamlit will be available at: http://localhost:8501")
+    print(f"📍 FastAPI will be available at: http://localhost:{settings.PORT}")
+    print(f"📍 Streamlit will be available at: http://localhost:{settings.FRONTEND_PORT}")
     print("=" * 50)
     
-    # Start both servers in separate threads
-    fastapi_thread = threading.Thread(target=run_fastapi, daemon=True)
-    streamlit_thread = threading.Thread(target=run_streamlit, daemon=True)
+    # Start the frontend only once the backend answers its health check
+    fastapi_process = run_fastapi(settings)
+    streamlit_process = None
     
     try:
-        fastapi_thread.start()
-        streamlit_thread.start()
+        if not wait_until_ready(settings, fastapi_process):
+            print("❌ FastAPI backend did not become ready")
+            return 1
+        print("✅ FastAPI backend is ready")
+        streamlit_process = run_streamlit(settings)
         
-        # Keep main thread alive
-        while True:
+        # Keep running until either server exits
+        while fastapi_process.poll() is None and streamlit_process.poll() is None:
             time.sleep(1)
-            
+        return 1
+    
     except KeyboardInterrupt:
         print("\n🛑 Shutting down servers...")
         return 0
+    finally:
+        # Give the backend time to drain in-flight requests before killing it
+        if streamlit_process is not None:
+            stop(streamlit_process, 10)
+        stop(fastapi_process, settings.SERVER_GRACEFUL_SHUTDOWN_SECONDS + 5)
 
 
 if __name__ == "__main__":
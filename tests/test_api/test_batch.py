@@ -0,0 +1,90 @@
+"""Test batch agent and tool endpoints."""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.dependencies import get_agent_service, get_tool_service
+from app.main import app
+from app.services.agent_service import AgentService
+from app.services.llm_pool import LLMClientPool
+from app.services.tool_service import ToolService
+from app.storage.memory import MemoryStorageBackend
+
+
+class FakeClient:
+    """Client answering every prompt."""
+    
+    def __init__(self, **options):
+        self.options = options
+    
+    async def ainvoke(self, messages):
+        return type("Response", (), {"content": "ok"})()
+
+
+@pytest.fixture
+def storage():
+    """Isolated storage shared by the overridden services."""
+    storage = MemoryStorageBackend()
+    agent_service = AgentService(storage=storage)
+    agent_service.llm_service.client_pool = LLMClientPool(api_key="test", client_factory=FakeClient)
+    tool_service = ToolService(storage=storage)
+    
+    app.dependency_overrides[get_agent_service] = lambda: agent_service
+    app.dependency_overrides[get_tool_service] = lambda: tool_service
+    yield storage
+    app.dependency_overrides.pop(get_agent_service, None)
+    app.dependency_overrides.pop(get_tool_service, None)
+
+
+def test_batch_create_agents(storage):
+    """Test a valid batch creates every agent with per-item results."""
+    client = TestClient(app)
+    response = client.post("/api/v1/agents:batch", json=[
+        {"name": "a", "system_prompt": "Be brief."},
+        {"name": "b", "system_prompt": "Be kind."},
+    ])
+    assert response.status_code == 201
+    
+    results = response.json()["results"]
+    assert [r["index"] for r in results] == [0, 1]
+    assert all(r["success"] and r["id"] for r in results)
+    assert asyncio.run(storage.agents.count_for_user("default_user")) == 2
+
+
+def test_batch_create_agents_is_atomic(storage):
+    """Test one invalid item rejects the whole batch."""
+    client = TestClient(app)
+    response = client.post("/api/v1/agents:batch", json=[
+        {"name": "ok", "system_prompt": "Be brief."},
+        {"name": "bad", "system_prompt": "Be brief.", "model_name": "unknown-model"},
+    ])
+    assert response.status_code == 400
+    
+    results = response.json()["detail"]["results"]
+    assert [r["success"] for r in results] == [True, False]
+    assert asyncio.run(storage.agents.count_for_user("default_user")) == 0
+
+
+def test_batch_update_and_delete_tools(storage):
+    """Test tools can be updated and deleted in bulk."""
+    client = TestClient(app)
+    created = client.post("/api/v1/tools:batch", json=[
+        {"name": f"t{i}", "tool_type": "Calculator"} for i in range(3)
+    ]).json()["results"]
+    ids = [r["id"] for r in created]
+    
+    response = client.put("/api/v1/tools:batch", json=[
+        {"id": tool_id, "description": "updated"} for tool_id in ids
+    ])
+    assert response.status_code == 200
+    assert client.get(f"/api/v1/tools/{ids[0]}").json()["description"] == "updated"
+    
+    response = client.post("/api/v1/tools:batchDelete", json={"ids": ids[:2] + [ids[0]]})
+    assert response.status_code == 400
+    assert client.get(f"/api/v1/tools/{ids[0]}").json()["is_active"] is True
+    
+    response = client.post("/api/v1/tools:batchDelete", json={"ids": ids[:2]})
+    assert response.status_code == 200
+    assert [t["name"] for t in client.get("/api/v1/tools").json()["items"] if t["id"] in ids] == ["t2"]
\ No newline at end of file
@@ -0,0 +1,108 @@
+"""Test streaming chat endpoints."""
+
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.dependencies import get_chat_service
+from app.main import app
+from app.models.agent import AgentCreate
+from app.services.chat_service import ChatService
+from app.services.llm_pool import LLMClientPool
+from app.storage.memory import MemoryStorageBackend
+
+
+class FakeStreamingClient:
+    """Client streaming a fixed reply word by word."""
+    
+    def __init__(self, **options):
+        self.options = options
+    
+    async def ainvoke(self, messages):
+        return type("Response", (), {"content": "Hello there"})()
+    
+    async def astream(self, messages):
+        for word in ("Hello", " there", "!"):
+            yield type("Chunk", (), {"content": word})()
+
+
+@pytest.fixture
+def chat_service():
+    """Chat service with isolated storage and a fake LLM client."""
+    service = ChatService(storage=MemoryStorageBackend())
+    pool = LLMClientPool(api_key="test", client_factory=FakeStreamingClient)
+    service.llm_service.client_pool = pool
+    service.agent_service.llm_service.client_pool = pool
+    
+    app.dependency_overrides[get_chat_service] = lambda: service
+    yield service
+    app.dependency_overrides.pop(get_chat_service, None)
+
+
+@pytest.fixture
+def session_id(chat_service):
+    """ID of a session with a freshly created agent."""
+    agent = asyncio.run(chat_service.agent_service.create_agent(
+        AgentCreate(name="Streamer", system_prompt="Be brief."),
+        "default_user"
+    ))
+    client = TestClient(app)
+    response = client.post("/api/v1/chat/sessions", json={"agent_id": str(agent.id)})
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def parse_sse(body: str):
+    """Parse an SSE body into (event, data) pairs."""
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_stream_message_sse(chat_service, session_id):
+    """Test SSE stream yields tokens then the stored message."""
+    client = TestClient(app)
+    response = client.post(
+        "/api/v1/chat/stream",
+        json={"session_id": session_id, "content": "Hi", "role": "user"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    
+    events = parse_sse(response.text)
+    assert [data["content"] for name, data in events if name == "token"] == ["Hello", " there", "!"]
+    
+    name, data = events[-1]
+    assert name == "done"
+    assert data["message"]["content"] == "Hello there!"
+    assert data["message"]["time_to_first_token_ms"] is not None
+    
+    history = asyncio.run(chat_service.get_chat_history(session_id, "default_user"))
+    assert [m.content for m in history.items] == ["Hi", "Hello there!"]
+
+
+def test_stream_message_unknown_session(chat_service):
+    """Test streaming to an unknown session fails before streaming starts."""
+    client = TestClient(app)
+    response = client.post(
+        "/api/v1/chat/stream",
+        json={"session_id": "00000000-0000-0000-0000-000000000000", "content": "Hi", "role": "user"}
+    )
+    assert response.status_code == 404
+
+
+def test_chat_websocket(chat_service, session_id):
+    """Test WebSocket turns stream events as JSON frames."""
+    client = TestClient(app)
+    with client.websocket_connect("/api/v1/chat/ws") as websocket:
+        websocket.send_json({"session_id": session_id, "content": "Hi"})
+        frames = []
+        while not frames or frames[-1]["event"] not in ("done", "error"):
+            frames.append(websocket.receive_json())
+    
+    assert frames[-1]["event"] == "done"
+    assert "".join(f["content"] for f in frames[:-1]) == "Hello there!"
\ No newline at end of file
@@ -0,0 +1,56 @@
+"""Test the application service container."""
+
+from fastapi.testclient import TestClient
+
+from app.core.container import ServiceContainer
+from app.core.dependencies import get_container
+from app.main import app
+from app.services.llm_pool import LLMClientPool
+from app.services.llm_service import LLMService
+from app.storage.memory import MemoryStorageBackend
+
+
+class FakeClient:
+    """Client echoing the last prompt message."""
+    
+    def __init__(self, **options):
+        self.options = options
+    
+    async def ainvoke(self, messages):
+        return type("Response", (), {"content": f"echo: {messages[-1].content}"})()
+
+
+def test_lifespan_builds_one_shared_container():
+    """Test every service shares the container's storage and LLM service."""
+    with TestClient(app):
+        container = app.state.container
+        
+        assert container.agent_service.llm_service is container.llm_service
+        assert container.chat_service.llm_service is container.llm_service
+        assert container.chat_service.agent_service is container.agent_service
+        assert container.tool_service.storage is container.storage
+
+
+def test_chat_message_goes_through_services():
+    """Test the chat endpoints use the container's services."""
+    llm_service = LLMService(client_pool=LLMClientPool(api_key="test", client_factory=FakeClient))
+    container = ServiceContainer(storage=MemoryStorageBackend(), llm_service=llm_service)
+    app.dependency_overrides[get_container] = lambda: container
+    try:
+        client = TestClient(app)
+        agent = client.post("/api/v1/agents", json={"name": "a", "system_prompt": "Be brief."}).json()
+        session = client.post("/api/v1/chat/sessions", json={"agent_id": agent["id"]}).json()
+        
+        response = client.post(
+            "/api/v1/chat/message",
+            json={"session_id": session["id"], "content": "hi", "role": "user"}
+        )
+        assert response.status_code == 201
+        assert response.json()["content"] == "echo: hi"
+        
+        history = client.get(f"/api/v1/chat/sessions/{session['id']}/messages").json()
+        assert [m["content"] for m in history["items"]] == ["hi", "echo: hi"]
+        
+        assert client.delete(f"/api/v1/chat/sessions/{session['id']}").status_code == 204
+    finally:
+        app.dependency_overrides.pop(get_container, None)
\ No newline at end of file
@@ -0,0 +1,54 @@
+"""Test conditional GET on list endpoints."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.dependencies import get_agent_service, get_chat_service
+from app.main import app
+from app.services.agent_service import AgentService
+from app.services.chat_service import ChatService
+from app.storage.memory import MemoryStorageBackend
+
+
+@pytest.fixture
+def client():
+    """Test client with services on isolated storage."""
+    storage = MemoryStorageBackend()
+    app.dependency_overrides[get_agent_service] = lambda: AgentService(storage=storage)
+    app.dependency_overrides[get_chat_service] = lambda: ChatService(storage=storage)
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_agent_service, None)
+    app.dependency_overrides.pop(get_chat_service, None)
+
+
+def test_agents_etag_revalidation(client):
+    """Test unchanged lists return 304 and writes change the ETag."""
+    response = client.get("/api/v1/agents")
+    etag = response.headers["etag"]
+    assert response.status_code == 200
+    
+    response = client.get("/api/v1/agents", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+    
+    assert client.get("/api/v1/agents?limit=5", headers={"If-None-Match": etag}).status_code == 200
+    
+    client.post("/api/v1/agents", json={"name": "a", "system_prompt": "Be brief."})
+    response = client.get("/api/v1/agents", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert len(response.json()["items"]) == 1
+
+
+def test_session_history_etag(client):
+    """Test history ETags follow appended messages and unknown sessions 404."""
+    agent = client.post("/api/v1/agents", json={"name": "a", "system_prompt": "Be brief."}).json()
+    session = client.post("/api/v1/chat/sessions", json={"agent_id": agent["id"]}).json()
+    url = f"/api/v1/chat/sessions/{session['id']}/messages"
+    
+    etag = client.get(url).headers["etag"]
+    assert client.get(url, headers={"If-None-Match": f'W/{etag}, "other"'}).status_code == 304
+    
+    unknown = "/api/v1/chat/sessions/00000000-0000-0000-0000-000000000000/messages"
+    assert client.get(unknown, headers={"If-None-Match": "*"}).status_code == 404
\ No newline at end of file
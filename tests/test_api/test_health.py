@@ -27,9 +27,12 @@ def test_api_health_check():
 
 
 def test_detailed_health_check():
-    """Test detailed health check endpoint."""
-    response = client.get("/api/v1/health/detailed")
+    """Test detailed health check serves the startup probe report."""
+    with TestClient(app) as client:
+        response = client.get("/api/v1/health/detailed")
     assert response.status_code == 200
     data = response.json()
-    assert data["status"] == "healthy"
-    assert "components" in data
\ No newline at end of file
+    # Without an API key the LLM provider is reported as degraded
+    assert data["status"] in ("healthy", "degraded")
+    assert data["components"]["storage"]["status"] == "healthy"
+    assert set(data["components"]) == {"storage", "llm_provider", "cache", "event_loop"}
\ No newline at end of file
@@ -0,0 +1,44 @@
+"""Test the metrics endpoint."""
+
+from fastapi.testclient import TestClient
+
+from app.core.metrics import Counter, Histogram
+from app.main import app
+
+
+def test_histogram_exposition():
+    """Test histograms render cumulative buckets, sum and count."""
+    histogram = Histogram("latency_seconds", "Latency.", ["route"], buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        histogram.observe(value, "/a")
+    counter = Counter("errors_total", "Errors.", ["message"])
+    counter.inc("say \"hi\"")
+    
+    assert histogram.render() == [
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{route="/a",le="0.1"} 1',
+        'latency_seconds_bucket{route="/a",le="1"} 3',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 4',
+        'latency_seconds_sum{route="/a"} 4.25',
+        'latency_seconds_count{route="/a"} 4',
+    ]
+    assert counter.render()[-1] == 'errors_total{message="say \\"hi\\""} 1'
+
+
+def test_metrics_endpoint_reports_routes_storage_and_caches():
+    """Test requests are labelled by route template and services are scraped."""
+    with TestClient(app) as client:
+        client.get("/api/v1/agents")
+        client.get("/api/v1/agents/00000000-0000-0000-0000-000000000000")
+        
+        response = client.get("/metrics")
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/v1/agents",status="200"}' in body
+    assert 'route="/api/v1/agents/{agent_id}",status="404"}' in body
+    assert 'storage_operation_duration_seconds_count{repository="agents",operation="list_for_user"}' in body
+    assert 'cache_hit_ratio{cache="token_count"}' in body
+    assert "http_requests_in_flight 1" in body
\ No newline at end of file
@@ -0,0 +1,108 @@
+"""Test rate-limited chat endpoints."""
+
+import asyncio
+
+import pytest
+
+from fastapi.testclient import TestClient
+
+from app.core.dependencies import get_chat_service
+from app.main import app
+from app.models.agent import AgentCreate
+from app.api.v1.endpoints.chat import ChatStreamResponse
+from app.models.chat import ChatMessageCreate, ChatSessionCreate, MessageRole
+from app.services.chat_service import ChatService
+from app.services.llm_pool import LLMClientPool
+from app.services.llm_service import LLMService
+from app.services.rate_limiter import RateLimiter
+from app.storage.memory import MemoryStorageBackend
+
+
+class FakeClient:
+    """Client answering every prompt the same way."""
+    
+    def __init__(self, **options):
+        self.options = options
+    
+    async def ainvoke(self, messages):
+        return type("Response", (), {"content": "ok"})()
+
+
+def make_service(rate_limiter):
+    """Chat service with a fake LLM and one session for the default user."""
+    llm_service = LLMService(client_pool=LLMClientPool(api_key="test", client_factory=FakeClient))
+    service = ChatService(storage=MemoryStorageBackend(), llm_service=llm_service, rate_limiter=rate_limiter)
+    agent = asyncio.run(service.agent_service.create_agent(
+        AgentCreate(name="a", system_prompt="Be brief."),
+        "default_user"
+    ))
+    session = asyncio.run(service.create_session(ChatSessionCreate(agent_id=agent.id), "default_user"))
+    return service, session
+
+
+def test_send_message_returns_429_with_retry_after():
+    """Test a user over their rate gets 429 and no message is stored."""
+    service, session = make_service(RateLimiter(rates={"user": (2, 1)}))
+    
+    app.dependency_overrides[get_chat_service] = lambda: service
+    try:
+        client = TestClient(app)
+        payload = {"session_id": str(session.id), "content": "hi", "role": "user"}
+        assert client.post("/api/v1/chat/message", json=payload).status_code == 201
+        
+        response = client.post("/api/v1/chat/message", json=payload)
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "30"
+        
+        response = client.post("/api/v1/chat/stream", json=payload)
+        assert response.status_code == 429
+    finally:
+        app.dependency_overrides.pop(get_chat_service, None)
+    
+    history = asyncio.run(service.get_chat_history(session.id, "default_user"))
+    assert [m.content for m in history.items] == ["hi", "ok"]
+
+
+def test_stream_closed_before_first_chunk_releases_lease():
+    """Test a stream closed unstarted, or a response whose send fails, frees its slots."""
+    limiter = RateLimiter(concurrency={"user": 1})
+    service, session = make_service(limiter)
+    message = ChatMessageCreate(session_id=session.id, content="hi", role=MessageRole.USER)
+    
+    async def close_unstarted():
+        events = await service.stream_message(message, "default_user")
+        assert limiter._in_flight == {"user:default_user": 1}
+        await events.aclose()
+    
+    asyncio.run(close_unstarted())
+    assert limiter._in_flight == {}
+    
+    async def disconnect_before_body():
+        response = ChatStreamResponse(await service.stream_message(message, "default_user"))
+        
+        async def receive():
+            return {"type": "http.disconnect"}
+        
+        async def send(event):
+            raise ConnectionResetError("client went away")
+        
+        with pytest.raises(ConnectionResetError):
+            await response({"type": "http"}, receive, send)
+    
+    asyncio.run(disconnect_before_body())
+    assert limiter._in_flight == {}
+
+
+def test_storage_failure_after_admission_releases_lease():
+    """Test a turn that fails to store its message frees its slots."""
+    limiter = RateLimiter(concurrency={"user": 1})
+    service, session = make_service(limiter)
+    message = ChatMessageCreate(session_id=session.id, content="hi", role=MessageRole.USER)
+    
+    async def broken_append(message):
+        raise OSError("disk full")
+    
+    service._messages_storage.append = broken_append
+    with pytest.raises(OSError):
+        asyncio.run(service.stream_message(message, "default_user"))
+    assert limiter._in_flight == {}
\ No newline at end of file
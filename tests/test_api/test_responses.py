@@ -0,0 +1,35 @@
+"""Test direct JSON serialization of response models."""
+
+import json
+from uuid import uuid4
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core import responses
+from app.models.agent import Agent
+from app.models.chat import ChatMessage, MessageRole
+from app.models.common import CursorPage
+from app.models.tool import Tool
+
+
+def make_pages():
+    """One page each of agents, tools and chat messages."""
+    agent = Agent(name="Ünïcode", system_prompt="Be brief.", user_id="alice", metadata={"k": [1, 2.5]})
+    tool = Tool(name="search", tool_type="api", user_id="alice", configuration={"timeout": 3})
+    message = ChatMessage(content="hi", role=MessageRole.USER, session_id=uuid4(), user_id="alice")
+    return [
+        CursorPage[Agent](items=[agent], next_cursor="abc"),
+        CursorPage[Tool](items=[tool]),
+        CursorPage[ChatMessage](items=[message]),
+    ]
+
+
+def test_dumps_matches_default_encoding(monkeypatch):
+    """Test orjson and the stdlib fallback both match FastAPI's encoding."""
+    for page in make_pages():
+        expected = jsonable_encoder(page)
+        assert json.loads(responses.dumps(page)) == expected
+        
+        with monkeypatch.context() as patch:
+            patch.setattr(responses, "orjson", None)
+            assert json.loads(responses.dumps(page)) == expected
\ No newline at end of file
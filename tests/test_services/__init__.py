@@ -0,0 +1 @@
+"""Service layer tests."""
\ No newline at end of file
@@ -0,0 +1,87 @@
+"""Test agent service validation."""
+
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.models.agent import AgentCreate
+from app.services.agent_service import AgentService
+from app.services.llm_pool import LLMClientPool
+from app.storage.memory import MemoryStorageBackend
+
+
+class ProbeClient:
+    """Client counting provider round-trips."""
+    
+    calls = 0
+    
+    def __init__(self, **options):
+        self.options = options
+    
+    async def ainvoke(self, messages):
+        ProbeClient.calls += 1
+        return type("Response", (), {"content": "pong"})()
+
+
+@pytest.fixture
+def agent_service():
+    """Agent service with isolated storage and a counting LLM client."""
+    service = AgentService(storage=MemoryStorageBackend())
+    service.llm_service.client_pool = LLMClientPool(api_key="test", client_factory=ProbeClient)
+    ProbeClient.calls = 0
+    return service
+
+
+@pytest.fixture
+def validation_mode():
+    """Temporarily switch AGENT_VALIDATION_MODE."""
+    original = settings.AGENT_VALIDATION_MODE
+    
+    def set_mode(mode):
+        settings.AGENT_VALIDATION_MODE = mode
+    
+    yield set_mode
+    settings.AGENT_VALIDATION_MODE = original
+
+
+@pytest.mark.asyncio
+async def test_local_validation_skips_provider(agent_service, validation_mode):
+    """Test local mode creates agents without a provider round-trip."""
+    validation_mode("local")
+    for i in range(20):
+        await agent_service.create_agent(
+            AgentCreate(name=f"a{i}", system_prompt="Help."),
+            "alice"
+        )
+    
+    assert ProbeClient.calls == 0
+    assert len((await agent_service.list_agents("alice")).items) == 20
+
+
+@pytest.mark.asyncio
+async def test_local_validation_rejects_unknown_model(agent_service, validation_mode):
+    """Test unsupported models fail validation locally."""
+    validation_mode("local")
+    with pytest.raises(ValueError, match="Unsupported model"):
+        await agent_service.create_agent(
+            AgentCreate(name="a", system_prompt="Help.", model_name="gpt-unknown"),
+            "alice"
+        )
+
+
+@pytest.mark.asyncio
+async def test_background_mode_probes_each_model_once(agent_service, validation_mode):
+    """Test background probes are deferred and cached per model."""
+    validation_mode("background")
+    for i in range(5):
+        await agent_service.create_agent(
+            AgentCreate(name=f"a{i}", system_prompt="Help."),
+            "alice"
+        )
+    
+    assert ProbeClient.calls == 0
+    await asyncio.gather(*agent_service.llm_service._probe_tasks)
+    
+    assert ProbeClient.calls == 1
+    assert agent_service.llm_service.get_model_probe_result("gemini-pro") is True
\ No newline at end of file
@@ -0,0 +1,111 @@
+"""Test rolling chat session summaries."""
+
+import asyncio
+
+import pytest
+
+from app.models.agent import AgentCreate
+from app.models.chat import ChatMessageCreate, ChatSessionCreate, MessageRole
+from app.services.chat_service import ChatService
+from app.services.llm_pool import LLMClientPool
+from app.services.llm_service import SUMMARY_PROMPT, LLMService
+from app.storage.memory import MemoryStorageBackend
+
+
+class RecordingClient:
+    """Client recording prompts and answering summaries with their input size."""
+    
+    prompts = []
+    
+    def __init__(self, **options):
+        self.options = options
+    
+    async def ainvoke(self, messages):
+        RecordingClient.prompts.append(messages)
+        if messages[0].content == SUMMARY_PROMPT:
+            content = f"summary of {len(messages[1].content.splitlines())} lines"
+        else:
+            content = "ok"
+        return type("Response", (), {"content": content})()
+
+
+@pytest.fixture
+def chat_service(monkeypatch):
+    """Chat service summarizing all but the last 4 messages once 8 exist."""
+    monkeypatch.setattr("app.core.config.settings.CHAT_SUMMARY_ENABLED", True)
+    monkeypatch.setattr("app.core.config.settings.CHAT_SUMMARY_KEEP_RECENT", 4)
+    monkeypatch.setattr("app.core.config.settings.CHAT_SUMMARY_TRIGGER_MESSAGES", 4)
+    RecordingClient.prompts = []
+    pool = LLMClientPool(api_key="test", client_factory=RecordingClient)
+    return ChatService(storage=MemoryStorageBackend(), llm_service=LLMService(client_pool=pool))
+
+
+async def send_turns(service: ChatService, session_id, user_id: str, start: int, count: int):
+    """Send ``count`` turns and wait for any summary they trigger."""
+    for i in range(start, start + count):
+        message = ChatMessageCreate(content=f"turn {i}", role=MessageRole.USER, session_id=session_id)
+        await service.send_message(message, user_id)
+    await asyncio.gather(*service._summary_tasks.values())
+
+
+@pytest.mark.asyncio
+async def test_older_messages_are_folded_into_summary(chat_service):
+    """Test summaries are incremental and replace older history in prompts."""
+    agent = await chat_service.agent_service.create_agent(
+        AgentCreate(name="a", system_prompt="Be brief."),
+        "alice"
+    )
+    session = await chat_service.create_session(ChatSessionCreate(agent_id=agent.id), "alice")
+    
+    # 3 turns (6 messages) stay below the trigger
+    await send_turns(chat_service, session.id, "alice", 0, 3)
+    assert (await chat_service._sessions_storage.get(session.id)).summary is None
+    
+    # The 4th turn makes 8 messages: the first 4 are summarized
+    await send_turns(chat_service, session.id, "alice", 3, 1)
+    session = await chat_service._sessions_storage.get(session.id)
+    assert session.summary == "summary of 4 lines"
+    assert session.summarized_message_count == 4
+    
+    # The next prompt holds the summary and only the unsummarized messages
+    RecordingClient.prompts.clear()
+    await send_turns(chat_service, session.id, "alice", 4, 1)
+    prompt = [message.content for message in RecordingClient.prompts[0]]
+    assert prompt[:2] == ["Be brief.", "Summary of the earlier conversation: summary of 4 lines"]
+    assert prompt[2:] == ["turn 2", "Assistant: ok", "turn 3", "Assistant: ok", "turn 4"]
+    
+    # Once 4 more messages pass the window, only those and the old summary are sent
+    await send_turns(chat_service, session.id, "alice", 5, 1)
+    summary_prompt = RecordingClient.prompts[-1][1].content.splitlines()
+    assert summary_prompt == [
+        "Summary so far: summary of 4 lines",
+        "user: turn 2",
+        "assistant: ok",
+        "user: turn 3",
+        "assistant: ok",
+    ]
+    session = await chat_service._sessions_storage.get(session.id)
+    assert session.summarized_message_count == 8
+
+
+@pytest.mark.asyncio
+async def test_aclose_cancels_pending_summaries(chat_service, monkeypatch):
+    """Test closing the service cancels summaries still running."""
+    async def never_finish(session_id, user_id):
+        await asyncio.Event().wait()
+    
+    monkeypatch.setattr(chat_service, "summarize_session", never_finish)
+    agent = await chat_service.agent_service.create_agent(
+        AgentCreate(name="a", system_prompt="Be brief."),
+        "alice"
+    )
+    session = await chat_service.create_session(ChatSessionCreate(agent_id=agent.id), "alice")
+    for i in range(4):
+        message = ChatMessageCreate(content=f"turn {i}", role=MessageRole.USER, session_id=session.id)
+        await chat_service.send_message(message, "alice")
+    tasks = list(chat_service._summary_tasks.values())
+    assert len(tasks) == 1
+    
+    await chat_service.aclose()
+    assert tasks[0].cancelled()
+    assert chat_service._summary_tasks == {}
\ No newline at end of file
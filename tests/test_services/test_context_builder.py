@@ -0,0 +1,83 @@
+"""Test token-budgeted context assembly."""
+
+from uuid import uuid4
+
+from app.models.agent import Agent
+from app.models.chat import ChatMessage, MessageRole
+from app.services.context_builder import MESSAGE_OVERHEAD_TOKENS, ContextBuilder
+from app.services.llm_service import LLMService
+from app.services.token_counter import TokenCounter, Tokenizer
+
+
+class WordTokenizer(Tokenizer):
+    """Tokenizer counting one token per word and recording its inputs."""
+    
+    def __init__(self):
+        self.calls = []
+    
+    def count(self, text: str) -> int:
+        return len(text.split())
+    
+    def count_batch(self, texts):
+        self.calls.append(texts)
+        return super().count_batch(texts)
+
+
+def make_history(count: int, words: int = 10):
+    """Build a session history of alternating user and assistant messages."""
+    session_id = uuid4()
+    roles = [MessageRole.USER, MessageRole.ASSISTANT]
+    return [
+        ChatMessage(
+            content=" ".join([f"m{i}"] * words),
+            role=roles[i % 2],
+            session_id=session_id,
+            user_id="alice"
+        )
+        for i in range(count)
+    ]
+
+
+def test_select_keeps_most_recent_messages_within_budget(monkeypatch):
+    """Test history is trimmed from the oldest end to fit the budget."""
+    monkeypatch.setattr("app.core.config.settings.MODEL_CONTEXT_TOKENS", {"gemini-pro": 200})
+    builder = ContextBuilder(TokenCounter(WordTokenizer()))
+    agent = Agent(name="a", system_prompt="Be brief.", max_tokens=50, user_id="alice")
+    history = make_history(20)
+    
+    # 200 - 50 reserved - (2 + 4) system - (1 + 4) message = 139, 14 tokens each
+    selected = builder.select(agent, "hi", history)
+    assert selected == history[-9:]
+    assert builder.history_budget(agent, "hi") == 139
+    
+    # A bigger response reservation leaves room for less history
+    agent.max_tokens = 150
+    assert builder.select(agent, "hi", history) == history[-2:]
+
+
+def test_stored_token_counts_are_used_and_others_batched():
+    """Test only messages without a token count are tokenized, in one batch."""
+    tokenizer = WordTokenizer()
+    builder = ContextBuilder(TokenCounter(tokenizer))
+    history = make_history(4)
+    history[1].token_count = 3
+    
+    tokens = builder.message_tokens(history)
+    assert tokens == [10 + MESSAGE_OVERHEAD_TOKENS, 3 + MESSAGE_OVERHEAD_TOKENS] + [10 + MESSAGE_OVERHEAD_TOKENS] * 2
+    assert tokenizer.calls == [[history[0].content, history[2].content, history[3].content]]
+    
+    # Counts are cached by content for the next turn
+    builder.message_tokens(history)
+    assert len(tokenizer.calls) == 1
+
+
+def test_prompt_uses_budgeted_window(monkeypatch):
+    """Test the LLM prompt holds the budgeted history, not a fixed count."""
+    monkeypatch.setattr("app.core.config.settings.MODEL_CONTEXT_TOKENS", {"gemini-pro": 10000})
+    service = LLMService(token_counter=TokenCounter(WordTokenizer()))
+    agent = Agent(name="a", system_prompt="Be brief.", user_id="alice")
+    history = make_history(30)
+    
+    messages = service._build_messages(agent, "hi", history)
+    assert len(messages) == 32
+    assert messages[1].content == history[0].content
\ No newline at end of file
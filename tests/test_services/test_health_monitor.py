@@ -0,0 +1,83 @@
+"""Test background health probes."""
+
+import asyncio
+import time
+
+import pytest
+
+from app.services.health_monitor import HealthMonitor
+from app.services.llm_pool import LLMClientPool
+from app.services.llm_service import LLMService
+from app.services.response_cache import ResponseCache
+from app.storage.memory import MemoryStorageBackend
+
+
+class PingClient:
+    """Client counting provider calls."""
+    
+    calls = 0
+    
+    def __init__(self, **options):
+        self.options = options
+    
+    async def ainvoke(self, messages):
+        PingClient.calls += 1
+        return type("Response", (), {"content": "pong"})()
+
+
+class BrokenStorage(MemoryStorageBackend):
+    """Storage whose ping always fails."""
+    
+    async def ping(self):
+        raise ConnectionError("database is down")
+
+
+def make_service():
+    """LLM service backed by the counting client and a response cache."""
+    return LLMService(
+        client_pool=LLMClientPool(api_key="test", client_factory=PingClient),
+        response_cache=ResponseCache()
+    )
+
+
+@pytest.mark.asyncio
+async def test_reports_component_status():
+    """Test healthy components, then a storage failure and an open circuit."""
+    service = make_service()
+    monitor = HealthMonitor(MemoryStorageBackend(), service)
+    
+    report = await monitor.check()
+    assert report["status"] == "healthy"
+    assert report["components"]["llm_provider"]["reachable"] is True
+    assert {"hits", "misses", "hit_ratio", "memory"} <= set(report["components"]["cache"])
+    
+    service.resilience.breaker("gemini-pro").opened_at = time.monotonic()
+    report = await monitor.check()
+    assert report["status"] == "degraded"
+    assert report["components"]["llm_provider"]["open_circuits"] == ["gemini-pro"]
+    
+    report = await HealthMonitor(BrokenStorage(), service).check()
+    assert report["status"] == "unhealthy"
+    assert report["components"]["storage"]["error"] == "database is down"
+
+
+@pytest.mark.asyncio
+async def test_background_probes_call_provider_once_per_interval():
+    """Test the provider is probed on its own, slower interval."""
+    PingClient.calls = 0
+    monitor = HealthMonitor(
+        MemoryStorageBackend(),
+        make_service(),
+        interval_seconds=0.01,
+        llm_probe_interval_seconds=60
+    )
+    
+    await monitor.start()
+    assert PingClient.calls == 0
+    first_report = monitor.report
+    await asyncio.sleep(0.1)
+    await monitor.stop()
+    
+    assert PingClient.calls == 1
+    assert monitor.report["checked_at"] != first_report["checked_at"]
+    assert monitor.report["components"]["event_loop"]["status"] == "healthy"
\ No newline at end of file
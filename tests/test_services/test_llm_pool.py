@@ -0,0 +1,82 @@
+"""Test LLM client pool."""
+
+import asyncio
+
+import pytest
+from google.api_core.exceptions import ServiceUnavailable
+from langchain_google_genai import chat_models
+
+from app.models.agent import Agent
+from app.services.llm_pool import LLMClientPool
+from app.services.llm_service import LLMService
+
+
+class FakeClient:
+    """Client recording the settings it was built with."""
+    
+    def __init__(self, **options):
+        self.options = options
+    
+    async def ainvoke(self, messages):
+        await asyncio.sleep(0.01)
+        return type("Response", (), {"content": f"t={self.options['temperature']}"})()
+
+
+def test_pool_reuses_clients_per_configuration():
+    """Test identical configurations share one client."""
+    pool = LLMClientPool(api_key="key", client_factory=FakeClient)
+    
+    first = pool.get_client("gemini-pro", 0.2, 100)
+    assert pool.get_client("gemini-pro", 0.2, 100) is first
+    assert pool.get_client("gemini-pro", 0.9, 100) is not first
+    assert first.options == {
+        "model": "gemini-pro",
+        "google_api_key": "key",
+        "temperature": 0.2,
+        "max_output_tokens": 100,
+    }
+    assert pool.stats()["hits"] == 1
+
+
+def test_pool_evicts_least_recently_used():
+    """Test the pool stays bounded and evicts the oldest unused client."""
+    pool = LLMClientPool(api_key="key", max_size=2, client_factory=FakeClient)
+    
+    a = pool.get_client("gemini-pro", 0.1)
+    pool.get_client("gemini-pro", 0.2)
+    pool.get_client("gemini-pro", 0.1)
+    pool.get_client("gemini-pro", 0.3)
+    
+    assert len(pool) == 2
+    assert pool.get_client("gemini-pro", 0.1) is a
+
+
+@pytest.mark.asyncio
+async def test_concurrent_agents_keep_their_own_settings():
+    """Test concurrent calls do not see each other's temperature."""
+    service = LLMService(client_pool=LLMClientPool(api_key="key", client_factory=FakeClient))
+    agents = [
+        Agent(name=f"a{i}", system_prompt="Be brief.", temperature=t, user_id="alice")
+        for i, t in enumerate((0.0, 0.5, 1.0))
+    ]
+    
+    responses = await asyncio.gather(*(
+        service.generate_response(agent, "hello") for agent in agents
+    ))
+    
+    assert [r["content"] for r in responses] == ["t=0.0", "t=0.5", "t=1.0"]
+
+
+@pytest.mark.asyncio
+async def test_provider_clients_make_one_attempt_per_call():
+    """Test the client library does not retry underneath the resilience policy."""
+    LLMClientPool(api_key="key")
+    calls = []
+    
+    async def unavailable(**kwargs):
+        calls.append(kwargs)
+        raise ServiceUnavailable("overloaded")
+    
+    with pytest.raises(ServiceUnavailable):
+        await chat_models._achat_with_retry(generation_method=unavailable)
+    assert len(calls) == 1
\ No newline at end of file
@@ -0,0 +1,200 @@
+"""Test model routing, fallback and hedging."""
+
+import asyncio
+
+import pytest
+
+from app.core.metrics import LLM_CALL_SECONDS, LLM_TIME_TO_FIRST_TOKEN_SECONDS
+from app.models.agent import Agent
+from app.services.llm_pool import LLMClientPool
+from app.services.llm_service import LLMService
+from app.services.model_router import ModelRouter
+from app.services.response_cache import ResponseCache
+from app.services.resilience import ResiliencePolicy
+
+
+class ProviderError(Exception):
+    """Provider error carrying an HTTP status."""
+    
+    def __init__(self, code: int):
+        super().__init__(f"status {code}")
+        self.code = code
+
+
+def make_agent(**fields):
+    """Agent on gemini-pro falling back to gemini-1.5-pro by default."""
+    fields.setdefault("fallback_models", ["gemini-1.5-pro"])
+    return Agent(name="a", system_prompt="Be brief.", user_id="alice", **fields)
+
+
+@pytest.fixture
+def router():
+    """Router whose models are tried once each."""
+    return ModelRouter(ResiliencePolicy(max_retries=0), fallbacks={})
+
+
+@pytest.mark.asyncio
+async def test_falls_back_on_transient_errors_only(router):
+    """Test a failing model hands over to the next, unless the request is bad."""
+    async def attempt(model):
+        if model == "gemini-pro":
+            raise ProviderError(503)
+        return f"from {model}"
+    
+    assert await router.call(make_agent(), attempt) == ("gemini-1.5-pro", "from gemini-1.5-pro")
+    assert router.metrics["fallbacks"] == 1
+    
+    async def bad_request(model):
+        raise ProviderError(400)
+    
+    with pytest.raises(ProviderError):
+        await router.call(make_agent(), bad_request)
+    assert router.metrics["fallbacks"] == 1
+
+
+@pytest.mark.asyncio
+async def test_hedges_slow_primary(router):
+    """Test a slow primary is raced against the fallback and the loser cancelled."""
+    cancelled = []
+    
+    async def attempt(model):
+        delay = 1.0 if model == "gemini-pro" else 0.01
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(model)
+            raise
+        return model
+    
+    assert await router.call(make_agent(hedge_after_ms=20), attempt) == ("gemini-1.5-pro", "gemini-1.5-pro")
+    assert cancelled == ["gemini-pro"]
+    assert router.stats() == {"fallbacks": 0, "hedges": 1, "hedge_wins": 1}
+    
+    # A primary answering in time is not hedged
+    async def fast(model):
+        return model
+    
+    assert await router.call(make_agent(hedge_after_ms=20), fast) == ("gemini-pro", "gemini-pro")
+    assert router.metrics["hedges"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_during_hedge_delay_cancels_primary(router):
+    """Test cancelling the caller before the hedge starts leaves no call running."""
+    started = asyncio.Event()
+    cancelled = []
+    
+    async def attempt(model):
+        started.set()
+        try:
+            await asyncio.sleep(1.0)
+        except asyncio.CancelledError:
+            cancelled.append(model)
+            raise
+        return model
+    
+    call = asyncio.create_task(router.call(make_agent(hedge_after_ms=500), attempt))
+    await started.wait()
+    call.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await call
+    assert cancelled == ["gemini-pro"]
+
+
+@pytest.mark.asyncio
+async def test_stream_falls_back_before_first_chunk(router):
+    """Test a stream that fails to start is taken over by the fallback model."""
+    def start(model):
+        async def chunks():
+            if model == "gemini-pro":
+                raise ProviderError(503)
+            yield model
+        return chunks()
+    
+    assert [pair async for pair in router.stream(make_agent(), start)] == [("gemini-1.5-pro", "gemini-1.5-pro")]
+
+
+@pytest.mark.asyncio
+async def test_llm_service_reports_answering_model(monkeypatch):
+    """Test responses name the model that actually answered."""
+    monkeypatch.setattr("app.core.config.settings.LLM_FALLBACK_MODELS", {"gemini-pro": ["gemini-1.5-pro"]})
+    
+    class Client:
+        def __init__(self, **options):
+            self.model = options["model"]
+        
+        async def ainvoke(self, messages):
+            if self.model == "gemini-pro":
+                raise ProviderError(503)
+            return type("Response", (), {"content": "ok"})()
+    
+    service = LLMService(
+        client_pool=LLMClientPool(api_key="test", client_factory=Client),
+        resilience=ResiliencePolicy(max_retries=0)
+    )
+    agent = Agent(name="a", system_prompt="Be brief.", user_id="alice")
+    
+    response = await service.generate_response(agent, "hi")
+    assert response["model"] == "gemini-1.5-pro"
+    assert service.validate_agent_config_locally(make_agent(fallback_models=["gpt-4"]))
+
+
+@pytest.mark.asyncio
+async def test_stream_metrics_name_answering_model(monkeypatch):
+    """Test streamed calls are measured under the fallback model that answered."""
+    monkeypatch.setattr("app.core.config.settings.LLM_FALLBACK_MODELS", {"gemini-pro": ["gemini-1.5-pro"]})
+    
+    class Client:
+        def __init__(self, **options):
+            self.model = options["model"]
+        
+        async def astream(self, messages):
+            if self.model == "gemini-pro":
+                raise ProviderError(503)
+            yield type("Chunk", (), {"content": "ok"})()
+    
+    service = LLMService(
+        client_pool=LLMClientPool(api_key="test", client_factory=Client),
+        resilience=ResiliencePolicy(max_retries=0)
+    )
+    agent = Agent(name="a", system_prompt="Be brief.", user_id="alice")
+    
+    def count(histogram, *labels):
+        series = histogram._series.get(labels)
+        return sum(series[0]) if series else 0
+    
+    before = count(LLM_CALL_SECONDS, "gemini-1.5-pro", "stream"), count(LLM_TIME_TO_FIRST_TOKEN_SECONDS, "gemini-1.5-pro")
+    assert [chunk async for chunk in service.stream_response(agent, "hi")] == ["ok"]
+    after = count(LLM_CALL_SECONDS, "gemini-1.5-pro", "stream"), count(LLM_TIME_TO_FIRST_TOKEN_SECONDS, "gemini-1.5-pro")
+    assert after == (before[0] + 1, before[1] + 1)
+
+
+@pytest.mark.asyncio
+async def test_fallback_answers_are_not_cached_as_primary(monkeypatch):
+    """Test a cacheable call answered by a fallback is not served later as the primary's."""
+    monkeypatch.setattr("app.core.config.settings.LLM_FALLBACK_MODELS", {"gemini-pro": ["gemini-1.5-pro"]})
+    primary_down = True
+    
+    class Client:
+        def __init__(self, **options):
+            self.model = options["model"]
+        
+        async def ainvoke(self, messages):
+            if self.model == "gemini-pro" and primary_down:
+                raise ProviderError(503)
+            return type("Response", (), {"content": f"from {self.model}"})()
+    
+    service = LLMService(
+        client_pool=LLMClientPool(api_key="test", client_factory=Client),
+        resilience=ResiliencePolicy(max_retries=0),
+        response_cache=ResponseCache()
+    )
+    agent = Agent(name="a", system_prompt="Be brief.", user_id="alice", temperature=0)
+    
+    response = await service.generate_response(agent, "hi")
+    assert (response["model"], response["content"]) == ("gemini-1.5-pro", "from gemini-1.5-pro")
+    
+    primary_down = False
+    response = await service.generate_response(agent, "hi")
+    assert (response["model"], response["content"]) == ("gemini-pro", "from gemini-pro")
+    assert "cached" not in response
\ No newline at end of file
@@ -0,0 +1,69 @@
+"""Test cursor pagination."""
+
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from app.models.chat import ChatSession
+from app.models.tool import Tool
+from app.services.pagination import InvalidCursorError, decode_cursor, encode_cursor, paginate_for_user
+from app.storage.memory import InMemoryRepository, updated_at_key
+
+
+async def collect(repo, user_id, limit):
+    """Walk every page and return the item names/titles in order."""
+    seen, cursor = [], None
+    while True:
+        page = await paginate_for_user(repo, user_id, limit=limit, cursor=cursor)
+        seen.extend(getattr(item, "name", None) or item.title for item in page.items)
+        if page.next_cursor is None:
+            return seen
+        cursor = page.next_cursor
+
+
+def test_cursor_round_trip():
+    """Test cursors decode to the key they were built from."""
+    key = (datetime(2024, 1, 2, 3, 4, 5, 6), str(uuid4()))
+    assert decode_cursor(encode_cursor(key)) == key
+    
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_pages_cover_every_entity_once():
+    """Test walking pages visits each entity exactly once, oldest first."""
+    repo = InMemoryRepository()
+    start = datetime.utcnow()
+    for i in range(7):
+        await repo.add(Tool(name=f"t{i}", tool_type="Calculator", user_id="alice", created_at=start + timedelta(seconds=i)))
+    
+    assert await collect(repo, "alice", limit=3) == [f"t{i}" for i in range(7)]
+    assert await collect(repo, "alice", limit=7) == [f"t{i}" for i in range(7)]
+
+
+@pytest.mark.asyncio
+async def test_pages_do_not_shift_under_inserts():
+    """Test inserting older entities does not repeat items on later pages."""
+    repo = InMemoryRepository()
+    start = datetime.utcnow()
+    for i in range(4):
+        await repo.add(Tool(name=f"t{i}", tool_type="Calculator", user_id="alice", created_at=start + timedelta(seconds=i)))
+    
+    first = await paginate_for_user(repo, "alice", limit=2)
+    await repo.add(Tool(name="early", tool_type="Calculator", user_id="alice", created_at=start - timedelta(seconds=1)))
+    second = await paginate_for_user(repo, "alice", limit=2, cursor=first.next_cursor)
+    
+    assert [t.name for t in second.items] == ["t2", "t3"]
+
+
+@pytest.mark.asyncio
+async def test_descending_pages():
+    """Test cursors follow a newest-first index."""
+    repo = InMemoryRepository(sort_key=updated_at_key, descending=True)
+    start = datetime.utcnow()
+    for i in range(5):
+        await repo.add(ChatSession(title=f"s{i}", agent_id=uuid4(), user_id="alice", created_at=start + timedelta(seconds=i)))
+    
+    assert await collect(repo, "alice", limit=2) == ["s4", "s3", "s2", "s1", "s0"]
\ No newline at end of file
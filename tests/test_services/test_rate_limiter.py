@@ -0,0 +1,86 @@
+"""Test LLM call rate limiting."""
+
+import asyncio
+
+import pytest
+
+from app.services.rate_limiter import MemoryRateLimitBackend, RateLimiter, RateLimitExceeded
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_allows_burst_then_reports_wait(monkeypatch):
+    """Test a bucket admits its burst and then says when the next token arrives."""
+    now = [1000.0]
+    monkeypatch.setattr("app.services.rate_limiter.time.monotonic", lambda: now[0])
+    backend = MemoryRateLimitBackend()
+    
+    assert [await backend.take("user:alice", 0.5, 2) for _ in range(2)] == [0, 0]
+    assert await backend.take("user:alice", 0.5, 2) == pytest.approx(2.0)
+    assert await backend.take("user:bob", 0.5, 2) == 0
+    
+    now[0] += 2
+    assert await backend.take("user:alice", 0.5, 2) == 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_checks_every_scope():
+    """Test the user, agent and model limits each apply."""
+    limiter = RateLimiter(rates={"user": (60, 1), "agent": (60, 5)})
+    
+    await limiter.acquire("alice", "agent-1", "gemini-pro")
+    with pytest.raises(RateLimitExceeded) as error:
+        await limiter.acquire("alice", "agent-2", "gemini-pro")
+    assert error.value.scope == "user"
+    assert 0 < error.value.retry_after <= 1
+    
+    # Another user of the same agent is unaffected
+    await limiter.acquire("bob", "agent-1", "gemini-pro")
+
+
+@pytest.mark.asyncio
+async def test_concurrency_cap_frees_slots_on_release():
+    """Test calls in flight are capped and released slots are reusable."""
+    limiter = RateLimiter(concurrency={"agent": 2})
+    
+    leases = [await limiter.acquire(user, "agent-1", "gemini-pro") for user in ("alice", "bob")]
+    with pytest.raises(RateLimitExceeded) as error:
+        await limiter.acquire("carol", "agent-1", "gemini-pro")
+    assert error.value.scope == "agent"
+    
+    leases[0].release()
+    leases[0].release()
+    await limiter.acquire("carol", "agent-1", "gemini-pro")
+    with pytest.raises(RateLimitExceeded):
+        await limiter.acquire("dave", "agent-1", "gemini-pro")
+
+
+@pytest.mark.asyncio
+async def test_rejected_call_refunds_tokens_and_slots(monkeypatch):
+    """Test a call rejected by one scope costs nothing in the others."""
+    monkeypatch.setattr("app.services.rate_limiter.time.monotonic", lambda: 1000.0)
+    limiter = RateLimiter(rates={"user": (60, 2), "agent": (60, 1)}, concurrency={"user": 5})
+    
+    await limiter.acquire("alice", "agent-1", "gemini-pro")
+    with pytest.raises(RateLimitExceeded) as error:
+        await limiter.acquire("alice", "agent-1", "gemini-pro")
+    assert error.value.scope == "agent"
+    assert limiter._in_flight == {"user:alice": 1}
+    
+    # The user token taken before the agent rejected was given back
+    await limiter.acquire("alice", "agent-2", "gemini-pro")
+
+
+@pytest.mark.asyncio
+async def test_concurrency_slots_reserved_before_backend_wait():
+    """Test calls waiting on the backend cannot overshoot the concurrency cap."""
+    class SlowBackend(MemoryRateLimitBackend):
+        async def take(self, key, rate, burst):
+            await asyncio.sleep(0)
+            return await super().take(key, rate, burst)
+    
+    limiter = RateLimiter(SlowBackend(), rates={"user": (600, 10)}, concurrency={"agent": 1})
+    results = await asyncio.gather(
+        *(limiter.acquire(user, "agent-1", "gemini-pro") for user in ("alice", "bob", "carol")),
+        return_exceptions=True
+    )
+    assert sum(not isinstance(result, RateLimitExceeded) for result in results) == 1
\ No newline at end of file
@@ -0,0 +1,164 @@
+"""Test timeouts, retries and circuit breaking around provider calls."""
+
+import asyncio
+
+import pytest
+
+from app.models.agent import Agent
+from app.services.llm_pool import LLMClientPool
+from app.services.llm_service import LLMService
+from app.services.resilience import CircuitOpenError, ResiliencePolicy
+
+
+class ProviderError(Exception):
+    """Provider error carrying an HTTP status like google.api_core errors."""
+    
+    def __init__(self, code: int):
+        super().__init__(f"status {code}")
+        self.code = code
+
+
+def flaky(*outcomes):
+    """Attempt raising or returning each outcome in turn."""
+    remaining = list(outcomes)
+    
+    async def attempt():
+        outcome = remaining.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+    
+    return attempt
+
+
+@pytest.mark.asyncio
+async def test_transient_errors_are_retried():
+    """Test overload errors are retried and bad requests are not."""
+    policy = ResiliencePolicy(base_delay_seconds=0)
+    
+    assert await policy.call("gemini-pro", flaky(ProviderError(503), ProviderError(429), "ok")) == "ok"
+    assert policy.metrics["retries"] == 2
+    
+    with pytest.raises(ProviderError):
+        await policy.call("gemini-pro", flaky(ProviderError(400), "ok"))
+    assert policy.metrics["retries"] == 2
+    
+    with pytest.raises(ProviderError):
+        await policy.call("gemini-pro", flaky(*[ProviderError(503)] * 3, "ok"))
+    assert policy.metrics["retries"] == 4
+
+
+@pytest.mark.asyncio
+async def test_attempts_time_out():
+    """Test a hung attempt is cut off and reported as a timeout."""
+    policy = ResiliencePolicy(timeout_seconds=0.05, max_retries=1, base_delay_seconds=0)
+    
+    async def hang():
+        await asyncio.sleep(10)
+    
+    with pytest.raises(asyncio.TimeoutError, match="timed out after"):
+        await policy.call("gemini-pro", hang)
+    assert policy.metrics["timeouts"] == 2
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_fails_fast_and_recovers():
+    """Test consecutive failures open a model's circuit until a trial succeeds."""
+    policy = ResiliencePolicy(max_retries=0, failure_threshold=2, reset_seconds=0.05)
+    
+    for _ in range(2):
+        with pytest.raises(ProviderError):
+            await policy.call("gemini-pro", flaky(ProviderError(503)))
+    
+    with pytest.raises(CircuitOpenError):
+        await policy.call("gemini-pro", flaky("ok"))
+    assert await policy.call("gemini-1.5-pro", flaky("ok")) == "ok"
+    assert policy.stats()["circuits"] == {"gemini-pro": "open", "gemini-1.5-pro": "closed"}
+    
+    await asyncio.sleep(0.06)
+    assert await policy.call("gemini-pro", flaky("ok")) == "ok"
+    assert policy.stats()["circuits"]["gemini-pro"] == "closed"
+    assert policy.metrics["short_circuits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_streams_retry_only_before_first_chunk():
+    """Test a stream failing before any chunk is retried, but not after."""
+    policy = ResiliencePolicy(base_delay_seconds=0)
+    starts = []
+    
+    def start():
+        starts.append(len(starts))
+        
+        async def chunks():
+            if len(starts) == 1:
+                raise ProviderError(503)
+            yield "a"
+            yield "b"
+            raise ProviderError(503)
+        
+        return chunks()
+    
+    received = []
+    with pytest.raises(ProviderError):
+        async for chunk in policy.stream("gemini-pro", start):
+            received.append(chunk)
+    
+    assert received == ["a", "b"]
+    assert len(starts) == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_stream_closes_provider_stream_and_frees_trial():
+    """Test cancelling a half-open trial stream closes it and lets the next trial through."""
+    policy = ResiliencePolicy(failure_threshold=1, reset_seconds=0)
+    policy.breaker("gemini-pro").record_failure()
+    
+    class SlowStream:
+        closed = False
+        
+        def __aiter__(self):
+            return self
+        
+        async def __anext__(self):
+            await asyncio.sleep(10)
+        
+        async def aclose(self):
+            self.closed = True
+    
+    stream = SlowStream()
+    
+    async def consume():
+        async for _ in policy.stream("gemini-pro", lambda: stream):
+            pass
+    
+    task = asyncio.create_task(consume())
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    
+    assert stream.closed
+    policy.before_call("gemini-pro")
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_is_not_wrapped_by_llm_service():
+    """Test callers can tell an open circuit from other failures."""
+    class FailingClient:
+        def __init__(self, **options):
+            pass
+        
+        async def ainvoke(self, messages):
+            raise ProviderError(503)
+    
+    service = LLMService(
+        client_pool=LLMClientPool(api_key="test", client_factory=FailingClient),
+        resilience=ResiliencePolicy(max_retries=0, failure_threshold=1)
+    )
+    agent = Agent(name="a", system_prompt="Be brief.", user_id="alice")
+    
+    with pytest.raises(Exception, match="Failed to generate LLM response: status 503"):
+        await service.generate_response(agent, "hi")
+    with pytest.raises(CircuitOpenError):
+        await service.generate_response(agent, "hi")
\ No newline at end of file
@@ -0,0 +1,100 @@
+"""Test LLM response cache."""
+
+import pytest
+
+from app.models.agent import Agent
+from app.services.llm_pool import LLMClientPool
+from app.services.llm_service import LLMService
+from app.services.response_cache import MemoryCacheTier, ResponseCache
+
+
+class CountingClient:
+    """Client counting provider calls."""
+    
+    calls = 0
+    
+    def __init__(self, **options):
+        self.options = options
+    
+    async def ainvoke(self, messages):
+        CountingClient.calls += 1
+        return type("Response", (), {"content": f"answer {CountingClient.calls}"})()
+
+
+def test_memory_tier_evicts_by_size_and_expires():
+    """Test byte-bounded LRU eviction and TTL expiry."""
+    tier = MemoryCacheTier(max_bytes=10)
+    tier.set("a", "aaaa", ttl=60)
+    tier.set("b", "bbbb", ttl=60)
+    tier.get("a")
+    tier.set("c", "cccc", ttl=60)
+    
+    assert tier.get("b") is None
+    assert tier.get("a") == "aaaa"
+    assert tier.size_bytes == 8
+    assert tier.evictions == 1
+    
+    tier.set("d", "dd", ttl=-1)
+    assert tier.get("d") is None
+
+
+@pytest.mark.asyncio
+async def test_disk_tier_survives_new_cache_instance(tmp_path):
+    """Test disk entries are shared across cache instances."""
+    first = ResponseCache(disk_path=str(tmp_path))
+    await first.set("key", "value")
+    
+    second = ResponseCache(disk_path=str(tmp_path))
+    assert await second.get("key") == "value"
+    assert await second.get("key") == "value"
+    assert second.stats()["disk"]["hits"] == 1
+    assert second.stats()["memory"]["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_disk_tier_counts_other_writers_and_write_errors(tmp_path):
+    """Test eviction sees other workers' entries and write errors are not raised."""
+    cache_dir = tmp_path / "cache"
+    first = ResponseCache(disk_path=str(cache_dir), disk_max_bytes=200)
+    second = ResponseCache(disk_path=str(cache_dir), disk_max_bytes=200)
+    for index in range(4):
+        await first.set(f"first-{index}", "x" * 10)
+        await second.set(f"second-{index}", "x" * 10)
+    
+    total = sum(entry.stat().st_size for entry in cache_dir.glob("*.json"))
+    assert total <= 200
+    assert not list(cache_dir.glob("*.tmp"))
+    
+    for entry_path in cache_dir.iterdir():
+        entry_path.unlink()
+    cache_dir.rmdir()
+    await first.set("key", "value")
+    assert first.stats()["disk"]["write_errors"] == 1
+    assert await first.get("key") == "value"
+
+
+@pytest.mark.asyncio
+async def test_llm_service_caches_only_deterministic_agents():
+    """Test temperature 0 calls hit the cache and others do not."""
+    cache = ResponseCache()
+    service = LLMService(
+        client_pool=LLMClientPool(api_key="test", client_factory=CountingClient),
+        response_cache=cache
+    )
+    CountingClient.calls = 0
+    
+    faq = Agent(name="FAQ", system_prompt="Answer FAQs.", temperature=0, user_id="alice")
+    first = await service.generate_response(faq, "Opening hours?")
+    second = await service.generate_response(faq, "Opening hours?")
+    assert second["content"] == first["content"]
+    assert second.get("cached") is True
+    assert CountingClient.calls == 1
+    
+    await service.generate_response(faq, "Address?")
+    assert CountingClient.calls == 2
+    
+    creative = Agent(name="Poet", system_prompt="Write poems.", temperature=0.9, user_id="alice")
+    await service.generate_response(creative, "Opening hours?")
+    await service.generate_response(creative, "Opening hours?")
+    assert CountingClient.calls == 4
+    assert cache.stats()["hits"] == 1
\ No newline at end of file
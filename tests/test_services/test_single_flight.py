@@ -0,0 +1,67 @@
+"""Test coalescing of concurrent identical LLM calls."""
+
+import asyncio
+
+import pytest
+
+from app.models.agent import Agent
+from app.services.llm_pool import LLMClientPool
+from app.services.llm_service import LLMService
+from app.services.single_flight import SingleFlight
+
+
+class SlowClient:
+    """Client counting provider calls and answering after a short delay."""
+    
+    calls = 0
+    
+    def __init__(self, **options):
+        self.options = options
+    
+    async def ainvoke(self, messages):
+        SlowClient.calls += 1
+        await asyncio.sleep(0.05)
+        return type("Response", (), {"content": f"answer to {messages[-1].content}"})()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_prompts_share_one_call():
+    """Test identical in-flight prompts are deduplicated and others are not."""
+    SlowClient.calls = 0
+    service = LLMService(
+        client_pool=LLMClientPool(api_key="test", client_factory=SlowClient),
+        single_flight=SingleFlight()
+    )
+    agent = Agent(name="FAQ", system_prompt="Answer FAQs.", user_id="alice")
+    
+    responses = await asyncio.gather(
+        *[service.generate_response(agent, "What are your hours?") for _ in range(10)],
+        service.generate_response(agent, "Where are you?")
+    )
+    
+    assert SlowClient.calls == 2
+    assert {response["content"] for response in responses[:10]} == {responses[0]["content"]}
+    assert responses[10]["content"] != responses[0]["content"]
+    assert service.single_flight.stats() == {"calls": 11, "coalesced": 9, "in_flight": 0}
+    
+    # Calls that do not overlap are not deduplicated
+    await service.generate_response(agent, "What are your hours?")
+    assert SlowClient.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_leaving_caller_does_not_cancel_shared_call():
+    """Test the shared call finishes for the remaining callers."""
+    group = SingleFlight()
+    
+    async def call():
+        await asyncio.sleep(0.05)
+        return "done"
+    
+    leader = asyncio.create_task(group.do("key", call))
+    follower = asyncio.create_task(group.do("key", call))
+    await asyncio.sleep(0.01)
+    leader.cancel()
+    
+    assert await follower == "done"
+    assert group.stats()["coalesced"] == 1
\ No newline at end of file
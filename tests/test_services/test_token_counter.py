@@ -0,0 +1,42 @@
+"""Test token counting."""
+
+from app.services.token_counter import HeuristicTokenizer, TokenCounter, VocabTokenizer
+
+
+def test_heuristic_tokenizer_counts_words_numbers_and_punctuation():
+    """Test short words are one token and long words and numbers split."""
+    tokenizer = HeuristicTokenizer()
+    
+    assert tokenizer.count("The quick brown fox jumps over the lazy dog.") == 10
+    assert tokenizer.count("Hello, world!") == 4
+    assert tokenizer.count("internationalization") == 5
+    assert tokenizer.count("1234567") == 3
+    assert tokenizer.count("") == 0
+
+
+def test_vocab_tokenizer_uses_longest_matches(tmp_path):
+    """Test pieces are matched greedily against the vocabulary file."""
+    vocab_path = tmp_path / "vocab.txt"
+    vocab_path.write_text("▁the\n▁quick\nqu\nick\n▁fox\n", encoding="utf-8")
+    tokenizer = VocabTokenizer.from_file(str(vocab_path))
+    
+    # " the" + " quick" + " fox"
+    assert tokenizer.count(" the quick fox") == 3
+    # "qu" + "ick" + "!" (unknown, one token)
+    assert tokenizer.count("quick!") == 3
+
+
+def test_counter_caches_by_content_and_evicts_lru():
+    """Test repeated texts are tokenized once and the cache stays bounded."""
+    counter = TokenCounter(HeuristicTokenizer(), max_entries=2)
+    
+    assert counter.count_many(["one two", "three", "one two"]) == [2, 1, 2]
+    assert counter.stats() == {"size": 2, "hits": 1, "misses": 2}
+    
+    counter.count("one two")
+    counter.count("four")
+    assert counter.stats()["size"] == 2
+    
+    # "three" was least recently used and had to be tokenized again
+    counter.count("three")
+    assert counter.stats()["misses"] == 4
\ No newline at end of file
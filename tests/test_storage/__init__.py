@@ -0,0 +1 @@
+"""Storage layer tests."""
\ No newline at end of file
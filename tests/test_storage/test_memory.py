@@ -0,0 +1,89 @@
+"""Test in-memory repository indexes."""
+
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from app.models.chat import ChatMessage, ChatSession, MessageRole
+from app.models.tool import Tool
+from app.storage.memory import InMemoryRepository, MessageLog, updated_at_key
+
+
+def make_tool(user_id: str, name: str = "Tool") -> Tool:
+    """Build a tool owned by the given user."""
+    return Tool(name=name, tool_type="Calculator", user_id=user_id)
+
+
+@pytest.mark.asyncio
+async def test_list_for_user_only_returns_that_users_active_entities():
+    """Test listing is scoped to one user's active entities."""
+    repo = InMemoryRepository()
+    mine = [await repo.add(make_tool("alice", f"a{i}")) for i in range(3)]
+    await repo.add(make_tool("bob"))
+    
+    mine[1].is_active = False
+    await repo.save(mine[1])
+    
+    assert [tool.name for tool in await repo.list_for_user("alice")] == ["a0", "a2"]
+    assert await repo.count_for_user("alice") == 2
+    assert await repo.count_for_user("alice", is_active=False) == 1
+    assert await repo.count_for_user("bob") == 1
+
+
+@pytest.mark.asyncio
+async def test_list_for_user_pages_in_creation_order():
+    """Test skip/limit paging over the per-user index."""
+    repo = InMemoryRepository()
+    for i in range(10):
+        await repo.add(make_tool("alice", f"t{i}"))
+    
+    page = await repo.list_for_user("alice", skip=4, limit=3)
+    assert [tool.name for tool in page] == ["t4", "t5", "t6"]
+    assert await repo.list_for_user("alice", skip=20) == []
+
+
+@pytest.mark.asyncio
+async def test_descending_index_follows_updates():
+    """Test sessions re-sort when updated_at changes."""
+    repo = InMemoryRepository(sort_key=updated_at_key, descending=True)
+    start = datetime.utcnow()
+    sessions = []
+    for i in range(3):
+        session = ChatSession(
+            title=f"s{i}",
+            agent_id="00000000-0000-0000-0000-000000000000",
+            user_id="alice",
+            created_at=start + timedelta(seconds=i)
+        )
+        sessions.append(await repo.add(session))
+    
+    assert [s.title for s in await repo.list_for_user("alice")] == ["s2", "s1", "s0"]
+    
+    sessions[0].updated_at = start + timedelta(minutes=1)
+    await repo.save(sessions[0])
+    
+    assert [s.title for s in await repo.list_for_user("alice")] == ["s0", "s2", "s1"]
+    assert [s.title for s in await repo.list_for_user("alice", skip=1, limit=1)] == ["s2"]
+
+
+@pytest.mark.asyncio
+async def test_message_log_tail_and_page_are_per_session():
+    """Test message log reads only touch the requested session."""
+    log = MessageLog()
+    session_id, other_session_id = uuid4(), uuid4()
+    for i in range(5):
+        for sid in (session_id, other_session_id):
+            await log.append(ChatMessage(
+                content=f"m{i}",
+                role=MessageRole.USER,
+                session_id=sid,
+                user_id="alice"
+            ))
+    
+    assert len(log) == 10
+    assert await log.count(session_id) == 5
+    assert [m.content for m in await log.tail(session_id, 2)] == ["m3", "m4"]
+    assert [m.content for m in await log.page(session_id, skip=1, limit=2)] == ["m1", "m2"]
+    assert all(m.session_id == session_id for m in await log.tail(session_id, 10))
+    assert await log.tail(uuid4(), 3) == []
\ No newline at end of file
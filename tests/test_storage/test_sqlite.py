@@ -0,0 +1,194 @@
+"""Test SQLite storage backend."""
+
+import asyncio
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+
+pytest.importorskip("aiosqlite")
+
+from app.models.chat import ChatMessage, ChatSession, MessageRole
+from app.models.tool import Tool
+from app.storage.defaults import DEFAULT_TOOLS_USER_ID
+from app.storage.sqlite import SQLiteStorageBackend
+
+
+@pytest_asyncio.fixture
+async def storage(tmp_path):
+    """Connected SQLite backend in a temporary directory."""
+    backend = SQLiteStorageBackend(str(tmp_path / "test.db"), pool_size=2)
+    await backend.connect()
+    yield backend
+    await backend.close()
+
+
+@pytest.mark.asyncio
+async def test_entities_round_trip_and_list_by_user(storage):
+    """Test entity persistence and per-user listing."""
+    tools = [Tool(name=f"t{i}", tool_type="Calculator", user_id="alice") for i in range(3)]
+    for tool in tools:
+        await storage.tools.add(tool)
+    await storage.tools.add(Tool(name="other", tool_type="Calculator", user_id="bob"))
+    
+    tools[0].is_active = False
+    await storage.tools.save(tools[0])
+    
+    stored = await storage.tools.get(tools[1].id)
+    assert stored == tools[1]
+    assert [t.name for t in await storage.tools.list_for_user("alice")] == ["t1", "t2"]
+    assert await storage.tools.count_for_user("alice", is_active=False) == 1
+    assert await storage.tools.version_for_user("alice") == 4
+    assert await storage.tools.version_for_user("carol") == 0
+
+
+@pytest.mark.asyncio
+async def test_sessions_ordered_by_most_recent_update(storage):
+    """Test sessions list newest update first."""
+    start = datetime.utcnow()
+    sessions = [
+        ChatSession(title=f"s{i}", agent_id=uuid4(), user_id="alice", created_at=start + timedelta(seconds=i))
+        for i in range(3)
+    ]
+    for session in sessions:
+        await storage.sessions.add(session)
+    
+    sessions[0].updated_at = start + timedelta(minutes=1)
+    await storage.sessions.save(sessions[0])
+    
+    assert [s.title for s in await storage.sessions.list_for_user("alice")] == ["s0", "s2", "s1"]
+
+
+@pytest.mark.asyncio
+async def test_messages_tail_and_page(storage):
+    """Test message log reads are ordered per session."""
+    session_id = uuid4()
+    for i in range(5):
+        await storage.messages.append(
+            ChatMessage(content=f"m{i}", role=MessageRole.USER, session_id=session_id, user_id="alice")
+        )
+    await storage.messages.append(
+        ChatMessage(content="other", role=MessageRole.USER, session_id=uuid4(), user_id="alice")
+    )
+    
+    assert await storage.messages.count(session_id) == 5
+    assert [m.content for m in await storage.messages.tail(session_id, 2)] == ["m3", "m4"]
+    assert [m.content for m in await storage.messages.page(session_id, skip=1, limit=2)] == ["m1", "m2"]
+
+
+@pytest.mark.asyncio
+async def test_keyset_pages(storage):
+    """Test ``after`` resumes listing right after the given position."""
+    start = datetime.utcnow()
+    tools = [
+        Tool(name=f"t{i}", tool_type="Calculator", user_id="alice", created_at=start + timedelta(seconds=i))
+        for i in range(4)
+    ]
+    await storage.tools.save_many(tools)
+    sessions = [
+        ChatSession(title=f"s{i}", agent_id=uuid4(), user_id="alice", created_at=start + timedelta(seconds=i))
+        for i in range(3)
+    ]
+    await storage.sessions.save_many(sessions)
+    session_id = uuid4()
+    messages = [
+        await storage.messages.append(
+            ChatMessage(content=f"m{i}", role=MessageRole.USER, session_id=session_id, user_id="alice")
+        )
+        for i in range(3)
+    ]
+    
+    after = storage.tools.cursor_key(tools[1])
+    assert [t.name for t in await storage.tools.list_for_user("alice", limit=5, after=after)] == ["t2", "t3"]
+    after = storage.sessions.cursor_key(sessions[1])
+    assert [s.title for s in await storage.sessions.list_for_user("alice", after=after)] == ["s0"]
+    assert [m.content for m in await storage.messages.page(session_id, after_id=messages[0].id)] == ["m1", "m2"]
+
+
+@pytest.mark.asyncio
+async def test_data_survives_reconnect(tmp_path):
+    """Test state is shared through the database file."""
+    path = str(tmp_path / "shared.db")
+    tool = Tool(name="persistent", tool_type="Calculator", user_id="alice")
+    
+    writer = SQLiteStorageBackend(path)
+    await writer.connect()
+    await writer.tools.add(tool)
+    await writer.close()
+    
+    reader = SQLiteStorageBackend(path)
+    await reader.connect()
+    assert (await reader.tools.get(tool.id)).name == "persistent"
+    assert reader.epoch == writer.epoch
+    await reader.close()
+
+
+@pytest.mark.asyncio
+async def test_default_tools_seeded_once_per_database(tmp_path):
+    """Test concurrent connects seed the defaults once and deleted defaults stay deleted."""
+    path = str(tmp_path / "shared.db")
+    backends = [SQLiteStorageBackend(path, pool_size=1) for _ in range(2)]
+    await asyncio.gather(*[backend.connect() for backend in backends])
+    
+    tools = backends[0].tools
+    assert await tools.count_for_user(DEFAULT_TOOLS_USER_ID) == 5
+    
+    calculator = [tool for tool in await tools.list_for_user(DEFAULT_TOOLS_USER_ID) if tool.name == "Calculator"][0]
+    calculator.is_active = False
+    await tools.save(calculator)
+    for backend in backends:
+        await backend.close()
+    
+    restarted = SQLiteStorageBackend(path, pool_size=1)
+    await restarted.connect()
+    assert await restarted.tools.count_for_user(DEFAULT_TOOLS_USER_ID) == 4
+    assert await restarted.tools.count_for_user(DEFAULT_TOOLS_USER_ID, is_active=False) == 1
+    await restarted.close()
+
+@pytest.mark.asyncio
+async def test_concurrent_field_updates_are_not_lost(tmp_path):
+    """Test interleaved updates from two processes keep every change."""
+    path = str(tmp_path / "shared.db")
+    backends = [SQLiteStorageBackend(path, pool_size=2) for _ in range(2)]
+    for backend in backends:
+        await backend.connect()
+    session = ChatSession(agent_id=uuid4(), user_id="alice")
+    await backends[0].sessions.add(session)
+    
+    turns = [
+        backends[i % 2].sessions.update(session.id, increments={"message_count": 2})
+        for i in range(20)
+    ]
+    summary = backends[1].sessions.update(session.id, {"summary": "so far", "summarized_message_count": 6})
+    await asyncio.gather(*turns, summary)
+    
+    stored = await backends[0].sessions.get(session.id)
+    assert stored.message_count == 40
+    assert (stored.summary, stored.summarized_message_count) == ("so far", 6)
+    assert await backends[0].sessions.update(uuid4(), {"summary": "x"}) is None
+    for backend in backends:
+        await backend.close()
+
+@pytest.mark.asyncio
+async def test_failed_write_leaves_no_open_transaction(tmp_path):
+    """Test a save failing after its first statement rolls back before the connection is reused."""
+    backend = SQLiteStorageBackend(str(tmp_path / "test.db"), pool_size=1)
+    await backend.connect()
+    tools = backend.tools
+    try:
+        tool = Tool(name="t", tool_type="Calculator", user_id="alice")
+        await tools.add(tool)
+        
+        bump_version_sql = tools._bump_version_sql
+        tools._bump_version_sql = "INSERT INTO missing_table VALUES (?)"
+        tool.name = "renamed"
+        with pytest.raises(Exception):
+            await tools.save(tool)
+        tools._bump_version_sql = bump_version_sql
+        
+        assert (await tools.get(tool.id)).name == "t"
+        updated = await tools.update(tool.id, {"description": "still works"})
+        assert (updated.name, updated.description) == ("t", "still works")
+    finally:
+        await backend.close()
\ No newline at end of file
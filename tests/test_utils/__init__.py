@@ -0,0 +1 @@
+"""Frontend utility test modules."""
\ No newline at end of file
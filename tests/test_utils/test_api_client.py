@@ -0,0 +1,38 @@
+"""Test pooled HTTP clients of the Streamlit API client."""
+
+from app.utils.api_client import APIClient
+from app.utils.async_runner import AsyncRunner
+
+
+def test_calls_on_one_loop_share_one_http_client():
+    """Test repeated runs reuse one pooled client, which closes with the runner."""
+    runner = AsyncRunner()
+    api = APIClient()
+    runner.add_cleanup(api.aclose)
+    
+    async def http_client():
+        return api._get_client()
+    
+    client = runner.run(http_client())
+    assert runner.run(http_client()) is client
+    assert not client.is_closed
+    
+    runner.close()
+    assert client.is_closed
+
+
+def test_each_loop_gets_its_own_http_client():
+    """Test clients are not shared across event loops."""
+    runners = [AsyncRunner(), AsyncRunner()]
+    api = APIClient()
+    
+    async def http_client():
+        return api._get_client()
+    
+    clients = [runner.run(http_client()) for runner in runners]
+    assert clients[0] is not clients[1]
+    
+    for runner in runners:
+        runner.add_cleanup(api.aclose)
+        runner.close()
+    assert all(client.is_closed for client in clients)
\ No newline at end of file
@@ -0,0 +1,79 @@
+"""Test the Streamlit event loop runner."""
+
+import asyncio
+
+import pytest
+
+from app.utils import error_handler
+from app.utils.async_runner import AsyncRunner
+
+
+@pytest.fixture
+def runner():
+    """Runner closed after the test."""
+    runner = AsyncRunner()
+    yield runner
+    runner.close()
+
+
+async def current_loop():
+    """The running event loop."""
+    return asyncio.get_running_loop()
+
+
+async def fail(message):
+    """Raise an API-style error."""
+    raise Exception(message)
+
+
+async def succeed(value):
+    """Return a value."""
+    return value
+
+
+def test_runs_share_one_loop(runner):
+    """Test repeated runs reuse the runner's loop."""
+    assert runner.run(current_loop()) is runner.loop
+    assert runner.run(current_loop()) is runner.loop
+
+
+def test_exceptions_propagate(runner):
+    """Test run raises the coroutine's error and gather returns it per call."""
+    with pytest.raises(Exception, match="Connection Error: down"):
+        runner.run(fail("Connection Error: down"))
+    
+    results = runner.gather(succeed(1), fail("API Error (404): missing"))
+    assert results[0] == 1
+    assert str(results[1]) == "API Error (404): missing"
+
+
+def test_close_runs_cleanups_on_the_loop():
+    """Test closing the runner runs cleanups on its loop, then closes the loop."""
+    runner = AsyncRunner()
+    cleaned_on = []
+    
+    async def cleanup():
+        cleaned_on.append(asyncio.get_running_loop())
+    
+    runner.add_cleanup(cleanup)
+    runner.close()
+    
+    assert cleaned_on == [runner.loop]
+    assert runner.loop.is_closed()
+    runner.close()
+
+
+def test_safe_async_gather_reports_each_error_kind_once(runner, monkeypatch):
+    """Test failed calls become None and repeated error kinds are shown once."""
+    shown = []
+    monkeypatch.setattr(error_handler, "get_async_runner", lambda: runner)
+    monkeypatch.setattr(error_handler, "show_api_error", shown.append)
+    
+    results = error_handler.safe_async_gather(
+        (succeed, "agents"),
+        (fail, "Connection Error: refused"),
+        (fail, "Connection Error: timed out")
+    )
+    
+    assert results == ["agents", None, None]
+    assert shown == ["Connection Error: refused"]
\ No newline at end of file
@@ -0,0 +1,64 @@
+"""Test stale-while-revalidate data cache."""
+
+import asyncio
+
+import pytest
+
+from app.utils.data_cache import StaleWhileRevalidateCache
+
+
+class FakeBackend:
+    """Versioned collection answering conditional fetches."""
+    
+    def __init__(self):
+        self.version = 1
+        self.calls = []
+    
+    async def fetch(self, etag):
+        self.calls.append(etag)
+        current = f'"v{self.version}"'
+        if etag == current:
+            return None, etag
+        return [f"item-v{self.version}"], current
+
+
+@pytest.mark.asyncio
+async def test_fresh_entries_are_served_without_fetching():
+    """Test values within the TTL come straight from the cache."""
+    cache = StaleWhileRevalidateCache(ttl_seconds=60)
+    backend = FakeBackend()
+    
+    assert await cache.get("agents", backend.fetch) == ["item-v1"]
+    assert await cache.get("agents", backend.fetch) == ["item-v1"]
+    assert backend.calls == [None]
+
+
+@pytest.mark.asyncio
+async def test_stale_entries_are_served_then_revalidated():
+    """Test stale values return immediately and refresh in the background."""
+    cache = StaleWhileRevalidateCache(ttl_seconds=0)
+    backend = FakeBackend()
+    await cache.get("agents", backend.fetch)
+    
+    assert await cache.get("agents", backend.fetch) == ["item-v1"]
+    await asyncio.sleep(0)
+    assert backend.calls == [None, '"v1"']  # Conditional request, 304
+    
+    backend.version = 2
+    assert await cache.get("agents", backend.fetch) == ["item-v1"]
+    await asyncio.sleep(0)
+    assert await cache.get("agents", backend.fetch) == ["item-v2"]
+
+
+@pytest.mark.asyncio
+async def test_invalidate_forces_a_full_fetch():
+    """Test invalidated keys are refetched before returning."""
+    cache = StaleWhileRevalidateCache(ttl_seconds=60)
+    backend = FakeBackend()
+    await cache.get("agents", backend.fetch)
+    
+    backend.version = 2
+    cache.invalidate("agents")
+    
+    assert await cache.get("agents", backend.fetch) == ["item-v2"]
+    assert backend.calls == [None, None]
\ No newline at end of file
@@ -0,0 +1,26 @@
+"""Test launcher server commands."""
+
+from app.core.config import Settings
+from launch import fastapi_command, worker_count
+
+
+def test_development_command_reloads():
+    """Test development mode runs a single reloading process."""
+    settings = Settings(SERVER_MODE="development")
+    command = fastapi_command(settings, worker_count(settings))
+    assert "--reload" in command
+    assert "--workers" not in command
+
+
+def test_production_command_runs_workers():
+    """Test production mode runs workers on uvloop/httptools with graceful shutdown."""
+    settings = Settings(SERVER_MODE="production", STORAGE_BACKEND="sqlite", SERVER_WORKERS=4)
+    command = fastapi_command(settings, worker_count(settings))
+    assert "--reload" not in command
+    assert command[command.index("--workers") + 1] == "4"
+    assert command[command.index("--loop") + 1] == "uvloop"
+    assert command[command.index("--http") + 1] == "httptools"
+    assert command[command.index("--timeout-graceful-shutdown") + 1] == "30"
+    
+    # In-memory storage cannot be shared across processes
+    assert worker_count(Settings(SERVER_MODE="production", STORAGE_BACKEND="memory")) == 1
\ No newline at end of file